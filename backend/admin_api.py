@@ -10,6 +10,8 @@ from bson import ObjectId
 import json
 import logging
 from database.multi_db_manager import MultiDatabaseSession, DatabaseType
+from services.template_cache import invalidate_template_caches
+from utils.json_response import MongoJSONResponse, json_default
 
 logger = logging.getLogger(__name__)
 
@@ -21,15 +23,6 @@ async def get_current_admin_user():
     """TODO: Implement proper admin authentication"""
     return {"_id": "admin", "username": "admin", "role": "admin"}
 
-# JSON serialization helper
-def json_serializer(obj: Any) -> str:
-    """JSON serializer for MongoDB objects"""
-    if isinstance(obj, ObjectId):
-        return str(obj)
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
-
 @admin_router.get("/databases")
 async def get_databases() -> Dict[str, Any]:
     """Get list of all databases and their collections"""
@@ -81,7 +74,7 @@ async def get_documents(
     collection: str, 
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100)
-) -> Dict[str, Any]:
+) -> MongoJSONResponse:
     """Get documents from a specific collection with pagination"""
     try:
         async with MultiDatabaseSession() as db:
@@ -102,13 +95,13 @@ async def get_documents(
             
             total_pages = (total + limit - 1) // limit
             
-            return {
-                "documents": json.loads(json.dumps(documents, default=json_serializer)),
+            return MongoJSONResponse(content={
+                "documents": documents,
                 "total": total,
                 "page": page,
                 "totalPages": total_pages,
                 "limit": limit
-            }
+            })
     except Exception as e:
         logger.error(f"Failed to get documents: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -137,7 +130,7 @@ async def get_document(database: str, collection: str, document_id: str):
             if not document:
                 raise HTTPException(status_code=404, detail="Document not found")
             
-            return document
+            return MongoJSONResponse(content=document)
             
     except HTTPException:
         raise
@@ -173,6 +166,10 @@ async def create_document(
         async with MultiDatabaseSession() as db:
             result = await db.insert_one(db_type, collection, document)
             
+            # Bank/template definitions live in the admin database
+            if db_type == "admin":
+                invalidate_template_caches()
+            
             # Log audit trail (skip for now - will fix separately)
             # await log_audit_trail(
             #     db, "CREATE", database, collection, str(result),
@@ -260,6 +257,9 @@ async def update_document(
             if not result:
                 raise HTTPException(status_code=404, detail="Document not found or no changes made")
             
+            if db_type == "admin":
+                invalidate_template_caches()
+            
             # Calculate changes for audit trail
             changes = calculate_changes(existing_doc, document)
             logger.info(f"Document updated with {len(changes)} changes")
@@ -331,6 +331,9 @@ async def delete_document(
             if not result:
                 raise HTTPException(status_code=404, detail="Document not found")
             
+            if db_type == "admin":
+                invalidate_template_caches()
+            
             # Log audit trail (temporarily disabled)
             # await log_audit_trail(
             #     db, "DELETE", database, collection, document_id,
@@ -352,7 +355,7 @@ async def search_documents(
     collection: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100)
-) -> Dict[str, Any]:
+) -> MongoJSONResponse:
     """Search documents in a collection"""
     try:
         if database not in ["admin", "main", "reports"]:
@@ -384,10 +387,10 @@ async def search_documents(
                 sort=[("_id", -1)]
             )
             
-            return {
-                "documents": json.loads(json.dumps(documents, default=json_serializer)),
+            return MongoJSONResponse(content={
+                "documents": documents,
                 "total": total
-            }
+            })
             
     except Exception as e:
         logger.error(f"Failed to search documents: {e}")
@@ -427,7 +430,7 @@ async def get_audit_logs(
     collection: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100)
-) -> Dict[str, Any]:
+) -> MongoJSONResponse:
     """Get audit logs with optional filtering"""
     try:
         async with MultiDatabaseSession() as db:
@@ -454,10 +457,10 @@ async def get_audit_logs(
                 sort=[("timestamp", -1)]
             )
             
-            return {
-                "logs": json.loads(json.dumps(logs, default=json_serializer)),
+            return MongoJSONResponse(content={
+                "logs": logs,
                 "total": total
-            }
+            })
     except Exception as e:
         logger.error(f"Failed to get audit logs: {e}")
         raise HTTPException(status_code=500, detail=str(e))# Helper functions
@@ -706,7 +709,6 @@ async def refresh_collections() -> Dict[str, Any]:
     """Refresh all collections from MongoDB to local JSON files"""
     try:
         from pathlib import Path
-        import json
         
         # Initialize database session
         async with MultiDatabaseSession() as db:
@@ -748,7 +750,7 @@ async def refresh_collections() -> Dict[str, Any]:
                         # Save to JSON file
                         json_file_path = base_path / f"{collection_name}.json"
                         with open(json_file_path, 'w', encoding='utf-8') as f:
-                            json.dump(json_documents, f, indent=2, ensure_ascii=False, default=json_serializer)
+                            json.dump(json_documents, f, indent=2, ensure_ascii=False, default=json_default)
                         
                         successful_count += 1
                         logger.info(f"✅ Refreshed {collection_name}: {len(json_documents)} documents")
@@ -758,6 +760,9 @@ async def refresh_collections() -> Dict[str, Any]:
                         logger.error(f"❌ {error_msg}")
                         errors.append(error_msg)
             
+            # Templates are recompiled from MongoDB on next request
+            invalidate_template_caches()
+            
             return {
                 "success": True,
                 "successful_count": successful_count,
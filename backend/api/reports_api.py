@@ -20,6 +20,7 @@ from models.report_models import (
 )
 from services.template_snapshot_service import TemplateSnapshotService
 from database.mongodb_manager import MongoDBManager
+from utils.pagination import combine_filters, count_cache, keyset_filter, keyset_sort, split_page
 
 # Create router
 router = APIRouter(prefix="/api/v1", tags=["reports"])
@@ -375,6 +376,20 @@ async def get_template_snapshot(
     finally:
         await db_manager.disconnect()
 
+# Fields list_reports returns (the full report document includes all form data)
+REPORT_LIST_PROJECTION = {
+    "templateSnapshot": 1,
+    "bankCode": 1,
+    "propertyType": 1,
+    "customerName": 1,
+    "propertyAddress": 1,
+    "workflow.status": 1,
+    "workflow.submittedAt": 1,
+    "createdAt": 1,
+    "updatedAt": 1,
+    "createdBy": 1
+}
+
 @router.get("/reports")
 async def list_reports(
     organization_id: Optional[str] = Query(None, description="Filter by organization"),
@@ -385,12 +400,15 @@ async def list_reports(
     created_by: Optional[str] = Query(None, description="Filter by creator"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from pagination.nextCursor"),
+    exact_count: bool = Query(False, description="Recount the total instead of using the cached count"),
     db_manager: MongoDBManager = Depends(get_db_manager)
 ):
     """
     List reports with filtering and pagination
     
-    Supports filtering by organization, bank, property type, status, and customer name
+    Supports filtering by organization, bank, property type, status, and customer name.
+    Pass pagination.nextCursor back as `cursor` for constant-cost paging; `page` still works.
     """
     try:
         # Build filter query
@@ -410,22 +428,32 @@ async def list_reports(
         if created_by:
             filter_query["createdBy"] = created_by
         
-        # Calculate pagination
-        skip = (page - 1) * limit
-        
-        # Get reports with pagination
+        # Calculate pagination (cursor pages filter past the last row instead of skipping)
+        skip = 0
+        page_query = filter_query
+        if cursor:
+            try:
+                page_query = combine_filters(filter_query, keyset_filter("createdAt", cursor))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+        else:
+            skip = (page - 1) * limit
+        
+        # Get one page from MongoDB (one extra row tells us whether there is a next page)
         reports = await db_manager.find_many(
             "valuation_reports",
-            filter_query,
-            limit=limit,
-            sort_by={"createdAt": -1}
+            page_query,
+            limit=limit + 1,
+            sort_by=dict(keyset_sort("createdAt")),
+            skip=skip,
+            projection=REPORT_LIST_PROJECTION
         )
+        reports, next_cursor = split_page(reports, limit, "createdAt")
         
-        # Skip manually since find_many doesn't support skip
-        reports = reports[skip:skip + limit]
-        
-        # Get total count for pagination
-        total_count = await db_manager.database.valuation_reports.count_documents(filter_query)
+        # Get total count for pagination (cached per worker unless exact_count is requested)
+        total_count, total_is_cached = await count_cache.count(
+            db_manager.database.valuation_reports, filter_query, exact=exact_count
+        )
         
         # Format response
         report_list = []
@@ -450,10 +478,14 @@ async def list_reports(
                 "page": page,
                 "limit": limit,
                 "total": total_count,
-                "pages": (total_count + limit - 1) // limit
+                "totalIsCached": total_is_cached,
+                "pages": (total_count + limit - 1) // limit,
+                "nextCursor": next_cursor
             }
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list reports: {str(e)}")
     
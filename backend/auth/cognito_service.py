@@ -1,29 +1,68 @@
 """
 AWS Cognito Service for User Authentication and Management
 Handles user registration, authentication, and role management with Cognito
+
+boto3 calls are synchronous, so every cognito-idp call runs on a small
+dedicated thread pool instead of blocking the event loop for an AWS round
+trip. All calls share one low-level client (boto3 clients are thread-safe),
+and COGNITO_MAX_CONCURRENCY bounds both the pool and the client's HTTP
+connection pool. COGNITO_ENDPOINT_URL points the client at a local stand-in
+(e.g. a moto server) for testing.
+
+Cognito cannot filter users by custom attributes, so listing an organization's
+users scans the whole pool. The scan is paged (one executor call per page),
+indexed by organization, and cached for COGNITO_USER_LIST_CACHE_TTL_SECONDS;
+concurrent callers share one scan and user writes invalidate it.
 """
 
+import asyncio
 import boto3
 import json
 import logging
-from typing import Dict, Any, Optional, List
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Any, Optional, List, TypeVar
 from datetime import datetime, timezone
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from fastapi import HTTPException
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 class CognitoService:
     """AWS Cognito service for user authentication and management"""
     
-    def __init__(self):
-        self.region = "us-east-1"  # Your configured region
+    def __init__(self, cognito_client=None, max_concurrency: Optional[int] = None):
+        self.region = os.getenv("AWS_REGION", "us-east-1")
         self.user_pool_id = None  # Will be set from environment
         self.client_id = None     # Will be set from environment
+        self.max_concurrency = max_concurrency or int(os.getenv("COGNITO_MAX_CONCURRENCY", "10"))
+        self.user_list_ttl_seconds = float(os.getenv("COGNITO_USER_LIST_CACHE_TTL_SECONDS", "60"))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        # Organization user index from the last full pool scan
+        self._users_by_org: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._users_loaded_at: Optional[float] = None
+        self._users_scan: Optional[asyncio.Task] = None
+        # Bumped by invalidate_user_list() so a scan started before a write cannot publish stale users
+        self._users_generation = 0
+        self._users_scan_generation = 0
         
-        # Initialize Cognito client
+        # Initialize Cognito client (shared by all executor threads)
+        if cognito_client is not None:
+            self.cognito_client = cognito_client
+            return
         try:
-            self.cognito_client = boto3.client('cognito-idp', region_name=self.region)
+            self.cognito_client = boto3.client(
+                'cognito-idp',
+                region_name=self.region,
+                endpoint_url=os.getenv("COGNITO_ENDPOINT_URL") or None,
+                config=Config(max_pool_connections=self.max_concurrency, retries={"mode": "standard"})
+            )
             logger.info("✅ Cognito client initialized")
         except Exception as e:
             logger.error(f"❌ Failed to initialize Cognito client: {e}")
@@ -33,8 +72,23 @@ class CognitoService:
         """Configure Cognito service with pool and client IDs"""
         self.user_pool_id = user_pool_id
         self.client_id = client_id
+        self.invalidate_user_list()
         logger.info(f"🔧 Cognito configured - Pool: {user_pool_id[:20]}...")
     
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="cognito")
+        return self._executor
+    
+    async def _call(self, method: Callable[..., T], **kwargs) -> T:
+        """Run a blocking boto3 client method on the Cognito thread pool"""
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), partial(method, **kwargs))
+    
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
     async def create_user(
         self, 
         email: str, 
@@ -60,7 +114,7 @@ class CognitoService:
                 attributes.append({'Name': 'phone_number', 'Value': phone})
             
             # Create user in Cognito
-            response = self.cognito_client.admin_create_user(
+            response = await self._call(self.cognito_client.admin_create_user,
                 UserPoolId=self.user_pool_id,
                 Username=email,
                 UserAttributes=attributes,
@@ -70,7 +124,7 @@ class CognitoService:
             )
             
             # Set permanent password
-            self.cognito_client.admin_set_user_password(
+            await self._call(self.cognito_client.admin_set_user_password,
                 UserPoolId=self.user_pool_id,
                 Username=email,
                 Password=password,
@@ -80,6 +134,7 @@ class CognitoService:
             # Add user to role group
             await self._add_user_to_group(email, role)
             
+            self.invalidate_user_list()
             logger.info(f"✅ User created in Cognito: {email} with role {role}")
             
             return {
@@ -103,7 +158,7 @@ class CognitoService:
         """Authenticate user and return tokens"""
         
         try:
-            response = self.cognito_client.admin_initiate_auth(
+            response = await self._call(self.cognito_client.admin_initiate_auth,
                 UserPoolId=self.user_pool_id,
                 ClientId=self.client_id,
                 AuthFlow='ADMIN_NO_SRP_AUTH',
@@ -143,9 +198,16 @@ class CognitoService:
         """Get user information from Cognito"""
         
         try:
-            response = self.cognito_client.admin_get_user(
-                UserPoolId=self.user_pool_id,
-                Username=email
+            # User record and groups (roles) are independent lookups - fetch them concurrently
+            response, groups_response = await asyncio.gather(
+                self._call(self.cognito_client.admin_get_user,
+                    UserPoolId=self.user_pool_id,
+                    Username=email
+                ),
+                self._call(self.cognito_client.admin_list_groups_for_user,
+                    UserPoolId=self.user_pool_id,
+                    Username=email
+                )
             )
             
             # Parse user attributes
@@ -153,12 +215,6 @@ class CognitoService:
             for attr in response['UserAttributes']:
                 attributes[attr['Name']] = attr['Value']
             
-            # Get user groups (roles)
-            groups_response = self.cognito_client.admin_list_groups_for_user(
-                UserPoolId=self.user_pool_id,
-                Username=email
-            )
-            
             roles = [group['GroupName'] for group in groups_response['Groups']]
             
             return {
@@ -184,21 +240,21 @@ class CognitoService:
         
         try:
             # Get current groups
-            current_groups = self.cognito_client.admin_list_groups_for_user(
+            current_groups = await self._call(self.cognito_client.admin_list_groups_for_user,
                 UserPoolId=self.user_pool_id,
                 Username=email
             )
             
             # Remove from all current groups
             for group in current_groups['Groups']:
-                self.cognito_client.admin_remove_user_from_group(
+                await self._call(self.cognito_client.admin_remove_user_from_group,
                     UserPoolId=self.user_pool_id,
                     Username=email,
                     GroupName=group['GroupName']
                 )
             
             # Update custom role attribute
-            self.cognito_client.admin_update_user_attributes(
+            await self._call(self.cognito_client.admin_update_user_attributes,
                 UserPoolId=self.user_pool_id,
                 Username=email,
                 UserAttributes=[
@@ -209,6 +265,7 @@ class CognitoService:
             # Add to new role group
             await self._add_user_to_group(email, new_role)
             
+            self.invalidate_user_list()
             logger.info(f"✅ User role updated: {email} -> {new_role}")
             return True
             
@@ -220,11 +277,12 @@ class CognitoService:
         """Disable user account"""
         
         try:
-            self.cognito_client.admin_disable_user(
+            await self._call(self.cognito_client.admin_disable_user,
                 UserPoolId=self.user_pool_id,
                 Username=email
             )
             
+            self.invalidate_user_list()
             logger.info(f"✅ User disabled: {email}")
             return True
             
@@ -236,11 +294,12 @@ class CognitoService:
         """Enable user account"""
         
         try:
-            self.cognito_client.admin_enable_user(
+            await self._call(self.cognito_client.admin_enable_user,
                 UserPoolId=self.user_pool_id,
                 Username=email
             )
             
+            self.invalidate_user_list()
             logger.info(f"✅ User enabled: {email}")
             return True
             
@@ -252,11 +311,12 @@ class CognitoService:
         """Delete user from Cognito"""
         
         try:
-            self.cognito_client.admin_delete_user(
+            await self._call(self.cognito_client.admin_delete_user,
                 UserPoolId=self.user_pool_id,
                 Username=email
             )
             
+            self.invalidate_user_list()
             logger.info(f"✅ User deleted: {email}")
             return True
             
@@ -272,7 +332,7 @@ class CognitoService:
             await self._ensure_group_exists(role)
             
             # Add user to group
-            self.cognito_client.admin_add_user_to_group(
+            await self._call(self.cognito_client.admin_add_user_to_group,
                 UserPoolId=self.user_pool_id,
                 Username=email,
                 GroupName=role
@@ -289,7 +349,7 @@ class CognitoService:
         
         try:
             # Check if group exists
-            self.cognito_client.get_group(
+            await self._call(self.cognito_client.get_group,
                 GroupName=group_name,
                 UserPoolId=self.user_pool_id
             )
@@ -303,7 +363,7 @@ class CognitoService:
                     'employee': 'Employees with report creation and editing rights'
                 }
                 
-                self.cognito_client.create_group(
+                await self._call(self.cognito_client.create_group,
                     GroupName=group_name,
                     UserPoolId=self.user_pool_id,
                     Description=description_map.get(group_name, f'{group_name} role group')
@@ -313,39 +373,96 @@ class CognitoService:
             else:
                 raise
     
-    async def list_users_by_organization(self, organization_id: str) -> List[Dict[str, Any]]:
-        """List all users in an organization"""
+    def invalidate_user_list(self) -> None:
+        """Drop the cached organization user index (next listing rescans the pool)"""
+        self._users_by_org = None
+        self._users_loaded_at = None
+        self._users_generation += 1
+    
+    @staticmethod
+    def _format_listed_user(user: Dict[str, Any]) -> Dict[str, Any]:
+        attributes = {attr['Name']: attr['Value'] for attr in user.get('Attributes', [])}
+        return {
+            "user_id": user['Username'],
+            "email": attributes.get('email'),
+            "full_name": attributes.get('name'),
+            "organization_id": attributes.get('custom:organization_id'),
+            "role": attributes.get('custom:role'),
+            "status": user['UserStatus'],
+            "enabled": user['Enabled'],
+            "created_at": user['UserCreateDate'].isoformat()
+        }
+    
+    async def _scan_users(self, generation: int) -> Dict[str, List[Dict[str, Any]]]:
+        """Page through every user in the pool and index them by organization"""
+        users_by_org: Dict[str, List[Dict[str, Any]]] = {}
+        request = {"UserPoolId": self.user_pool_id, "Limit": 60}
+        pages = 0
+        
+        while True:
+            page = await self._call(self.cognito_client.list_users, **request)
+            pages += 1
+            for user in page.get('Users', []):
+                listed = self._format_listed_user(user)
+                if listed["organization_id"]:
+                    users_by_org.setdefault(listed["organization_id"], []).append(listed)
+            
+            token = page.get('PaginationToken')
+            if not token:
+                break
+            request["PaginationToken"] = token
+        
+        if generation != self._users_generation:
+            # A user write landed mid-scan and the result may predate it: don't cache it
+            logger.debug("👥 Cognito users changed during scan - index not cached")
+            return users_by_org
+        
+        self._users_by_org = users_by_org
+        self._users_loaded_at = time.monotonic()
+        logger.debug(f"👥 Cognito user index refreshed: {sum(len(u) for u in users_by_org.values())} users in {pages} pages")
+        return users_by_org
+    
+    async def _get_users_by_org(self, refresh: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        fresh = (
+            self._users_by_org is not None
+            and self._users_loaded_at is not None
+            and time.monotonic() - self._users_loaded_at < self.user_list_ttl_seconds
+        )
+        if fresh and not refresh:
+            return self._users_by_org
+        
+        # Join a scan already in flight instead of starting another, unless it
+        # started before the latest invalidation
+        if (
+            self._users_scan is None
+            or self._users_scan.done()
+            or self._users_scan_generation != self._users_generation
+        ):
+            self._users_scan_generation = self._users_generation
+            self._users_scan = asyncio.create_task(self._scan_users(self._users_generation))
+        return await asyncio.shield(self._users_scan)
+    
+    async def list_users_by_organization(
+        self,
+        organization_id: str,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        refresh: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        List users in an organization (served from the cached pool scan)
+        
+        Args:
+            organization_id: Organization whose users to list
+            limit: Page size (default: all remaining users)
+            offset: Users to skip
+            refresh: Rescan the pool even if the cached index is fresh
+        """
         
         try:
-            users = []
-            paginator = self.cognito_client.get_paginator('list_users')
-            
-            for page in paginator.paginate(UserPoolId=self.user_pool_id):
-                for user in page['Users']:
-                    # Check if user belongs to organization
-                    user_org_id = None
-                    for attr in user['Attributes']:
-                        if attr['Name'] == 'custom:organization_id':
-                            user_org_id = attr['Value']
-                            break
-                    
-                    if user_org_id == organization_id:
-                        # Parse user attributes
-                        attributes = {}
-                        for attr in user['Attributes']:
-                            attributes[attr['Name']] = attr['Value']
-                        
-                        users.append({
-                            "user_id": user['Username'],
-                            "email": attributes.get('email'),
-                            "full_name": attributes.get('name'),
-                            "role": attributes.get('custom:role'),
-                            "status": user['UserStatus'],
-                            "enabled": user['Enabled'],
-                            "created_at": user['UserCreateDate'].isoformat()
-                        })
-            
-            return users
+            users = (await self._get_users_by_org(refresh)).get(organization_id, [])
+            end = None if limit is None else offset + limit
+            return users[offset:end]
             
         except ClientError as e:
             logger.error(f"❌ Failed to list users: {e}")
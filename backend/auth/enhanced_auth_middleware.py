@@ -12,11 +12,11 @@ from datetime import datetime, timezone
 from fastapi import Request, HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from cachetools import TTLCache
-import requests
 
 from .cognito_service import cognito_service
 from .rbac_models import RBACService, Permission, UserRole, SecurityContext
 from database.multi_db_manager import MultiDatabaseManager
+from utils.auth_middleware import jwt_validator
 
 logger = logging.getLogger(__name__)
 
@@ -32,9 +32,6 @@ class EnhancedAuthMiddleware:
         # JWT validation cache (1 hour TTL)
         self.jwt_cache = TTLCache(maxsize=1000, ttl=3600)
         
-        # JWK keys cache (24 hour TTL)
-        self.jwk_cache = TTLCache(maxsize=1, ttl=86400)
-        
         # Configure Cognito service
         if self.user_pool_id and self.client_id:
             cognito_service.configure(self.user_pool_id, self.client_id)
@@ -43,10 +40,6 @@ class EnhancedAuthMiddleware:
         else:
             self.cognito_enabled = False
             logger.warning("⚠️ Cognito not configured - using development mode")
-        
-        # Build JWK URL for token validation
-        if self.cognito_enabled:
-            self.jwk_url = f"https://cognito-idp.{self.region}.amazonaws.com/{self.user_pool_id}/.well-known/jwks.json"
     
     async def validate_jwt_token(self, token: str) -> Dict[str, Any]:
         """Validate JWT token and extract claims"""
@@ -62,9 +55,6 @@ class EnhancedAuthMiddleware:
             return claims
         
         try:
-            # Get JWK keys
-            jwk_keys = await self._get_jwk_keys()
-            
             # Decode token header
             unverified_header = jwt.get_unverified_header(token)
             kid = unverified_header.get("kid")
@@ -72,15 +62,8 @@ class EnhancedAuthMiddleware:
             if not kid:
                 raise HTTPException(status_code=401, detail="Invalid token format")
             
-            # Find matching key
-            key = None
-            for jwk_key in jwk_keys.get("keys", []):
-                if jwk_key.get("kid") == kid:
-                    key = jwt.algorithms.RSAAlgorithm.from_jwk(jwk_key)
-                    break
-            
-            if not key:
-                raise HTTPException(status_code=401, detail="Invalid token key")
+            # Find matching key (shared JWKS cache of the Cognito validator)
+            key = await jwt_validator.get_signing_key(kid)
             
             # Validate and decode token
             claims = jwt.decode(
@@ -88,7 +71,7 @@ class EnhancedAuthMiddleware:
                 key,
                 algorithms=["RS256"],
                 audience=self.client_id,
-                issuer=f"https://cognito-idp.{self.region}.amazonaws.com/{self.user_pool_id}"
+                issuer=jwt_validator.issuer
             )
             
             # Cache valid token
@@ -97,6 +80,8 @@ class EnhancedAuthMiddleware:
             logger.debug(f"✅ JWT token validated for: {claims.get('email', 'unknown')}")
             return claims
             
+        except HTTPException as http_exc:
+            raise http_exc
         except jwt.ExpiredSignatureError:
             raise HTTPException(status_code=401, detail="Token has expired")
         except jwt.InvalidTokenError as e:
@@ -106,26 +91,6 @@ class EnhancedAuthMiddleware:
             logger.error(f"❌ Token validation error: {e}")
             raise HTTPException(status_code=500, detail="Token validation failed")
     
-    async def _get_jwk_keys(self) -> Dict[str, Any]:
-        """Fetch and cache JWK keys from Cognito"""
-        
-        if "jwk_keys" in self.jwk_cache:
-            return self.jwk_cache["jwk_keys"]
-        
-        try:
-            response = requests.get(self.jwk_url, timeout=10)
-            response.raise_for_status()
-            jwk_data = response.json()
-            
-            self.jwk_cache["jwk_keys"] = jwk_data
-            logger.debug("🔄 JWK keys fetched and cached")
-            
-            return jwk_data
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to fetch JWK keys: {e}")
-            raise HTTPException(status_code=500, detail="Unable to validate token")
-    
     def _parse_development_token(self, token: str) -> Dict[str, Any]:
         """Parse development token for testing"""
         
@@ -12,6 +12,8 @@ from bson import ObjectId
 import logging
 from datetime import datetime, timezone
 
+from database.shared_client import get_shared_client
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -21,8 +23,10 @@ class MongoDBManager:
     Handles async connections, CRUD operations, and file storage
     """
     
-    def __init__(self):
+    def __init__(self, client: Optional[AsyncIOMotorClient[Any]] = None):
         self.client: Optional[AsyncIOMotorClient[Any]] = None
+        # Client supplied by the caller or the worker's shared client; never closed here
+        self._borrowed_client: Optional[AsyncIOMotorClient[Any]] = client
         self.database: Optional[AsyncIOMotorDatabase[Any]] = None
         self.gridfs_bucket: Optional[AsyncIOMotorGridFSBucket] = None
         self.is_connected: bool = False
@@ -40,6 +44,19 @@ class MongoDBManager:
         Establish connection to MongoDB Atlas
         Returns True if successful, False otherwise
         """
+        borrowed_client = self._borrowed_client or get_shared_client()
+        if borrowed_client is not None:
+            # Reuse the worker's pooled client - no new pool, no ping
+            self._borrowed_client = borrowed_client
+            self.client = borrowed_client
+            self.database = self.client[self.database_name]
+            self.gridfs_bucket = AsyncIOMotorGridFSBucket(
+                self.database,
+                bucket_name=self.gridfs_bucket_name
+            )
+            self.is_connected = True
+            return True
+        
         try:
             logger.info("Connecting to MongoDB Atlas...")
             
@@ -80,11 +97,12 @@ class MongoDBManager:
             return False
     
     async def disconnect(self):
-        """Close MongoDB connection"""
+        """Close MongoDB connection (borrowed clients are only released, never closed)"""
         if self.client is not None:
-            self.client.close()
+            if self._borrowed_client is None:
+                self.client.close()
+                logger.info("🔒 Disconnected from MongoDB Atlas")
             self.is_connected = False
-            logger.info("🔒 Disconnected from MongoDB Atlas")
     
     def get_collection(self, collection_name: str) -> AsyncIOMotorCollection[Any]:
         """Get a collection reference"""
@@ -129,15 +147,30 @@ class MongoDBManager:
             raise
     
     async def find_many(self, collection_name: str, filter_dict: Optional[Dict[str, Any]] = None,
-                       limit: Optional[int] = None, sort_by: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
-        """Find multiple documents"""
+                       limit: Optional[int] = None, sort_by: Optional[Dict[str, int]] = None,
+                       skip: Optional[int] = None,
+                       projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Find multiple documents
+        
+        Args:
+            collection_name: Collection to query
+            filter_dict: Query filter
+            limit: Maximum number of documents to return
+            sort_by: Sort specification, applied in key order (e.g. {"createdAt": -1, "_id": -1})
+            skip: Number of documents to skip on the server
+            projection: Fields to include/exclude
+        """
         try:
             collection = self.get_collection(collection_name)
-            cursor = collection.find(filter_dict or {})
+            cursor = collection.find(filter_dict or {}, projection)
             
             if sort_by:
                 cursor = cursor.sort(list(sort_by.items()))
             
+            if skip:
+                cursor = cursor.skip(skip)
+            
             if limit:
                 cursor = cursor.limit(limit)
             
@@ -8,7 +8,7 @@ import logging
 import os
 from datetime import datetime, timezone
 from types import TracebackType
-from typing import Optional, Dict, Any, List, Type, Literal, Tuple
+from typing import AsyncIterator, Optional, Dict, Any, List, Type, Literal, Tuple
 
 from bson import ObjectId
 from motor.motor_asyncio import (
@@ -17,8 +17,12 @@ from motor.motor_asyncio import (
     AsyncIOMotorGridFSBucket,
     AsyncIOMotorCollection
 )
+from fastapi import HTTPException
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 
+from database.organization_models import create_org_database_indexes
+from database.shared_client import create_motor_client, get_shared_client
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -29,8 +33,10 @@ class MultiDatabaseManager:
     Multi-Database MongoDB Atlas connection and operations manager
     Handles async connections to multiple databases for different purposes
     """
-    def __init__(self):
+    def __init__(self, client: Optional[AsyncIOMotorClient[Any]] = None):
         self.client: Optional[AsyncIOMotorClient[Any]] = None
+        # Client supplied by the caller or the worker's shared client; never closed here
+        self._borrowed_client: Optional[AsyncIOMotorClient[Any]] = client
         self.databases: Dict[str, AsyncIOMotorDatabase[Any]] = {}
         self.gridfs_buckets: Dict[str, AsyncIOMotorGridFSBucket] = {}
         self.is_connected: bool = False
@@ -61,6 +67,14 @@ class MultiDatabaseManager:
         Establish connections to all MongoDB Atlas databases with retry logic
         Returns True if successful, False otherwise
         """
+        borrowed_client = self._borrowed_client or get_shared_client()
+        if borrowed_client is not None:
+            # Reuse the worker's pooled client - no new pool, no ping
+            self._borrowed_client = borrowed_client
+            self.client = borrowed_client
+            self._setup_database_references()
+            self.is_connected = True
+            return True
         max_retries = 3
         retry_delay = 2  # Start with 2 seconds
         for attempt in range(max_retries):
@@ -68,37 +82,12 @@ class MultiDatabaseManager:
                 logger.info("Connecting to MongoDB Atlas (Multi-Database) - Attempt %s/%s...", attempt + 1, max_retries)
                 
                 # Create async motor client with more robust connection settings
-                self.client = AsyncIOMotorClient(
-                    self.connection_string,
-                    serverSelectionTimeoutMS=30000,  # 30 second timeout for initial connection
-                    connectTimeoutMS=30000,          # 30 second connection timeout
-                    socketTimeoutMS=30000,           # 30 second socket timeout
-                    maxPoolSize=10,                  # Reduce pool size for stability
-                    minPoolSize=5,                   # Maintain minimum connections
-                    maxIdleTimeMS=60000,             # Keep connections alive for 1 minute
-                    retryWrites=True,
-                    retryReads=True,                 # Enable retry for reads
-                    tlsAllowInvalidCertificates=True, # Allow invalid SSL certificates for Atlas connection
-                    # Add heartbeat settings for connection health
-                    heartbeatFrequencyMS=30000       # Check connection health every 30 seconds
-                )
+                self.client = create_motor_client(self.connection_string)
                 # Test connection with timeout
                 await asyncio.wait_for(self.client.admin.command('ping'), timeout=15.0)
                 
                 # Setup database references
-                for db_type, db_name in self.database_names.items():
-                    self.databases[db_type] = self.client[db_name]
-                    logger.info("📋 Connected to %s database: %s", db_type, db_name)
-                    
-                    # Setup GridFS bucket for each database
-                    self.gridfs_buckets[db_type] = AsyncIOMotorGridFSBucket(
-                        self.databases[db_type],
-                        bucket_name=self.gridfs_bucket_names[db_type]
-                    )
-                # Also connect to legacy databases during migration period
-                for db_type, db_name in self.legacy_databases.items():
-                    self.databases[db_type] = self.client[db_name]
-                    logger.info("🔄 Connected to legacy %s database: %s", db_type, db_name)
+                self._setup_database_references()
                 self.is_connected = True
                 logger.info("✅ Successfully connected to all MongoDB Atlas databases")
 
@@ -119,11 +108,37 @@ class MultiDatabaseManager:
                     retry_delay *= 2
         logger.error("❌ Failed to connect to MongoDB Atlas after %s attempts", max_retries)
         return False
+    def _setup_database_references(self) -> None:
+        """Bind database and GridFS references to the current client"""
+        if self.client is None:
+            raise RuntimeError("Client not initialized")
+        for db_type, db_name in self.database_names.items():
+            self.databases[db_type] = self.client[db_name]
+            logger.debug("📋 Connected to %s database: %s", db_type, db_name)
+            
+            # Setup GridFS bucket for each database
+            self.gridfs_buckets[db_type] = AsyncIOMotorGridFSBucket(
+                self.databases[db_type],
+                bucket_name=self.gridfs_bucket_names[db_type]
+            )
+        # Also connect to legacy databases during migration period
+        for db_type, db_name in self.legacy_databases.items():
+            self.databases[db_type] = self.client[db_name]
+            logger.debug("🔄 Connected to legacy %s database: %s", db_type, db_name)
+
+    @property
+    def uses_shared_client(self) -> bool:
+        """True when this manager borrows a pooled client it must not close"""
+        return self._borrowed_client is not None
+
     async def ensure_connection(self) -> bool:
         """Ensure we have a healthy connection, reconnect if necessary"""
         if not self.is_connected or not self.client:
             logger.info("🔄 Connection lost, attempting to reconnect...")
             return await self.connect()
+        if self.uses_shared_client:
+            # The shared client monitors server health itself; skip the per-call ping
+            return True
         try:
             # Quick health check
             await asyncio.wait_for(self.client.admin.command('ping'), timeout=5.0)
@@ -134,14 +149,14 @@ class MultiDatabaseManager:
             return await self.connect()
 
     async def disconnect(self):
-        """Close MongoDB connection"""
+        """Close MongoDB connection (borrowed clients are only released, never closed)"""
         if self.client is not None:
-            self.client.close()
+            if not self.uses_shared_client:
+                self.client.close()
+                logger.info("🔒 Disconnected from MongoDB Atlas")
             self.is_connected = False
-            logger.info("🔒 Disconnected from MongoDB Atlas")
             self.databases.clear()
             self.gridfs_buckets.clear()
-            logger.info("🔒 Disconnected from MongoDB Atlas")
     def get_database(self, db_type: DatabaseType) -> AsyncIOMotorDatabase[Any]:
         """Get database reference by type"""
         if not self.is_connected:
@@ -207,7 +222,7 @@ class MultiDatabaseManager:
         if self.client is None:
             raise RuntimeError("Client not initialized")
         org_db = self.client[org_id]
-        logger.info("🆕 Loaded new organization database: %s", org_id)
+        logger.debug("🆕 Loaded new organization database: %s", org_id)
         
         # Add to cache
         self.org_database_cache[org_id] = org_db
@@ -258,6 +273,11 @@ class MultiDatabaseManager:
                     logger.info("✅ Created collection: %s.%s - %s", org_id, collection_name, description)
                 else:
                     logger.debug("✓ Collection already exists: %s.%s", org_id, collection_name)
+            # Provision report/activity log indexes with the database
+            index_changes = await create_org_database_indexes(org_db, logger=logger)
+            created = sum(len(c["created"]) for c in index_changes.values())
+            if created:
+                logger.info("✅ Created %s indexes for organization: %s", created, org_id)
             logger.info("✅ Database structure verified for organization: %s", org_id)
             return True
         except Exception as e:  # pylint: disable=broad-exception-caught
@@ -526,8 +546,8 @@ class MultiDatabaseManager:
 class MultiDatabaseSession:
     """Context manager for database operations across multiple databases"""
 
-    def __init__(self):
-        self.manager = MultiDatabaseManager()
+    def __init__(self, client: Optional[AsyncIOMotorClient[Any]] = None):
+        self.manager = MultiDatabaseManager(client)
 
     async def __aenter__(self) -> MultiDatabaseManager:
         await self.manager.connect()
@@ -549,3 +569,39 @@ def get_multi_db_manager():
     if multi_db_manager is None:
         multi_db_manager = MultiDatabaseManager()
     return multi_db_manager
+
+
+async def connect_db_manager() -> MultiDatabaseManager:
+    """
+    Connected manager bound to the worker's shared client (outside request handlers)
+
+    Callers must disconnect() it when done: that only releases a borrowed shared
+    client, but closes the private client created when no shared one exists.
+    """
+    manager = MultiDatabaseManager()
+    if not await manager.connect():
+        raise RuntimeError("Failed to establish database connection")
+    return manager
+
+
+async def get_db_manager() -> AsyncIterator[MultiDatabaseManager]:
+    """
+    FastAPI dependency yielding a manager bound to the worker's shared client
+
+    The manager is disconnected after the request (see connect_db_manager).
+
+    Raises:
+        HTTPException: 503 if no database connection could be established
+
+    Usage:
+        db_manager: MultiDatabaseManager = Depends(get_db_manager)
+    """
+    try:
+        manager = await connect_db_manager()
+    except Exception as e:
+        logger.error("❌ Database unavailable for request: %s", e)
+        raise HTTPException(status_code=503, detail="Database temporarily unavailable") from e
+    try:
+        yield manager
+    finally:
+        await manager.disconnect()
@@ -223,9 +223,26 @@ class ReportSchema:
             {"keys": [("organization_id", 1), ("created_by", 1)], "name": "idx_org_user"},
             {"keys": [("organization_id", 1), ("workflow.status", 1)], "name": "idx_org_status"},
             {"keys": [("organization_id", 1), ("reference_number", 1)], "name": "idx_org_ref_number"},  # NEW: Compound index
-            {"keys": [("created_at", -1)], "name": "idx_created_at_desc"},
+            # Keyset pagination sorts on (created_at, _id)
+            {"keys": [("created_at", -1), ("_id", -1)], "name": "idx_created_at_id_desc"},
             {"keys": [("isActive", 1)], "name": "idx_active"}
         ]
+    
+    @staticmethod
+    def get_org_database_indexes() -> List[Dict[str, Any]]:
+        """Get required indexes for the reports collection inside each organization database"""
+        return [
+            {"keys": [("report_id", 1)], "unique": True, "name": "idx_report_id"},
+            {"keys": [("reference_number", 1)], "name": "idx_reference_number"},
+            {"keys": [("created_at", -1)], "name": "idx_created_at_desc"},
+            # get_reports filters + created_at sort
+            {"keys": [("status", 1), ("created_at", -1)], "name": "idx_status_created_at"},
+            {"keys": [("bank_code", 1), ("created_at", -1)], "name": "idx_bank_created_at"},
+            {"keys": [("template_id", 1), ("created_at", -1)], "name": "idx_template_created_at"},
+            {"keys": [("created_by", 1), ("created_at", -1)], "name": "idx_created_by_created_at"},
+            # Dashboard pending reports (status filter + updated_at sort)
+            {"keys": [("status", 1), ("updated_at", -1), ("_id", -1)], "name": "idx_status_updated_at_id"}
+        ]
 
 class AuditLogSchema:
     """
@@ -279,6 +296,16 @@ class AuditLogSchema:
             # TTL index to auto-delete old audit logs (optional)
             {"keys": [("created_at", 1)], "expireAfterSeconds": 31536000, "name": "idx_ttl_audit_logs"}  # 1 year
         ]
+    
+    @staticmethod
+    def get_org_database_indexes() -> List[Dict[str, Any]]:
+        """Get required indexes for the activity_logs collection inside each organization database"""
+        return [
+            {"keys": [("timestamp", -1)], "name": "idx_timestamp_desc"},
+            {"keys": [("resource_type", 1), ("resource_id", 1), ("timestamp", -1)], "name": "idx_resource_timestamp"},
+            {"keys": [("user_id", 1), ("timestamp", -1)], "name": "idx_user_timestamp"},
+            {"keys": [("action", 1), ("timestamp", -1)], "name": "idx_action_timestamp"}
+        ]
 
 class OrganizationSettingsSchema:
     """
@@ -390,6 +417,147 @@ SHARED_COLLECTIONS = [
     "organizations"  # Organizations collection itself doesn't need filtering
 ]
 
+# Per-organization database collections and their index definitions
+ORG_DATABASE_INDEXES = {
+    "reports": ReportSchema.get_org_database_indexes,
+    "activity_logs": AuditLogSchema.get_org_database_indexes
+}
+
+# Databases that never hold organization data
+NON_ORG_DATABASES = {
+    "admin", "local", "config", "val_app_config", "valuation_admin",
+    "shared_resources", "valuation_app_prod", "valuation_reports"
+}
+
+async def create_org_database_indexes(org_db, dry_run: bool = False, logger=None) -> Dict[str, Dict[str, Any]]:
+    """
+    Create any missing per-organization indexes in one organization database
+    
+    Args:
+        org_db: Organization database (AsyncIOMotorDatabase)
+        dry_run: Only report missing indexes, do not build them
+        
+    Returns:
+        Per collection: {"created": [...], "existing": [...], "failed": {name: error}}
+    """
+    if logger is None:
+        logger = logging.getLogger(__name__)
+    
+    changes: Dict[str, Dict[str, Any]] = {}
+    
+    for collection_name, get_indexes in ORG_DATABASE_INDEXES.items():
+        collection = org_db[collection_name]
+        collection_changes: Dict[str, Any] = {"created": [], "existing": [], "failed": {}}
+        
+        existing_indexes = await collection.index_information()
+        existing_keys = {tuple(tuple(k) for k in info["key"]) for info in existing_indexes.values()}
+        
+        for index_spec in get_indexes():
+            keys = tuple(tuple(k) for k in index_spec["keys"])
+            if index_spec["name"] in existing_indexes or keys in existing_keys:
+                collection_changes["existing"].append(index_spec["name"])
+                continue
+            
+            if dry_run:
+                collection_changes["created"].append(index_spec["name"])
+                continue
+            
+            options: Dict[str, Any] = {
+                "name": index_spec["name"],
+                "unique": index_spec.get("unique", False),
+                "background": True
+            }
+            if index_spec.get("expireAfterSeconds") is not None:
+                options["expireAfterSeconds"] = index_spec["expireAfterSeconds"]
+            
+            try:
+                await collection.create_index(index_spec["keys"], **options)
+                collection_changes["created"].append(index_spec["name"])
+                logger.info(f"✅ Created index {index_spec['name']} on {org_db.name}.{collection_name}")
+            except Exception as e:
+                collection_changes["failed"][index_spec["name"]] = str(e)
+                logger.warning(f"⚠️ Could not create index {index_spec['name']} on {org_db.name}.{collection_name}: {e}")
+        
+        changes[collection_name] = collection_changes
+    
+    return changes
+
+async def list_org_database_names(db_manager) -> List[str]:
+    """Database names of every organization registered in val_app_config"""
+    config_db = await db_manager.get_config_db()
+    orgs = await config_db["organizations"].find(
+        {}, {"org_short_name": 1, "metadata.database_name": 1}
+    ).to_list(length=None)
+    
+    org_database_names: List[str] = []
+    for org in orgs:
+        database_name = (org.get("metadata") or {}).get("database_name") or org.get("org_short_name")
+        if database_name and database_name not in org_database_names:
+            org_database_names.append(database_name)
+    return org_database_names
+
+
+async def reconcile_org_indexes(
+    db_manager,
+    org_database_names: Optional[List[str]] = None,
+    dry_run: bool = False,
+    logger=None
+) -> Dict[str, Any]:
+    """
+    Find and build missing per-organization indexes across organization databases
+    
+    Args:
+        db_manager: Connected MultiDatabaseManager
+        org_database_names: Databases to check (default: every organization in val_app_config)
+        dry_run: Only report missing indexes, do not build them
+        
+    Returns:
+        Summary with per-database changes
+    """
+    if logger is None:
+        logger = logging.getLogger(__name__)
+    
+    if org_database_names is None:
+        org_database_names = await list_org_database_names(db_manager)
+    
+    summary: Dict[str, Any] = {
+        "dry_run": dry_run,
+        "databases_checked": 0,
+        "indexes_created": 0,
+        "indexes_failed": 0,
+        "databases": {}
+    }
+    
+    for database_name in org_database_names:
+        if database_name in NON_ORG_DATABASES:
+            continue
+        try:
+            changes = await create_org_database_indexes(
+                db_manager.get_org_database(database_name), dry_run=dry_run, logger=logger
+            )
+        except Exception as e:
+            logger.error(f"❌ Index reconciliation failed for {database_name}: {e}")
+            summary["databases"][database_name] = {"error": str(e)}
+            summary["indexes_failed"] += 1
+            continue
+        
+        summary["databases_checked"] += 1
+        summary["indexes_created"] += sum(len(c["created"]) for c in changes.values())
+        summary["indexes_failed"] += sum(len(c["failed"]) for c in changes.values())
+        # Only report databases where something changed or failed
+        if any(c["created"] or c["failed"] for c in changes.values()):
+            summary["databases"][database_name] = {
+                name: {"created": c["created"], "failed": c["failed"]}
+                for name, c in changes.items() if c["created"] or c["failed"]
+            }
+    
+    action = "missing" if dry_run else "created"
+    logger.info(
+        f"🎯 Index reconciliation: {summary['databases_checked']} org databases checked, "
+        f"{summary['indexes_created']} indexes {action}, {summary['indexes_failed']} failed"
+    )
+    return summary
+
 async def create_organization_indexes(db_manager, logger=None):
     """
     Create all required indexes for organization collections
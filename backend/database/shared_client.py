@@ -0,0 +1,99 @@
+"""
+Shared MongoDB Client Module for Valuation Application
+Holds the single AsyncIOMotorClient owned by each worker process.
+
+The client is opened once by the FastAPI lifespan hook and reused by
+MultiDatabaseManager, MongoDBManager, MultiDatabaseSession and the services
+built on top of them, so request handlers no longer pay for a new connection
+pool and server ping on every call.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+
+from utils.mongo_monitoring import mongo_metrics_listener
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Process-wide client (one per worker), managed by open/close_shared_client
+_shared_client: Optional[AsyncIOMotorClient[Any]] = None
+_client_lock = asyncio.Lock()
+
+
+def create_motor_client(connection_string: str) -> AsyncIOMotorClient[Any]:
+    """Build a motor client with the connection settings used across the application"""
+    return AsyncIOMotorClient(
+        connection_string,
+        serverSelectionTimeoutMS=30000,  # 30 second timeout for initial connection
+        connectTimeoutMS=30000,          # 30 second connection timeout
+        socketTimeoutMS=30000,           # 30 second socket timeout
+        maxPoolSize=int(os.getenv("MONGODB_MAX_POOL_SIZE", "50")),
+        minPoolSize=int(os.getenv("MONGODB_MIN_POOL_SIZE", "5")),
+        maxIdleTimeMS=60000,             # Keep connections alive for 1 minute
+        retryWrites=True,
+        retryReads=True,                 # Enable retry for reads
+        tlsAllowInvalidCertificates=True, # Allow invalid SSL certificates for Atlas connection
+        heartbeatFrequencyMS=30000,      # Check connection health every 30 seconds
+        event_listeners=[mongo_metrics_listener]
+    )
+
+
+def get_shared_client() -> Optional[AsyncIOMotorClient[Any]]:
+    """Return the worker's shared client, or None if the lifespan hook has not opened one"""
+    return _shared_client
+
+
+async def open_shared_client(max_retries: int = 3) -> Optional[AsyncIOMotorClient[Any]]:
+    """
+    Open the worker's shared MongoDB client (idempotent)
+
+    Returns:
+        The shared client, or None if MONGODB_URI is missing or the server is unreachable.
+        Callers fall back to per-manager clients in that case.
+    """
+    global _shared_client
+
+    async with _client_lock:
+        if _shared_client is not None:
+            return _shared_client
+
+        connection_string = os.getenv("MONGODB_URI")
+        if not connection_string:
+            logger.error("❌ MONGODB_URI not set - shared MongoDB client not opened")
+            return None
+
+        retry_delay = 2
+        for attempt in range(max_retries):
+            client = create_motor_client(connection_string)
+            try:
+                logger.info("Opening shared MongoDB client - Attempt %s/%s...", attempt + 1, max_retries)
+                await asyncio.wait_for(client.admin.command('ping'), timeout=15.0)
+                _shared_client = client
+                logger.info("✅ Shared MongoDB client ready")
+                return _shared_client
+            except (ConnectionFailure, ServerSelectionTimeoutError, asyncio.TimeoutError) as e:
+                logger.warning("⚠️ Shared client attempt %s failed: %s", attempt + 1, e)
+                client.close()
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(retry_delay)
+                    retry_delay *= 2
+
+        logger.error("❌ Failed to open shared MongoDB client after %s attempts", max_retries)
+        return None
+
+
+async def close_shared_client() -> None:
+    """Close the worker's shared MongoDB client"""
+    global _shared_client
+
+    async with _client_lock:
+        if _shared_client is not None:
+            _shared_client.close()
+            _shared_client = None
+            logger.info("🔒 Shared MongoDB client closed")
@@ -1,12 +1,11 @@
 from fastapi import FastAPI, HTTPException, Request, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPAuthorizationCredentials
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timezone
+from contextlib import asynccontextmanager
 from pydantic import BaseModel
-from passlib.context import CryptContext
-import json
 import logging
 import os
 import sys
@@ -18,7 +17,9 @@ if str(backend_dir) not in sys.path:
     sys.path.insert(0, str(backend_dir))
 
 # Import utilities after environment is loaded
-from utils.logger import RequestResponseLogger
+from utils.logger import start_log_writer, stop_log_writer
+from utils.request_logging import RequestLoggingMiddleware
+from utils.metrics import MetricsMiddleware, get_performance_metrics, metrics_registry
 from utils.activity_logger import ActivityLogger, ActivityAction
 from typing import TYPE_CHECKING
 
@@ -52,6 +53,23 @@ from utils.auth_middleware import (
     get_organization_context, 
     OrganizationContext
 )
+from database.multi_db_manager import MultiDatabaseManager, connect_db_manager, get_db_manager
+from services.template_cache import aggregated_template_cache, bank_metadata_cache
+from services.bank_template_registry import bank_template_registry
+from services.dashboard_stats import get_dashboard_stats_cached, invalidate_dashboard_stats
+from services.report_counters import record_report_created, record_status_change
+from services.report_summary import (
+    REPORT_LIST_PROJECTION,
+    build_report_summary,
+    build_summary_update,
+    ensure_report_summaries,
+    extract_display_data,
+    format_report_list_item
+)
+from utils.http_cache import conditional_json_response
+from utils.pagination import combine_filters, count_cache, keyset_filter, keyset_sort, split_page
+# MongoJSONResponse encodes ObjectId/datetime/Decimal itself (orjson), so content needs no pre-conversion
+from utils.json_response import MongoJSONResponse
 
 # Import new auth components (with error handling)
 auth_router = None
@@ -96,18 +114,6 @@ else:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Helper function to convert datetime objects to ISO format strings
-def convert_datetimes_to_iso(obj: Any) -> Any:
-    """Recursively convert datetime objects to ISO format strings"""
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    elif isinstance(obj, dict):
-        return {str(key): convert_datetimes_to_iso(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_datetimes_to_iso(item) for item in obj]
-    else:
-        return obj
-
 # Activity logging helper function
 async def log_activity(
     organization_id: str,
@@ -133,13 +139,7 @@ async def log_activity(
         ip_address: IP address of the request
     """
     try:
-        from database.multi_db_manager import MultiDatabaseManager
-        
-        db_manager = MultiDatabaseManager()
-        await db_manager.connect()
-        
-        # Get organization database
-        org_db = db_manager.get_org_database(organization_id)
+        from services.activity_writer import activity_writer
         
         # Create activity log document
         activity_log: Dict[str, Any] = {
@@ -154,10 +154,8 @@ async def log_activity(
             "created_at": datetime.now(timezone.utc)
         }
         
-        # Insert into activity_logs collection
-        await org_db["activity_logs"].insert_one(activity_log)
-        
-        await db_manager.disconnect()
+        # Queue for the organization's activity_logs collection (written in batches)
+        await activity_writer.submit(organization_id, "activity_logs", activity_log)
         
         logger.debug(f"📝 Activity logged: {action} by {user_email} in org {organization_id}")
         
@@ -165,10 +163,68 @@ async def log_activity(
         # Don't fail the main operation if activity logging fails
         logger.error(f"❌ Failed to log activity: {str(e)}")
 
-app = FastAPI(title="Valuation App API", version="1.0.0")
+async def reconcile_indexes_on_startup():
+    """Build any per-organization indexes that are missing (runs in the background)"""
+    try:
+        from database.organization_models import reconcile_org_indexes
+        
+        db_manager = await connect_db_manager()
+        try:
+            await reconcile_org_indexes(db_manager, logger=logger)
+        finally:
+            await db_manager.disconnect()
+    except Exception as e:
+        logger.error(f"❌ Startup index reconciliation failed: {str(e)}")
 
-# Initialize request/response logger
-api_logger = RequestResponseLogger()
+async def release_reference_blocks():
+    """Return or log reference sequence numbers reserved by this worker but never used"""
+    from database.shared_client import get_shared_client
+    from services.reference_number_service import reference_block_allocator
+    
+    client = get_shared_client()
+    if not reference_block_allocator.enabled or client is None:
+        return
+    try:
+        await reference_block_allocator.release_unused(client.val_app_config.organizations)
+    except Exception as e:
+        logger.error(f"❌ Failed to release reference number blocks: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open one pooled MongoDB client per worker and close it on shutdown"""
+    import asyncio
+    from database.shared_client import open_shared_client, close_shared_client
+    from services.activity_writer import activity_writer
+    
+    start_log_writer()
+    background_tasks = []
+    client = await open_shared_client()
+    if client is None:
+        logger.warning("⚠️ Shared MongoDB client unavailable - handlers will open their own connections")
+    else:
+        # Batch activity log inserts on the shared client
+        activity_writer.start(client)
+        if os.getenv("LOG_ARCHIVE_ENABLED", "false").lower() == "true":
+            from services.log_archive import log_retention_loop
+            interval_hours = float(os.getenv("LOG_ARCHIVE_INTERVAL_HOURS", "24"))
+            background_tasks.append(asyncio.create_task(log_retention_loop(connect_db_manager, interval_hours)))
+        if os.getenv("RECONCILE_ORG_INDEXES_ON_STARTUP", "true").lower() == "true":
+            background_tasks.append(asyncio.create_task(reconcile_indexes_on_startup()))
+    try:
+        yield
+    finally:
+        for task in background_tasks:
+            task.cancel()
+        await activity_writer.stop()
+        password_hasher.shutdown()
+        if auth_router is not None:
+            from auth.cognito_service import cognito_service
+            cognito_service.shutdown()
+        await release_reference_blocks()
+        await close_shared_client()
+        stop_log_writer()
+
+app = FastAPI(title="Valuation App API", version="1.0.0", lifespan=lifespan, default_response_class=MongoJSONResponse)
 
 # Global activity logger instance (initialized on startup)
 activity_logger: Optional[ActivityLogger] = None
@@ -186,26 +242,38 @@ app.include_router(organization_router)
 app.include_router(admin_router)
 app.include_router(pdf_router)
 
-# Password hashing context with bcrypt fallback
-import bcrypt
+# Password hashing runs in a bounded thread pool (see utils/password_hashing.py)
+from utils.password_hashing import PasswordHasherBusy, password_hasher
 
-def verify_password(password: str, hashed: str) -> bool:
-    """Fallback password verification"""
-    try:
-        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
-    except Exception as e:
-        print(f"❌ Password verification error: {e}")
+async def verify_login_password(users_collection, user: Dict[str, Any], password: str) -> bool:
+    """
+    Verify a login password off the event loop
+    
+    Rehashes and stores the password when the stored hash used a different
+    bcrypt cost than BCRYPT_ROUNDS. Raises 503 when the hashing pool is saturated.
+    """
+    if not user or not user.get("password_hash"):
         return False
-
-try:
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-except Exception as e:
-    print(f"⚠️ Bcrypt configuration issue: {e}")
-    # Fallback to simpler bcrypt setup is handled by verify_password function
+    try:
+        password_valid, new_hash = await password_hasher.verify_and_update(password, user["password_hash"])
+    except PasswordHasherBusy:
+        logger.warning("⚠️ Password hashing pool saturated - rejecting login with 503")
+        raise HTTPException(
+            status_code=503,
+            detail="Too many login attempts in progress, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
     
-    def hash_password(password: str) -> str:
-        """Fallback password hashing"""
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    if password_valid and new_hash:
+        try:
+            await users_collection.update_one(
+                {"_id": user["_id"], "password_hash": user["password_hash"]},
+                {"$set": {"password_hash": new_hash}}
+            )
+            logger.info(f"🔑 Rehashed password for {user.get('email')} with the current bcrypt cost")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not store rehashed password for {user.get('email')}: {e}")
+    return password_valid
 
 # Security scheme (used in auth middleware)
 from fastapi.security import HTTPBearer
@@ -298,13 +366,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def json_serializer(obj: Any) -> str:
-    """JSON serializer for objects not serializable by default"""
-    if hasattr(obj, 'isoformat'):
-        return obj.isoformat()
-    if hasattr(obj, '__dict__'):
-        return obj.__dict__
-    return str(obj)
+# Log every request/response (sampled, size-capped, written off the event loop)
+app.add_middleware(RequestLoggingMiddleware)
+
+# Per-route request counts, latency histograms and in-flight gauges for /metrics
+app.add_middleware(MetricsMiddleware)
 
 # Authentication helper functions
 def create_dev_token(email: str, org_short_name: str, role: str) -> Dict[str, Any]:
@@ -387,13 +453,7 @@ async def login(login_request: LoginRequest, request: Request):
                 sys_db = db_manager.get_org_database("system-administration")
                 user = await sys_db["users"].find_one({"email": login_request.email})
                 
-                # Safe password verification with fallback
-                password_valid = False
-                try:
-                    password_valid = pwd_context.verify(login_request.password, user['password_hash']) if user and 'password_hash' in user else False
-                except Exception as e:
-                    print(f"⚠️ Using bcrypt fallback due to: {e}")
-                    password_valid = verify_password(login_request.password, user['password_hash']) if user and 'password_hash' in user else False
+                password_valid = await verify_login_password(sys_db["users"], user, login_request.password)
                 
                 if user and password_valid:
                     # Create system admin token with proper organization context
@@ -427,7 +487,7 @@ async def login(login_request: LoginRequest, request: Request):
                     logger.info(f"✅ System admin login successful for {login_request.email}")
                     
                     await db_manager.disconnect()
-                    return JSONResponse(
+                    return MongoJSONResponse(
                         status_code=200,
                         content={
                             "success": True,
@@ -436,6 +496,7 @@ async def login(login_request: LoginRequest, request: Request):
                     )
         
         # Find user by email in admin database
+        users_collection = admin_db.users
         user = await admin_db.users.find_one({
             "email": login_request.email,
             "isActive": True
@@ -444,6 +505,7 @@ async def login(login_request: LoginRequest, request: Request):
         # If not found in admin db, check valuation_admin for legacy users
         if not user:
             valuation_admin_db = db_manager.get_database("admin")
+            users_collection = valuation_admin_db["users"]
             user = await valuation_admin_db["users"].find_one({
                 "email": login_request.email,
                 "isActive": True
@@ -484,13 +546,7 @@ async def login(login_request: LoginRequest, request: Request):
         
         # Validate password if password_hash exists
         if user.get("password_hash"):
-            # Safe password verification with fallback
-            password_valid = False
-            try:
-                password_valid = pwd_context.verify(login_request.password, user["password_hash"]) if user and "password_hash" in user else False
-            except Exception as e:
-                print(f"⚠️ Using bcrypt fallback due to: {e}")
-                password_valid = verify_password(login_request.password, user["password_hash"]) if user and "password_hash" in user else False
+            password_valid = await verify_login_password(users_collection, user, login_request.password)
             
             if not password_valid:
                 logger.warning(f"❌ Invalid password for: {login_request.email}")
@@ -606,7 +662,7 @@ async def login(login_request: LoginRequest, request: Request):
         
         logger.info(f"✅ Login successful for {email} with role {role} in org {org_short_name}")
         
-        return JSONResponse(
+        return MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -666,7 +722,7 @@ async def dev_login(dev_request: DevLoginRequest, request: Request):
         
         logger.info(f"✅ Development login successful for {dev_request.email} in org {org_short_name}")
         
-        return JSONResponse(
+        return MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -715,7 +771,7 @@ async def logout(request: Request):
     except Exception as e:
         logger.warning(f"Failed to log logout activity: {e}")
     
-    return JSONResponse(
+    return MongoJSONResponse(
         status_code=200,
         content={
             "success": True,
@@ -743,7 +799,7 @@ async def get_login_activities(
         # Get statistics
         stats = login_logger.get_login_stats(hours=hours)
         
-        return JSONResponse(
+        return MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -757,13 +813,30 @@ async def get_login_activities(
         
     except Exception as e:
         logger.error(f"❌ Error fetching login activities: {str(e)}")
-        return JSONResponse(
+        return MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
 
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """
+    Prometheus text exposition of this worker's request and MongoDB metrics
+    
+    Requires "Authorization: Bearer <METRICS_AUTH_TOKEN>" when METRICS_AUTH_TOKEN is set.
+    """
+    token = os.getenv("METRICS_AUTH_TOKEN")
+    if token and request.headers.get("authorization") != f"Bearer {token}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    
+    return Response(
+        content=metrics_registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 # ================================
 # ADMIN DASHBOARD - HEALTH CHECK
 # ================================
@@ -774,8 +847,6 @@ async def admin_health_check(request: Request):
     Comprehensive system health check for admin dashboard
     Monitors: Backend API, MongoDB, Storage, System Resources
     """
-    request_data = await api_logger.log_request(request)
-    
     logger.info("🏥 Running comprehensive health check")
     
     try:
@@ -903,17 +974,15 @@ async def admin_health_check(request: Request):
                 "error": "Could not retrieve system resources"
             }
         
-        # 5. Performance Metrics (placeholder for now)
+        # 5. Performance Metrics (this worker's last minute, from the /metrics registry)
         health_status["performance_metrics"] = {
             "uptime_seconds": round(time.time() - psutil.boot_time(), 0) if hasattr(psutil, 'boot_time') else 0,
-            "requests_per_minute": 0,  # TODO: Implement request counter
-            "avg_response_time_ms": 0,  # TODO: Implement from logs
-            "error_rate_percent": 0     # TODO: Implement from logs
+            **get_performance_metrics()
         }
         
         logger.info(f"✅ Health check completed: {health_status['overall_status']}")
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -921,7 +990,6 @@ async def admin_health_check(request: Request):
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except Exception as e:
@@ -929,7 +997,7 @@ async def admin_health_check(request: Request):
         import traceback
         traceback.print_exc()
         
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={
                 "success": False,
@@ -938,7 +1006,6 @@ async def admin_health_check(request: Request):
             }
         )
         
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -957,7 +1024,8 @@ async def get_activity_logs(
     status: Optional[str] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    include_archived: bool = False
 ):
     """
     Get activity logs with filtering and pagination
@@ -972,10 +1040,9 @@ async def get_activity_logs(
     - start_date: Filter by start date (ISO format)
     - end_date: Filter by end date (ISO format)
     - search: Search in user email, organization name, or details
+    - include_archived: Also search archived months (automatic when start_date is past the hot window)
     """
     global activity_logger
-    request_data = await api_logger.log_request(request)
-    
     try:
         # Initialize activity logger if not already done
         if activity_logger is None:
@@ -1014,10 +1081,11 @@ async def get_activity_logs(
             status=status,
             start_date=start_datetime,
             end_date=end_datetime,
-            search=search
+            search=search,
+            include_archived=include_archived
         )
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -1025,7 +1093,6 @@ async def get_activity_logs(
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
@@ -1035,7 +1102,7 @@ async def get_activity_logs(
         import traceback
         traceback.print_exc()
         
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={
                 "success": False,
@@ -1043,7 +1110,6 @@ async def get_activity_logs(
             }
         )
         
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -1063,8 +1129,6 @@ async def get_activity_stats(
     - end_date: Filter by end date (ISO format)
     """
     global activity_logger
-    request_data = await api_logger.log_request(request)
-    
     try:
         # Initialize activity logger if not already done
         if activity_logger is None:
@@ -1096,7 +1160,7 @@ async def get_activity_stats(
             end_date=end_datetime
         )
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -1104,7 +1168,6 @@ async def get_activity_stats(
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
@@ -1114,7 +1177,7 @@ async def get_activity_stats(
         import traceback
         traceback.print_exc()
         
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={
                 "success": False,
@@ -1122,7 +1185,6 @@ async def get_activity_stats(
             }
         )
         
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -1152,7 +1214,7 @@ async def get_current_user(request: Request):
         # Get organization context
         org_context = await get_organization_context(credentials)
         
-        return JSONResponse(
+        return MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -1183,67 +1245,51 @@ async def get_current_user(request: Request):
 @app.get("/api/banks")
 async def get_all_banks(request: Request):
     """Get all active banks with their templates from shared_resources"""
-    # Log the request
-    request_data = await api_logger.log_request(request)
+    # Serve the prepared body (or a 304) when this worker already has it
+    prepared = bank_metadata_cache.get("banks")
+    if prepared is not None:
+        response = conditional_json_response(request, prepared)
+        return response
     
     logger.info("🏦 Fetching all banks from shared_resources...")
     
+    db_manager = None
     try:
-        from database.multi_db_manager import MultiDatabaseManager
-        
-        db_manager = MultiDatabaseManager()
-        await db_manager.connect()
+        db_manager = await connect_db_manager()
         
         # Get shared resources database
         shared_db = db_manager.get_shared_database()
         
-        # Fetch all active banks
-        banks_cursor = shared_db.banks.find({"isActive": True})
+        # Fetch all active banks with their active templates in one round trip;
+        # migration metadata and fields duplicated from the parent bank are projected out server-side
+        banks_cursor = shared_db.banks.aggregate([
+            {"$match": {"isActive": True}},
+            {"$project": {"migratedAt": 0, "migrationSource": 0}},
+            {"$lookup": {
+                "from": "bank_templates",
+                "let": {"bank_code": "$bankCode"},
+                "pipeline": [
+                    {"$match": {
+                        "$expr": {"$eq": ["$bankCode", "$$bank_code"]},
+                        "isActive": True
+                    }},
+                    {"$project": {
+                        "migratedAt": 0,
+                        "migrationSource": 0,
+                        "bankCode": 0,  # Already in parent bank
+                        "bankName": 0   # Already in parent bank
+                    }}
+                ],
+                "as": "templates"
+            }}
+        ])
         banks = await banks_cursor.to_list(length=None)
         
-        logger.info(f"📦 Found {len(banks)} active banks")
-        
-        # For each bank, fetch its templates
-        for bank in banks:
-            bank_code = bank.get("bankCode")
-            
-            # Fetch templates for this bank
-            templates_cursor = shared_db.bank_templates.find({
-                "bankCode": bank_code,
-                "isActive": True
-            })
-            templates = await templates_cursor.to_list(length=None)
-            
-            # Clean up template documents (remove migration metadata)
-            cleaned_templates = []
-            for template in templates:
-                # Remove migration-specific fields
-                template.pop("migratedAt", None)
-                template.pop("migrationSource", None)
-                template.pop("bankCode", None)  # Already in parent bank
-                template.pop("bankName", None)  # Already in parent bank
-                cleaned_templates.append(template)
-            
-            # Add templates array to bank
-            bank["templates"] = cleaned_templates
-            
-            # Clean up bank document
-            bank.pop("migratedAt", None)
-            bank.pop("migrationSource", None)
-            
-            logger.debug(f"  ✅ {bank_code}: {len(cleaned_templates)} templates")
-        
-        logger.info(f"✅ Successfully aggregated banks with templates")
-        
-        await db_manager.disconnect()
-        
-        response = JSONResponse(
-            status_code=200,
-            content=json.loads(json.dumps(banks, default=json_serializer))
-        )
+        logger.info(f"✅ Successfully aggregated {len(banks)} active banks with templates")
         
-        # Log the response
-        api_logger.log_response(response, request_data)
+        # Serialize once; repeat requests are served from the prepared body
+        prepared = bank_metadata_cache.set("banks", banks)
+        response = conditional_json_response(request, prepared)
         
         return response
         
@@ -1252,20 +1298,24 @@ async def get_all_banks(request: Request):
         import traceback
         traceback.print_exc()
         
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"error": "Internal server error", "details": str(e)}
         )
         
-        # Log the error response
-        api_logger.log_response(error_response, request_data)
-        
         return error_response
+    finally:
+        if db_manager is not None:
+            await db_manager.disconnect()
 
 @app.get("/api/banks/{bank_code}/branches")
 async def get_bank_branches(bank_code: str, request: Request):
     """Get all branches for a specific bank"""
-    request_data = await api_logger.log_request(request)
+    cache_key = f"branches:{bank_code.upper()}"
+    prepared = bank_metadata_cache.get(cache_key)
+    if prepared is not None:
+        response = conditional_json_response(request, prepared)
+        return response
     
     logger.info(f"🏦 Fetching branches for bank: {bank_code}")
     
@@ -1296,12 +1346,9 @@ async def get_bank_branches(bank_code: str, request: Request):
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
-            status_code=200,
-            content=json.loads(json.dumps(active_branches, default=json_serializer))
-        )
+        prepared = bank_metadata_cache.set(cache_key, active_branches)
+        response = conditional_json_response(request, prepared)
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
@@ -1310,311 +1357,282 @@ async def get_bank_branches(bank_code: str, request: Request):
         logger.error(f"❌ Error fetching bank branches: {str(e)}")
         traceback.print_exc()
         
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"error": "Internal server error", "details": str(e)}
         )
         
-        api_logger.log_response(error_response, request_data)
         return error_response
 
-@app.get("/api/templates/{bank_code}/{template_id}/aggregated-fields")
-async def get_aggregated_template_fields(bank_code: str, template_id: str, request: Request) -> JSONResponse:
-    """Get template fields using multi-collection aggregation: common_form_fields + bank-specific template collection"""
-    # Log the request
-    request_data = await api_logger.log_request(request)
+async def compile_aggregated_template_fields(db_manager: MultiDatabaseManager, bank_code: str, template_id: str) -> Dict[str, Any]:
+    """
+    Assemble the aggregated-fields payload for a template (common_form_fields + bank-specific template collection)
     
-    try:
-        logger.info(f"🔄 Multi-Collection Aggregation API call for template: {bank_code}/{template_id}")
-        
-        # Ensure environment variable is set before importing database modules
-        if not os.getenv('MONGODB_URI'):
-            raise HTTPException(status_code=500, detail="MongoDB connection not configured")
+    Returns a JSON-safe dict; raises HTTPException(404/500) when the bank or template cannot be resolved.
+    """
+    admin_db = db_manager.get_database("admin")
+    
+    # Resolve bank and template from the in-memory registry
+    registry = await bank_template_registry.ensure_loaded(db_manager)
+    
+    bank_doc = registry.get_bank(bank_code)
+    
+    if not bank_doc:
+        logger.warning(f"❌ Bank not found: {bank_code}")
+        raise HTTPException(status_code=404, detail=f"Bank {bank_code} not found")
+    
+    if not bank_doc.get("isActive", True):
+        logger.warning(f"❌ Bank is inactive: {bank_code}")
+        raise HTTPException(status_code=404, detail=f"Bank {bank_code} is inactive")
+    
+    # Step 2: Find the specific template within the bank
+    target_template = registry.get_template(bank_code, template_id)
+    
+    if not target_template:
+        logger.warning(f"❌ Template not found: {template_id} for bank {bank_code}")
+        raise HTTPException(
+            status_code=404, 
+            detail=f"Template {template_id} not found for bank {bank_code}"
+        )
         
-        from database.multi_db_manager import MultiDatabaseManager
+    collection_ref = target_template.get("collectionRef")
+    if not collection_ref:
+        logger.error(f"❌ No collection reference found for template: {bank_code}/{template_id}")
+        raise HTTPException(
+            status_code=500, 
+            detail="Template collection reference not configured"
+        )
+    
+    logger.info(f"📋 Using collection: {collection_ref}")
+    
+    # Step 3: Get common form fields (all active fields)
+    common_fields_collection = admin_db["common_form_fields"]
+    common_fields_docs = await common_fields_collection.find({"isActive": True}).to_list(length=None)
+    
+    # Get common fields (already in correct format)
+    common_fields = []
+    for doc in common_fields_docs:
+        doc_fields = doc.get("fields", [])
+        for field in doc_fields:
+            # Fields are already in correct frontend format
+            common_fields.append(field)
+    
+    logger.info(f"📄 Fetched {len(common_fields)} common fields")
+    
+    # Step 4: Get bank-specific template fields from the collection
+    template_collection = admin_db[collection_ref]
+    template_collection_docs = await template_collection.find({}).to_list(length=None)
+    
+    if not template_collection_docs:
+        logger.warning(f"❌ No template data found in collection: {collection_ref}")
+        raise HTTPException(
+            status_code=404, 
+            detail=f"Template data not found for {bank_code}/{template_id}"
+        )
+    
+    # Process bank-specific fields from collection documents
+    bank_specific_tabs = []
+    
+    for doc in template_collection_docs:
+        template_metadata = doc.get("templateMetadata", {})
         
-        logger.info(f"🔄 Starting Multi-Collection Aggregation API call for template: {bank_code}/{template_id}")
+        # Build tabs structure based on template metadata
+        tabs_config = template_metadata.get("tabs", [])
         
-        # Use MultiDatabaseManager directly (same as working debug endpoints)
-        db_manager = MultiDatabaseManager()
-        await db_manager.connect()
+        if not tabs_config:
+            # Fallback: create a single tab from document fields
+            doc_fields = doc.get("fields", [])
+            if doc_fields:
+                bank_specific_tabs.append({
+                    "tabId": "property_details",
+                    "tabName": "property_details",
+                    "tabTitle": "Property Details",
+                    "tabOrder": 1,
+                    "hasSections": False,
+                    "description": "Property valuation details",
+                    "fields": doc_fields,
+                    "sections": []
+                })
+            continue
         
-        try:
-            admin_db = db_manager.get_database("admin")
-            
-            # Debug: Check what documents exist in the admin.banks collection
-            admin_banks_count = await admin_db.banks.count_documents({})
-            logger.info(f"🔍 Found {admin_banks_count} documents in admin.banks collection")
-            
-            # Find the comprehensive document
-            unified_doc = await admin_db.banks.find_one({"_id": "all_banks_comprehensive_v4"})
-            
-            if unified_doc:
-                logger.info(f"✅ Found comprehensive document: {unified_doc.get('_id')}")
-            else:
-                logger.error(f"❌ Comprehensive document not found!")
-                # Try to find any document
-                any_doc = await admin_db.banks.find_one({})
-                if any_doc:
-                    logger.info(f"   But found other document: {any_doc.get('_id')}")
-                    # Use it if it seems to be banks data
-                    if "banks" in any_doc:
-                        unified_doc = any_doc
-                        logger.info(f"✅ Using found document as it contains banks data")
-                
-            if not unified_doc:
-                raise HTTPException(status_code=404, detail="Banks configuration not found")
-
-            
-            # Find the specific bank in the banks array
-            bank_doc = None
-            all_banks = unified_doc.get("banks", [])
-            
-            for bank in all_banks:
-                if bank.get("bankCode", "").upper() == bank_code.upper():
-                    bank_doc = bank
-                    break
-            
-            if not bank_doc:
-                logger.warning(f"❌ Bank not found: {bank_code}")
-                raise HTTPException(status_code=404, detail=f"Bank {bank_code} not found")
-            
-            if not bank_doc.get("isActive", True):
-                logger.warning(f"❌ Bank is inactive: {bank_code}")
-                raise HTTPException(status_code=404, detail=f"Bank {bank_code} is inactive")
-            
-            # Step 2: Find the specific template within the bank
-            target_template = None
-            templates = bank_doc.get("templates", [])
-            
-            for template in templates:
-                if (template.get("templateCode", "").upper() == template_id.upper() or 
-                    template.get("templateId", "").upper() == template_id.upper()):
-                    target_template = template
-                    break
-            
-            if not target_template:
-                logger.warning(f"❌ Template not found: {template_id} for bank {bank_code}")
-                raise HTTPException(
-                    status_code=404, 
-                    detail=f"Template {template_id} not found for bank {bank_code}"
-                )
-                
-            collection_ref = target_template.get("collectionRef")
-            if not collection_ref:
-                logger.error(f"❌ No collection reference found for template: {bank_code}/{template_id}")
-                raise HTTPException(
-                    status_code=500, 
-                    detail="Template collection reference not configured"
-                )
-            
-            logger.info(f"📋 Using collection: {collection_ref}")
-            
-            # Step 3: Get common form fields (all active fields)
-            common_fields_collection = admin_db["common_form_fields"]
-            common_fields_docs = await common_fields_collection.find({"isActive": True}).to_list(length=None)
-            
-            # Get common fields (already in correct format)
-            common_fields = []
-            for doc in common_fields_docs:
-                doc_fields = doc.get("fields", [])
-                for field in doc_fields:
-                    # Fields are already in correct frontend format
-                    common_fields.append(field)
-            
-            logger.info(f"📄 Fetched {len(common_fields)} common fields")
-            
-            # Step 4: Get bank-specific template fields from the collection
-            template_collection = admin_db[collection_ref]
-            template_collection_docs = await template_collection.find({}).to_list(length=None)
+        # Process each tab from metadata
+        for tab_config in sorted(tabs_config, key=lambda x: x.get("sortOrder", 0)):
+            tab_id = tab_config.get("tabId", "default_tab")
             
-            if not template_collection_docs:
-                logger.warning(f"❌ No template data found in collection: {collection_ref}")
-                raise HTTPException(
-                    status_code=404, 
-                    detail=f"Template data not found for {bank_code}/{template_id}"
-                )
-            
-            # Process bank-specific fields from collection documents
-            bank_specific_tabs = []
+            # Build tab structure
+            tab = {
+                "tabId": tab_id,
+                "tabName": tab_config.get("tabName", tab_id),
+                "tabTitle": tab_config.get("tabName", tab_id).replace("_", " ").title(),
+                "tabOrder": tab_config.get("sortOrder", 1),
+                "hasSections": tab_config.get("hasSections", False),
+                "description": tab_config.get("description", ""),
+                "fields": [],
+                "sections": []
+            }
             
-            for doc in template_collection_docs:
-                template_metadata = doc.get("templateMetadata", {})
-                
-                # Build tabs structure based on template metadata
-                tabs_config = template_metadata.get("tabs", [])
-                
-                if not tabs_config:
-                    # Fallback: create a single tab from document fields
-                    doc_fields = doc.get("fields", [])
-                    if doc_fields:
-                        bank_specific_tabs.append({
-                            "tabId": "property_details",
-                            "tabName": "property_details",
-                            "tabTitle": "Property Details",
-                            "tabOrder": 1,
-                            "hasSections": False,
-                            "description": "Property valuation details",
-                            "fields": doc_fields,
-                            "sections": []
-                        })
-                    continue
+            # Handle tabs with sections
+            if tab_config.get("hasSections"):
+                sections_config = tab_config.get("sections", [])
+                print(f"DEBUG: Tab {tab_config.get('tabName')} has {len(sections_config)} sections")
                 
-                # Process each tab from metadata
-                for tab_config in sorted(tabs_config, key=lambda x: x.get("sortOrder", 0)):
-                    tab_id = tab_config.get("tabId", "default_tab")
+                for section_config in sorted(sections_config, key=lambda x: x.get("sortOrder", 0)):
+                    section_id = section_config.get("sectionId")
                     
-                    # Build tab structure
-                    tab = {
-                        "tabId": tab_id,
-                        "tabName": tab_config.get("tabName", tab_id),
-                        "tabTitle": tab_config.get("tabName", tab_id).replace("_", " ").title(),
-                        "tabOrder": tab_config.get("sortOrder", 1),
-                        "hasSections": tab_config.get("hasSections", False),
-                        "description": tab_config.get("description", ""),
-                        "fields": [],
-                        "sections": []
-                    }
+                    # Find the corresponding section in documents array
+                    document_section = None
+                    for document in doc.get("documents", []):
+                        for doc_section in document.get("sections", []):
+                            if doc_section.get("sectionId") == section_id:
+                                document_section = doc_section
+                                break
+                        if document_section:
+                            break
                     
-                    # Handle tabs with sections
-                    if tab_config.get("hasSections"):
-                        sections_config = tab_config.get("sections", [])
-                        print(f"DEBUG: Tab {tab_config.get('tabName')} has {len(sections_config)} sections")
+                    if document_section:
+                        section_fields = document_section.get("fields", [])
                         
-                        for section_config in sorted(sections_config, key=lambda x: x.get("sortOrder", 0)):
-                            section_id = section_config.get("sectionId")
-                            
-                            # Find the corresponding section in documents array
-                            document_section = None
-                            for document in doc.get("documents", []):
-                                for doc_section in document.get("sections", []):
-                                    if doc_section.get("sectionId") == section_id:
-                                        document_section = doc_section
-                                        break
-                                if document_section:
-                                    break
-                            
-                            if document_section:
-                                section_fields = document_section.get("fields", [])
-                                
-                                # Process fields to enhance calculation metadata
-                                section_fields = process_template_fields(section_fields)
+                        # Process fields to enhance calculation metadata
+                        section_fields = process_template_fields(section_fields)
+                        
+                        # Check if this is a documents section - integrate document types
+                        section_name = section_config.get("sectionName", "").lower()
+                        print(f"DEBUG: Processing section: '{section_name}' - checking for document keyword")
+                        logger.info(f"🔍 Processing section: '{section_name}' - checking for document keyword")
+                        if "document" in section_name:
+                            logger.info(f"📄 Found documents section: {section_name}")
+                            try:
+                                from services.document_types_integrator import DocumentTypesIntegrator
                                 
-                                # Check if this is a documents section - integrate document types
-                                section_name = section_config.get("sectionName", "").lower()
-                                print(f"DEBUG: Processing section: '{section_name}' - checking for document keyword")
-                                logger.info(f"🔍 Processing section: '{section_name}' - checking for document keyword")
-                                if "document" in section_name:
-                                    logger.info(f"📄 Found documents section: {section_name}")
-                                    try:
-                                        from services.document_types_integrator import DocumentTypesIntegrator
-                                        
-                                        logger.info(f"📄 Calling DocumentTypesIntegrator with bank_code='{bank_code}', property_type='{template_id}'")
-                                        # Get document types for this bank and property type (template_id = property type)
-                                        doc_type_fields = await DocumentTypesIntegrator.get_document_fields(
-                                            db_manager, property_type=template_id, bank_code=bank_code
-                                        )
-                                        if doc_type_fields:
-                                            logger.info(f"📄 Adding {len(doc_type_fields)} document type fields to section")
-                                            section_fields.extend(doc_type_fields)
-                                        else:
-                                            logger.warning(f"📄 No document type fields found for {bank_code}/{template_id}")
-                                    except Exception as e:
-                                        logger.error(f"❌ Error integrating document types: {e}")
-                                        import traceback
-                                        traceback.print_exc()
+                                logger.info(f"📄 Calling DocumentTypesIntegrator with bank_code='{bank_code}', property_type='{template_id}'")
+                                # Get document types for this bank and property type (template_id = property type)
+                                doc_type_fields = await DocumentTypesIntegrator.get_document_fields(
+                                    db_manager, property_type=template_id, bank_code=bank_code
+                                )
+                                if doc_type_fields:
+                                    logger.info(f"📄 Adding {len(doc_type_fields)} document type fields to section")
+                                    section_fields.extend(doc_type_fields)
                                 else:
-                                    logger.info(f"🔍 Section '{section_name}' does not contain 'document' keyword")
-                                
-                                section = {
-                                    "sectionId": section_config.get("sectionId"),
-                                    "sectionName": section_config.get("sectionName"),
-                                    "sortOrder": section_config.get("sortOrder"),
-                                    "description": section_config.get("description", ""),
-                                    "fields": section_fields
-                                }
-                                tab["sections"].append(section)
-                                # Also add fields to tab level for backward compatibility
-                                tab["fields"].extend(section_fields)
-                    
-                    # Handle tabs without sections (normal field structure)
-                    else:
-                        # Get fields from the specific document that matches this tab's documentSource
-                        document_source = tab_config.get("documentSource")
-                        if document_source:
-                            # Find the document with matching templateId
-                            for document in doc.get("documents", []):
-                                if document.get("templateId") == document_source:
-                                    tab["fields"] = process_template_fields(document.get("fields", []))
-                                    break
+                                    logger.warning(f"📄 No document type fields found for {bank_code}/{template_id}")
+                            except Exception as e:
+                                logger.error(f"❌ Error integrating document types: {e}")
+                                import traceback
+                                traceback.print_exc()
                         else:
-                            # Fallback: get all fields if no documentSource specified
-                            all_doc_fields = []
-                            for document in doc.get("documents", []):
-                                doc_fields = process_template_fields(document.get("fields", []))
-                                all_doc_fields.extend(doc_fields)
-                            tab["fields"] = all_doc_fields
-                    
-                    bank_specific_tabs.append(tab)
-            
-            logger.info(f"🎯 Created {len(bank_specific_tabs)} bank-specific tabs")
-            
-            # Step 4.5: Process fields to enhance calculation metadata
-            # Common fields are already transformed, no need for additional processing
-            processed_common_fields = common_fields
-            processed_bank_tabs = []
-            for tab in bank_specific_tabs:
-                processed_tab = dict(tab)
-                processed_tab["fields"] = process_template_fields(tab.get("fields", []))
-                
-                # Also process section fields if they exist
-                if tab.get("sections"):
-                    processed_sections = []
-                    for section in tab["sections"]:
-                        processed_section = dict(section)
-                        processed_section["fields"] = process_template_fields(section.get("fields", []))
-                        processed_sections.append(processed_section)
-                    processed_tab["sections"] = processed_sections
-                
-                processed_bank_tabs.append(processed_tab)
-            
-            logger.info(f"✅ Processed calculation metadata for all fields")
-            
-            # Step 5: Build comprehensive response (matching expected frontend format)
-            response_data = {
-                "templateInfo": {
-                    "templateId": target_template.get("templateId", ""),
-                    "templateName": target_template.get("templateName", ""),
-                    "templateCode": target_template.get("templateCode", ""),
-                    "templateType": target_template.get("templateType", ""),
-                    "propertyType": target_template.get("propertyType", ""),
-                    "description": target_template.get("description", ""),
-                    "version": target_template.get("version", "1.0"),
-                    "bankCode": bank_doc.get("bankCode", ""),
-                    "bankName": bank_doc.get("bankName", "")
-                },
-                "commonFields": processed_common_fields,
-                "bankSpecificTabs": processed_bank_tabs,
-                "aggregatedAt": datetime.now(timezone.utc).isoformat(),
-                "metadata": {
-                    "architecture": "multi_collection",
-                    "commonFieldsSource": "common_form_fields",
-                    "bankSpecificSource": collection_ref,
-                    "totalCommonFields": len(common_fields),
-                    "totalBankTabs": len(bank_specific_tabs),
-                    "source": "multi_collection_aggregation"
-                }
-            }
+                            logger.info(f"🔍 Section '{section_name}' does not contain 'document' keyword")
+                        
+                        section = {
+                            "sectionId": section_config.get("sectionId"),
+                            "sectionName": section_config.get("sectionName"),
+                            "sortOrder": section_config.get("sortOrder"),
+                            "description": section_config.get("description", ""),
+                            "fields": section_fields
+                        }
+                        tab["sections"].append(section)
+                        # Also add fields to tab level for backward compatibility
+                        tab["fields"].extend(section_fields)
             
-            total_bank_fields = sum(len(tab.get("fields", [])) for tab in bank_specific_tabs)
-            logger.info(f"✅ Successfully aggregated {len(common_fields)} common + {total_bank_fields} bank-specific fields for {bank_code}/{template_id}")
+            # Handle tabs without sections (normal field structure)
+            else:
+                # Get fields from the specific document that matches this tab's documentSource
+                document_source = tab_config.get("documentSource")
+                if document_source:
+                    # Find the document with matching templateId
+                    for document in doc.get("documents", []):
+                        if document.get("templateId") == document_source:
+                            tab["fields"] = process_template_fields(document.get("fields", []))
+                            break
+                else:
+                    # Fallback: get all fields if no documentSource specified
+                    all_doc_fields = []
+                    for document in doc.get("documents", []):
+                        doc_fields = process_template_fields(document.get("fields", []))
+                        all_doc_fields.extend(doc_fields)
+                    tab["fields"] = all_doc_fields
             
-            response = JSONResponse(
-                content=json.loads(json.dumps(response_data, default=json_serializer))
+            bank_specific_tabs.append(tab)
+    
+    logger.info(f"🎯 Created {len(bank_specific_tabs)} bank-specific tabs")
+    
+    # Step 4.5: Process fields to enhance calculation metadata
+    # Common fields are already transformed, no need for additional processing
+    processed_common_fields = common_fields
+    processed_bank_tabs = []
+    for tab in bank_specific_tabs:
+        processed_tab = dict(tab)
+        processed_tab["fields"] = process_template_fields(tab.get("fields", []))
+        
+        # Also process section fields if they exist
+        if tab.get("sections"):
+            processed_sections = []
+            for section in tab["sections"]:
+                processed_section = dict(section)
+                processed_section["fields"] = process_template_fields(section.get("fields", []))
+                processed_sections.append(processed_section)
+            processed_tab["sections"] = processed_sections
+        
+        processed_bank_tabs.append(processed_tab)
+    
+    logger.info(f"✅ Processed calculation metadata for all fields")
+    
+    # Step 5: Build comprehensive response (matching expected frontend format)
+    response_data = {
+        "templateInfo": {
+            "templateId": target_template.get("templateId", ""),
+            "templateName": target_template.get("templateName", ""),
+            "templateCode": target_template.get("templateCode", ""),
+            "templateType": target_template.get("templateType", ""),
+            "propertyType": target_template.get("propertyType", ""),
+            "description": target_template.get("description", ""),
+            "version": target_template.get("version", "1.0"),
+            "bankCode": bank_doc.get("bankCode", ""),
+            "bankName": bank_doc.get("bankName", "")
+        },
+        "commonFields": processed_common_fields,
+        "bankSpecificTabs": processed_bank_tabs,
+        "aggregatedAt": datetime.now(timezone.utc).isoformat(),
+        "metadata": {
+            "architecture": "multi_collection",
+            "commonFieldsSource": "common_form_fields",
+            "bankSpecificSource": collection_ref,
+            "totalCommonFields": len(common_fields),
+            "totalBankTabs": len(bank_specific_tabs),
+            "source": "multi_collection_aggregation"
+        }
+    }
+    
+    total_bank_fields = sum(len(tab.get("fields", [])) for tab in bank_specific_tabs)
+    logger.info(f"✅ Successfully aggregated {len(common_fields)} common + {total_bank_fields} bank-specific fields for {bank_code}/{template_id}")
+    
+    return response_data
+
+@app.get("/api/templates/{bank_code}/{template_id}/aggregated-fields")
+async def get_aggregated_template_fields(bank_code: str, template_id: str, request: Request) -> Response:
+    """Get template fields using multi-collection aggregation: common_form_fields + bank-specific template collection"""
+    try:
+        logger.info(f"🔄 Multi-Collection Aggregation API call for template: {bank_code}/{template_id}")
+        
+        # Serve the compiled payload (or a 304) from the per-worker cache when available
+        prepared = aggregated_template_cache.get_prepared(bank_code, template_id)
+        if prepared is not None:
+            response = conditional_json_response(request, prepared)
+            return response
+        
+        # Ensure environment variable is set before importing database modules
+        if not os.getenv('MONGODB_URI'):
+            raise HTTPException(status_code=500, detail="MongoDB connection not configured")
+        
+        logger.info(f"🔄 Compiling aggregated template fields (cache miss): {bank_code}/{template_id}")
+        
+        db_manager = await connect_db_manager()
+        
+        try:
+            response_data = await compile_aggregated_template_fields(db_manager, bank_code, template_id)
+            prepared = aggregated_template_cache.set(
+                bank_code, template_id, response_data["templateInfo"]["version"], response_data
             )
             
-            # Log the response
-            api_logger.log_response(response, request_data)
+            response = conditional_json_response(request, prepared)
             
             return response
             
@@ -1627,21 +1645,11 @@ async def get_aggregated_template_fields(bank_code: str, template_id: str, reque
             await db_manager.disconnect()
             
     except HTTPException as http_exc:
-        error_response = JSONResponse(
-            status_code=http_exc.status_code,
-            content={"error": http_exc.detail}
-        )
-        api_logger.log_response(error_response, request_data)
         raise http_exc
     except Exception as e:
         logger.error(f"❌ Error in multi-collection aggregation: {str(e)}")
         import traceback
         traceback.print_exc()
-        error_response = JSONResponse(
-            status_code=500,
-            content={"error": f"Failed to aggregate template fields: {str(e)}"}
-        )
-        api_logger.log_response(error_response, request_data)
         raise HTTPException(status_code=500, detail=f"Failed to aggregate template fields: {str(e)}")
 
 # ================================
@@ -1792,49 +1800,16 @@ async def get_template_version(bank_code: str, template_id: str) -> str:
     try:
         logger.info(f"📋 Fetching template version for {bank_code}/{template_id}")
         
-        from database.multi_db_manager import MultiDatabaseManager
-        
-        db_manager = MultiDatabaseManager()
-        await db_manager.connect()
+        db_manager = await connect_db_manager()
         
         try:
-            admin_db = db_manager.get_database("admin")
-            
-            # Find the comprehensive document
-            unified_doc = await admin_db.banks.find_one({"_id": "all_banks_comprehensive_v4"})
-            
-            if not unified_doc:
-                # Fallback to any document with banks data
-                any_doc = await admin_db.banks.find_one({})
-                if any_doc and "banks" in any_doc:
-                    unified_doc = any_doc
-            
-            if not unified_doc:
-                logger.warning(f"⚠️ Banks configuration not found, using default version")
-                return "1.0.0"
+            registry = await bank_template_registry.ensure_loaded(db_manager)
             
-            # Find the specific bank
-            all_banks = unified_doc.get("banks", [])
-            bank_doc = None
-            
-            for bank in all_banks:
-                if bank.get("bankCode", "").upper() == bank_code.upper():
-                    bank_doc = bank
-                    break
-            
-            if not bank_doc:
+            if not registry.get_bank(bank_code):
                 logger.warning(f"⚠️ Bank {bank_code} not found, using default version")
                 return "1.0.0"
             
-            # Find the specific template
-            templates = bank_doc.get("templates", [])
-            target_template = None
-            
-            for template in templates:
-                if (template.get("templateCode", "").upper() == template_id.upper() or 
-                    template.get("templateId", "").upper() == template_id.upper()):
-                    target_template = template
-                    break
+            target_template = registry.get_template(bank_code, template_id)
             
             if not target_template:
                 logger.warning(f"⚠️ Template {template_id} not found for bank {bank_code}, using default version")
@@ -1851,27 +1826,17 @@ async def get_template_version(bank_code: str, template_id: str) -> str:
         logger.error(f"❌ Error fetching template version: {e}")
         return "1.0.0"  # Default fallback
 
-async def transform_flat_to_template_structure(
-    input_data: Dict[str, Any], 
-    bank_code: str, 
-    template_id: str,
-    mapping_service: Any
-) -> Dict[str, Any]:
-    """
-    SIMPLE TRANSFORMATION: Save all data in restructured format with template version
-    New structure: { common_fields: {}, report_data: { data: {}, tables: {} }, template_version: "1.0" }
+def organize_flat_report_fields(input_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
     """
-    logger.info(f"🚀 NEW STRUCTURE TRANSFORMATION: {bank_code}/{template_id}")
-    logger.info(f"📋 Processing {len(input_data)} input fields")
-    
-    # Fetch template version first
-    template_version = await get_template_version(bank_code, template_id)
+    Route flat form fields into the common_fields / data / tables sections of report_data
     
-    result = {
+    Empty values and system metadata are skipped. Shared by full saves
+    (transform_flat_to_template_structure) and patch saves (build_report_patch).
+    """
+    result: Dict[str, Dict[str, Any]] = {
         "common_fields": {},
         "data": {},
-        "tables": {},
-        "template_version": template_version
+        "tables": {}
     }
     
     # Common fields that go to separate section (outside of report_data)
@@ -1997,7 +1962,12 @@ async def transform_flat_to_template_structure(
             
         field_count += 1
     
-    # Ensure all common fields have values (add defaults for missing ones)
+    logger.info(f"📋 Organized {field_count} fields ({table_count} tables)")
+    return result
+
+
+def apply_common_field_defaults(common_fields: Dict[str, Any]) -> None:
+    """Fill in defaults for common fields missing from a full save (in place)"""
     common_field_defaults = {
         "valuation_date": datetime.now().strftime("%Y-%m-%d"),
         "applicant_name": "N/A",
@@ -2007,11 +1977,95 @@ async def transform_flat_to_template_structure(
     }
     
     for field_id, default_value in common_field_defaults.items():
-        if field_id not in result["common_fields"]:
-            result["common_fields"][field_id] = default_value
+        if field_id not in common_fields:
+            common_fields[field_id] = default_value
             logger.info(f"📄 Added missing common field with default: {field_id} = {default_value}")
+
+def report_version_filter(report_id: str, base_version: int) -> Dict[str, Any]:
+    """Filter matching a report only while it is still at base_version (reports saved before versioning count as v1)"""
+    if base_version == 1:
+        return {"report_id": report_id, "version": {"$in": [1, None]}}
+    return {"report_id": report_id, "version": base_version}
+
+async def raise_report_write_conflict(org_db: Any, report_id: str, expected_version: int) -> None:
+    """Explain why a version-conditioned report write matched nothing: 404 if missing, else 409 with the current version"""
+    current = await org_db.reports.find_one({"report_id": report_id}, {"version": 1})
+    if not current:
+        raise HTTPException(status_code=404, detail=f"Report {report_id} not found")
+    
+    current_version = current.get("version", 1)
+    logger.warning(f"⚠️ Version conflict on report {report_id}: expected v{expected_version}, current v{current_version}")
+    raise HTTPException(
+        status_code=409,
+        detail={
+            "message": "Report was modified by another save; reload before saving again",
+            "current_version": current_version
+        }
+    )
+
+def build_report_patch(
+    changed_fields: List[str],
+    report_data: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Build $set / $unset documents that write only the changed fields of a report
+    
+    Changed fields are routed exactly like a full save and flattened to
+    report_data.<section>.<field_id> paths. Fields the user cleared (empty or
+    missing from report_data) are unset from every section.
+    
+    Returns:
+        (set_fields, unset_fields)
+    """
+    from utils.change_tracker import flatten_dict
+    
+    for field_id in changed_fields:
+        # Field ids become path segments - refuse anything that could address other paths
+        if not field_id or "." in field_id or field_id.startswith("$"):
+            raise HTTPException(status_code=400, detail=f"Invalid field id: {field_id!r}")
+    
+    changed_data = {field_id: report_data.get(field_id) for field_id in changed_fields}
+    organized = organize_flat_report_fields(changed_data)
     
-    logger.info(f"✅ New structure transformation complete: {field_count} fields, {table_count} tables, version: {template_version}")
+    # report_data -> section -> field_id; field values (tables, groups) are written whole
+    set_fields = flatten_dict({"report_data": organized}, max_depth=3)
+    
+    unset_fields: Dict[str, Any] = {}
+    for field_id, field_value in changed_data.items():
+        if field_value is None or field_value == "":
+            for section in organized:
+                unset_fields[f"report_data.{section}.{field_id}"] = ""
+    
+    return set_fields, unset_fields
+
+async def transform_flat_to_template_structure(
+    input_data: Dict[str, Any], 
+    bank_code: str, 
+    template_id: str,
+    mapping_service: Any
+) -> Dict[str, Any]:
+    """
+    SIMPLE TRANSFORMATION: Save all data in restructured format with template version
+    New structure: { common_fields: {}, report_data: { data: {}, tables: {} }, template_version: "1.0" }
+    """
+    logger.info(f"🚀 NEW STRUCTURE TRANSFORMATION: {bank_code}/{template_id}")
+    logger.info(f"📋 Processing {len(input_data)} input fields")
+    
+    # Fetch template version first
+    template_version = await get_template_version(bank_code, template_id)
+    
+    organized = organize_flat_report_fields(input_data)
+    result = {
+        "common_fields": organized["common_fields"],
+        "data": organized["data"],
+        "tables": organized["tables"],
+        "template_version": template_version
+    }
+    
+    # Ensure all common fields have values (add defaults for missing ones)
+    apply_common_field_defaults(result["common_fields"])
+    
+    logger.info(f"✅ New structure transformation complete: {len(result['data'])} fields, {len(result['tables'])} tables, version: {template_version}")
     return result
     return result
     try:
@@ -2297,10 +2351,8 @@ class CalculationRequest(BaseModel):
     formatting: Dict[str, Any] = {}
 
 @app.post("/api/calculate")
-async def calculate_field_value(calc_request: CalculationRequest, request: Request) -> JSONResponse:
+async def calculate_field_value(calc_request: CalculationRequest, request: Request) -> MongoJSONResponse:
     """Calculate field value based on formula and dependencies"""
-    request_data = await api_logger.log_request(request)
-    
     try:
         logger.info(f"🧮 Processing calculation for field: {calc_request.fieldId}")
         logger.debug(f"Formula: {calc_request.formula}")
@@ -2364,17 +2416,16 @@ async def calculate_field_value(calc_request: CalculationRequest, request: Reque
             "fieldId": calc_request.fieldId
         }
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content=response_data
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except Exception as e:
         logger.error(f"❌ Calculation error: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={
                 "success": False,
@@ -2383,14 +2434,13 @@ async def calculate_field_value(calc_request: CalculationRequest, request: Reque
                 "formattedResult": "0"
             }
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
         
     except Exception as e:
         logger.error(f"❌ Calculation error: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={
                 "success": False,
@@ -2399,12 +2449,11 @@ async def calculate_field_value(calc_request: CalculationRequest, request: Reque
                 "formattedResult": "0"
             }
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
 @app.post("/api/calculate/land-valuation")
-async def calculate_land_valuation(request: Request) -> JSONResponse:
+async def calculate_land_valuation(request: Request) -> MongoJSONResponse:
     """Calculate Estimated Value of Land based on plot size and market rate"""
     try:
         body = await request.json()
@@ -2439,7 +2488,7 @@ async def calculate_land_valuation(request: Request) -> JSONResponse:
         
         logger.info(f"✅ Land valuation calculated: {plot_size_num} × {market_rate_num} = {estimated_value}")
         
-        return JSONResponse(
+        return MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -2457,7 +2506,7 @@ async def calculate_land_valuation(request: Request) -> JSONResponse:
         
     except Exception as e:
         logger.error(f"❌ Land valuation calculation error: {str(e)}")
-        return JSONResponse(
+        return MongoJSONResponse(
             status_code=500,
             content={
                 "success": False,
@@ -2483,8 +2532,6 @@ def format_currency(amount: float) -> str:
 @app.post("/api/admin/organizations")
 async def create_organization(org_request: CreateOrganizationRequest, request: Request):
     """Create a new organization (System Admin only)"""
-    request_data = await api_logger.log_request(request)
-    
     logger.info(f"🏢 Creating new organization: {org_request.name}")
     
     try:
@@ -2615,7 +2662,7 @@ async def create_organization(org_request: CreateOrganizationRequest, request: R
             "isActive": True
         }
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=201,
             content={
                 "success": True,
@@ -2624,27 +2671,237 @@ async def create_organization(org_request: CreateOrganizationRequest, request: R
             }
         )
         
-        api_logger.log_response(response, request_data)
-        return response
-        
+        return response
+        
+    except Exception as e:
+        logger.error(f"❌ Error creating organization: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        
+        error_response = MongoJSONResponse(
+            status_code=500,
+            content={"success": False, "error": str(e)}
+        )
+        return error_response
+
+
+@app.post("/api/admin/maintenance/reconcile-indexes")
+async def reconcile_indexes(
+    request: Request,
+    dry_run: bool = False,
+    org_short_name: Optional[str] = None,
+    org_context: OrganizationContext = Depends(get_organization_context),
+    db_manager: MultiDatabaseManager = Depends(get_db_manager)
+):
+    """
+    Find and build missing report/activity log indexes in organization databases (System Admin only)
+    
+    Parameters:
+    - dry_run: Only report missing indexes without building them
+    - org_short_name: Limit reconciliation to one organization database
+    """
+    try:
+        if not org_context.is_system_admin:
+            raise HTTPException(status_code=403, detail="Only system administrators can reconcile indexes")
+        
+        from database.organization_models import reconcile_org_indexes
+        
+        summary = await reconcile_org_indexes(
+            db_manager,
+            org_database_names=[org_short_name] if org_short_name else None,
+            dry_run=dry_run,
+            logger=logger
+        )
+        
+        response = MongoJSONResponse(
+            status_code=200,
+            content={
+                "success": True,
+                "data": summary
+            }
+        )
+        
+        return response
+        
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        logger.error(f"❌ Error reconciling indexes: {str(e)}")
+        error_response = MongoJSONResponse(
+            status_code=500,
+            content={"success": False, "error": str(e)}
+        )
+        return error_response
+
+
+@app.post("/api/admin/maintenance/repair-report-counters")
+async def repair_report_counters_endpoint(
+    request: Request,
+    dry_run: bool = False,
+    org_short_name: Optional[str] = None,
+    org_context: OrganizationContext = Depends(get_organization_context),
+    db_manager: MultiDatabaseManager = Depends(get_db_manager)
+):
+    """
+    Recompute per-organization report counters from the reports collection and report drift (System Admin only)
+    
+    Parameters:
+    - dry_run: Only report drift without overwriting the counters
+    - org_short_name: Limit the repair to one organization database
+    """
+    try:
+        if not org_context.is_system_admin:
+            raise HTTPException(status_code=403, detail="Only system administrators can repair report counters")
+        
+        from services.report_counters import repair_report_counters
+        
+        summary = await repair_report_counters(
+            db_manager,
+            org_database_names=[org_short_name] if org_short_name else None,
+            dry_run=dry_run,
+            logger=logger
+        )
+        
+        if not dry_run:
+            for database_name in summary["databases"]:
+                invalidate_dashboard_stats(database_name)
+        
+        response = MongoJSONResponse(
+            status_code=200,
+            content={
+                "success": True,
+                "data": summary
+            }
+        )
+        
+        return response
+        
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        logger.error(f"❌ Error repairing report counters: {str(e)}")
+        error_response = MongoJSONResponse(
+            status_code=500,
+            content={"success": False, "error": str(e)}
+        )
+        return error_response
+
+
+@app.post("/api/admin/maintenance/archive-logs")
+async def archive_logs_endpoint(
+    request: Request,
+    dry_run: bool = False,
+    org_short_name: Optional[str] = None,
+    org_context: OrganizationContext = Depends(get_organization_context),
+    db_manager: MultiDatabaseManager = Depends(get_db_manager)
+):
+    """
+    Move activity/audit log entries past their hot retention into monthly archives (System Admin only)
+    
+    Parameters:
+    - dry_run: Only count entries that would be archived and archives that would be dropped
+    - org_short_name: Limit to one organization database (skips the config and admin logs)
+    """
+    try:
+        if not org_context.is_system_admin:
+            raise HTTPException(status_code=403, detail="Only system administrators can archive logs")
+        
+        from services.log_archive import run_log_retention
+        
+        summary = await run_log_retention(
+            db_manager,
+            org_database_names=[org_short_name] if org_short_name else None,
+            dry_run=dry_run,
+            logger=logger
+        )
+        
+        return MongoJSONResponse(
+            status_code=200,
+            content={
+                "success": True,
+                "data": summary
+            }
+        )
+        
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        logger.error(f"❌ Error archiving logs: {str(e)}")
+        return MongoJSONResponse(
+            status_code=500,
+            content={"success": False, "error": str(e)}
+        )
+
+
+@app.get("/api/admin/maintenance/slow-queries")
+async def get_slow_queries(
+    request: Request,
+    limit: int = 20,
+    explain: bool = False,
+    refresh: bool = False,
+    org_context: OrganizationContext = Depends(get_organization_context)
+):
+    """
+    Slowest MongoDB query shapes seen by this worker (System Admin only)
+    
+    Parameters:
+    - limit: Number of shapes to return (slowest first)
+    - explain: Capture queryPlanner explain() output for the returned shapes
+    - refresh: Re-run explain() for shapes that already have a captured plan
+    """
+    try:
+        if not org_context.is_system_admin:
+            raise HTTPException(status_code=403, detail="Only system administrators can view slow queries")
+        
+        from database.shared_client import get_shared_client
+        from utils.mongo_monitoring import explain_slow_queries, mongo_metrics_listener, slow_query_tracker
+        
+        limit = max(1, min(limit, 200))
+        client = get_shared_client()
+        if explain and client is not None:
+            entries = await explain_slow_queries(client, limit=limit, refresh=refresh)
+        else:
+            entries = slow_query_tracker.top(limit)
+        
+        queries = []
+        for entry in entries:
+            queries.append({
+                "command": entry["command"],
+                "database": entry["database"],
+                "collection": entry["collection"],
+                "shape": entry["shape"],
+                "count": entry["count"],
+                "max_ms": round(entry["max_ms"], 2),
+                "avg_ms": round(entry["total_ms"] / entry["count"], 2),
+                "last_documents": entry.get("last_documents"),
+                "last_seen": datetime.fromtimestamp(entry["last_seen"], timezone.utc).isoformat(),
+                "explain": entry["explain"]
+            })
+        
+        return MongoJSONResponse(
+            status_code=200,
+            content={
+                "success": True,
+                "data": {
+                    "threshold_ms": mongo_metrics_listener.slow_query_ms,
+                    "queries": queries
+                }
+            }
+        )
+        
+    except HTTPException as http_exc:
+        raise http_exc
     except Exception as e:
-        logger.error(f"❌ Error creating organization: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        
-        error_response = JSONResponse(
+        logger.error(f"❌ Error getting slow queries: {str(e)}")
+        return MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
-        return error_response
 
 
 @app.get("/api/admin/organizations")
 async def list_organizations(request: Request, include_system: bool = False):
     """List all organizations (System Admin only)"""
-    request_data = await api_logger.log_request(request)
-    
     logger.info(f"📋 Fetching all organizations (include_system: {include_system})")
     
     try:
@@ -2699,7 +2956,7 @@ async def list_organizations(request: Request, include_system: bool = False):
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -2708,26 +2965,22 @@ async def list_organizations(request: Request, include_system: bool = False):
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except Exception as e:
         logger.error(f"❌ Error fetching organizations: {str(e)}")
         import traceback
         traceback.print_exc()
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
 @app.get("/api/admin/organizations/{org_id}")
 async def get_organization(org_id: str, request: Request):
     """Get organization details (System Admin only)"""
-    request_data = await api_logger.log_request(request)
-    
     logger.info(f"🔍 Fetching organization: {org_id}")
     
     try:
@@ -2805,12 +3058,11 @@ async def get_organization(org_id: str, request: Request):
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={"success": True, "data": org_response}
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
@@ -2819,11 +3071,10 @@ async def get_organization(org_id: str, request: Request):
         logger.error(f"❌ Error fetching organization: {str(e)}")
         import traceback
         traceback.print_exc()
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -2843,8 +3094,6 @@ async def get_next_reference_number(org_short_name: str, request: Request):
             "preview": true
         }
     """
-    request_data = await api_logger.log_request(request)
-    
     logger.info(f"📋 Fetching next reference number preview for: {org_short_name}")
     
     try:
@@ -2864,18 +3113,17 @@ async def get_next_reference_number(org_short_name: str, request: Request):
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={"success": True, "data": preview_data}
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except ValueError as ve:
         # Organization not found or missing initials configuration
         logger.error(f"❌ Configuration error: {str(ve)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=400,
             content={
                 "success": False, 
@@ -2883,17 +3131,15 @@ async def get_next_reference_number(org_short_name: str, request: Request):
                 "message": "Please configure report reference initials in organization settings"
             }
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
     except Exception as e:
         logger.error(f"❌ Error getting reference number preview: {str(e)}")
         import traceback
         traceback.print_exc()
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -2908,8 +3154,6 @@ async def delete_organization(org_id: str, hard_delete: bool = False, request: R
     
     WARNING: Hard delete will permanently remove all data!
     """
-    request_data = await api_logger.log_request(request)
-    
     logger.info(f"🗑️ Deleting organization: {org_id} (hard_delete={hard_delete})")
     
     try:
@@ -3001,7 +3245,7 @@ async def delete_organization(org_id: str, hard_delete: bool = False, request: R
         
         delete_type = "permanently deleted (hard delete)" if hard_delete else "deactivated (soft delete)"
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -3016,7 +3260,6 @@ async def delete_organization(org_id: str, hard_delete: bool = False, request: R
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
@@ -3026,11 +3269,10 @@ async def delete_organization(org_id: str, hard_delete: bool = False, request: R
         import traceback
         traceback.print_exc()
         
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -3044,8 +3286,6 @@ async def update_organization(org_id: str, request: Request):
     
     Immutable fields: _id, org_short_name, created_at, created_by
     """
-    request_data = await api_logger.log_request(request)
-    
     logger.info(f"✏️ Updating organization: {org_id}")
     
     try:
@@ -3100,7 +3340,7 @@ async def update_organization(org_id: str, request: Request):
         if not changes:
             # No changes detected
             await db_manager.disconnect()
-            response = JSONResponse(
+            response = MongoJSONResponse(
                 status_code=200,
                 content={
                     "success": True,
@@ -3112,7 +3352,6 @@ async def update_organization(org_id: str, request: Request):
                     }
                 }
             )
-            api_logger.log_response(response, request_data)
             return response
         
         # Create change history record
@@ -3160,7 +3399,7 @@ async def update_organization(org_id: str, request: Request):
             "changes_applied": len(changes)
         }
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -3170,7 +3409,6 @@ async def update_organization(org_id: str, request: Request):
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
@@ -3179,11 +3417,10 @@ async def update_organization(org_id: str, request: Request):
         logger.error(f"❌ Error updating organization: {str(e)}")
         import traceback
         traceback.print_exc()
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -3193,8 +3430,6 @@ async def update_organization_status(org_id: str, request: Request):
     Toggle organization active/inactive status (System Admin only)
     This deactivates the organization without deleting data
     """
-    request_data = await api_logger.log_request(request)
-    
     logger.info(f"🔄 Toggling status for organization: {org_id}")
     
     try:
@@ -3245,7 +3480,7 @@ async def update_organization_status(org_id: str, request: Request):
         # Skip if status is already set to desired value
         if current_status == new_status:
             await db_manager.disconnect()
-            response = JSONResponse(
+            response = MongoJSONResponse(
                 status_code=200,
                 content={
                     "success": True,
@@ -3257,7 +3492,6 @@ async def update_organization_status(org_id: str, request: Request):
                     }
                 }
             )
-            api_logger.log_response(response, request_data)
             return response
         
         # Create change record for status change
@@ -3310,7 +3544,7 @@ async def update_organization_status(org_id: str, request: Request):
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -3325,7 +3559,6 @@ async def update_organization_status(org_id: str, request: Request):
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
@@ -3335,11 +3568,10 @@ async def update_organization_status(org_id: str, request: Request):
         import traceback
         traceback.print_exc()
         
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -3350,10 +3582,9 @@ async def update_organization_status(org_id: str, request: Request):
 @app.post("/api/admin/organizations/{org_id}/users")
 async def add_user_to_organization(org_id: str, user_request: AddUserToOrgRequest, request: Request):
     """Add a new user to an organization (System Admin only)"""
-    request_data = await api_logger.log_request(request)
-    
     logger.info(f"👤 Adding user {user_request.email} to organization {org_id}")
     
+    db_manager = None
     try:
         from database.multi_db_manager import MultiDatabaseManager
         from bson import ObjectId
@@ -3382,16 +3613,13 @@ async def add_user_to_organization(org_id: str, user_request: AddUserToOrgReques
             org = await orgs_collection.find_one({"metadata.original_organization_id": org_id})
         
         if not org:
-            await db_manager.disconnect()
             raise HTTPException(status_code=404, detail=f"Organization {org_id} not found")
         
         if not org.get("is_active", False):
-            await db_manager.disconnect()
             raise HTTPException(status_code=400, detail=f"Organization {org_id} is not active")
         
         org_short_name = org.get("org_short_name")
         if not org_short_name:
-            await db_manager.disconnect()
             raise HTTPException(status_code=500, detail="Organization missing org_short_name")
         
         # Get organization-specific database
@@ -3401,7 +3629,6 @@ async def add_user_to_organization(org_id: str, user_request: AddUserToOrgReques
         existing_user = await org_db.users.find_one({"email": user_request.email})
         
         if existing_user:
-            await db_manager.disconnect()
             raise HTTPException(status_code=400, detail=f"User with email {user_request.email} already exists in this organization")
         
         # Generate user ID
@@ -3409,7 +3636,10 @@ async def add_user_to_organization(org_id: str, user_request: AddUserToOrgReques
         user_id = f"user_{uuid.uuid4().hex[:12]}"
         
         # Hash password
-        hashed_password = pwd_context.hash(user_request.password)
+        try:
+            hashed_password = await password_hasher.hash(user_request.password)
+        except PasswordHasherBusy:
+            raise HTTPException(status_code=503, detail="Server busy, please retry shortly", headers={"Retry-After": "1"})
         
         # Create user document for organization database
         user_document = {
@@ -3474,8 +3704,6 @@ async def add_user_to_organization(org_id: str, user_request: AddUserToOrgReques
         }
         await org_db.activity_logs.insert_one(activity_log)
         
-        await db_manager.disconnect()
-        
         # Return user data (remove sensitive fields)
         user_response = {
             "_id": user_id,
@@ -3491,7 +3719,7 @@ async def add_user_to_organization(org_id: str, user_request: AddUserToOrgReques
             "current_version": 1
         }
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=201,
             content={
                 "success": True,
@@ -3500,7 +3728,6 @@ async def add_user_to_organization(org_id: str, user_request: AddUserToOrgReques
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
@@ -3510,19 +3737,19 @@ async def add_user_to_organization(org_id: str, user_request: AddUserToOrgReques
         import traceback
         traceback.print_exc()
         
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
+    finally:
+        if db_manager is not None:
+            await db_manager.disconnect()
 
 
 @app.get("/api/admin/organizations/{org_id}/users")
 async def list_organization_users(org_id: str, request: Request):
     """List all users in an organization"""
-    request_data = await api_logger.log_request(request)
-    
     logger.info(f"📋 Fetching users for organization: {org_id}")
     
     try:
@@ -3581,7 +3808,7 @@ async def list_organization_users(org_id: str, request: Request):
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -3590,7 +3817,6 @@ async def list_organization_users(org_id: str, request: Request):
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
@@ -3599,19 +3825,16 @@ async def list_organization_users(org_id: str, request: Request):
         logger.error(f"❌ Error fetching users: {str(e)}")
         import traceback
         traceback.print_exc()
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
 @app.put("/api/admin/organizations/{org_id}/users/{user_id}")
 async def update_organization_user(org_id: str, user_id: str, update_data: dict, request: Request):
     """Update user details in an organization"""
-    request_data = await api_logger.log_request(request)
-    
     logger.info(f"🔄 Updating user {user_id} in organization {org_id}")
     
     try:
@@ -3671,7 +3894,7 @@ async def update_organization_user(org_id: str, user_id: str, update_data: dict,
         if not changes:
             # No changes detected
             await db_manager.disconnect()
-            return JSONResponse(
+            return MongoJSONResponse(
                 status_code=200,
                 content={
                     "success": True,
@@ -3721,7 +3944,7 @@ async def update_organization_user(org_id: str, user_id: str, update_data: dict,
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -3734,7 +3957,6 @@ async def update_organization_user(org_id: str, user_id: str, update_data: dict,
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
@@ -3743,19 +3965,16 @@ async def update_organization_user(org_id: str, user_id: str, update_data: dict,
         logger.error(f"❌ Error updating user: {str(e)}")
         import traceback
         traceback.print_exc()
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
 @app.put("/api/admin/organizations/{org_id}/users/{user_id}/status")
 async def toggle_user_status(org_id: str, user_id: str, status_data: dict, request: Request):
     """Activate or deactivate a user"""
-    request_data = await api_logger.log_request(request)
-    
     is_active = status_data.get("is_active", True)
     action = "activate" if is_active else "deactivate"
     logger.info(f"🔄 {action.capitalize()}ing user {user_id} in organization {org_id}")
@@ -3799,7 +4018,7 @@ async def toggle_user_status(org_id: str, user_id: str, status_data: dict, reque
         # Check if status actually changed
         if old_status == is_active:
             await db_manager.disconnect()
-            return JSONResponse(
+            return MongoJSONResponse(
                 status_code=200,
                 content={
                     "success": True,
@@ -3850,7 +4069,7 @@ async def toggle_user_status(org_id: str, user_id: str, status_data: dict, reque
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -3863,7 +4082,6 @@ async def toggle_user_status(org_id: str, user_id: str, status_data: dict, reque
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
@@ -3872,19 +4090,16 @@ async def toggle_user_status(org_id: str, user_id: str, status_data: dict, reque
         logger.error(f"❌ Error {action}ing user: {str(e)}")
         import traceback
         traceback.print_exc()
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
 @app.delete("/api/admin/organizations/{org_id}/users/{user_id}")
 async def delete_organization_user(org_id: str, user_id: str, request: Request):
     """Delete a user from an organization (hard delete)"""
-    request_data = await api_logger.log_request(request)
-    
     logger.info(f"🗑️ Deleting user {user_id} from organization {org_id}")
     
     try:
@@ -3960,7 +4175,7 @@ async def delete_organization_user(org_id: str, user_id: str, request: Request):
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -3972,7 +4187,6 @@ async def delete_organization_user(org_id: str, user_id: str, request: Request):
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
@@ -3981,19 +4195,16 @@ async def delete_organization_user(org_id: str, user_id: str, request: Request):
         logger.error(f"❌ Error deleting user: {str(e)}")
         import traceback
         traceback.print_exc()
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
 @app.put("/api/admin/users/{user_id}/role")
 async def update_user_role(user_id: str, role_request: UpdateUserRoleRequest, request: Request):
     """Update user role (System Admin only)"""
-    request_data = await api_logger.log_request(request)
-    
     logger.info(f"🔄 Updating role for user {user_id} to {role_request.role}")
     
     try:
@@ -4052,7 +4263,7 @@ async def update_user_role(user_id: str, role_request: UpdateUserRoleRequest, re
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -4060,18 +4271,16 @@ async def update_user_role(user_id: str, role_request: UpdateUserRoleRequest, re
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
         logger.error(f"❌ Error updating user role: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -4088,53 +4297,18 @@ class ReportCreateRequest(BaseModel):
 class ReportUpdateRequest(BaseModel):
     report_data: Dict[str, Any]
     status: Optional[str] = None
+    # Patch mode: only these field ids from report_data are written, against base_version
+    changed_fields: Optional[List[str]] = None
+    base_version: Optional[int] = None
 
 @app.post("/api/reports")
 async def create_report(
     report_request: ReportCreateRequest, 
     request: Request,
-    org_context: OrganizationContext = Depends(get_organization_context)
+    org_context: OrganizationContext = Depends(get_organization_context),
+    db_manager: MultiDatabaseManager = Depends(get_db_manager)
 ):
     """Create a new report (Manager and Employee can create)"""
-    request_data = await api_logger.log_request(request)
-    
-    def get_report_display_data(report: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract display data from report handling both old and new structures"""
-        property_address = "N/A"
-        applicant_name = "N/A"
-        
-        report_data = report.get("report_data", {})
-        
-        if isinstance(report_data, dict):
-            # NEW FORMAT: Check report_data.common_fields.applicant_name (direct)
-            if "common_fields" in report_data and isinstance(report_data["common_fields"], dict):
-                applicant_name = report_data["common_fields"].get("applicant_name", "N/A")
-            
-            # NEW FORMAT: Check report_data.data.postal_address (direct)
-            if "data" in report_data and isinstance(report_data["data"], dict):
-                data_section = report_data["data"]
-                property_address = data_section.get("postal_address") or data_section.get("property_address", "N/A")
-            
-            # OLD FORMAT FALLBACK: report_data.report_data.data (nested)
-            elif "report_data" in report_data and isinstance(report_data["report_data"], dict):
-                nested_report_data = report_data["report_data"]
-                if "data" in nested_report_data and isinstance(nested_report_data["data"], dict):
-                    data_section = nested_report_data["data"]
-                    property_address = data_section.get("postal_address") or data_section.get("property_address", "N/A")
-            
-            # OLD FORMAT: Direct fields in report_data
-            elif isinstance(report_data, dict):
-                property_address = report_data.get("postal_address") or report_data.get("property_address", "N/A")
-            
-            # OLD FORMAT FALLBACK: _common_fields_ inside report_data
-            if applicant_name == "N/A" and "_common_fields_" in report_data and isinstance(report_data["_common_fields_"], dict):
-                applicant_name = report_data["_common_fields_"].get("applicant_name", "N/A")
-        
-        if property_address == "N/A":
-            property_address = report.get("property_address", "N/A")
-        
-        return {"property_address": property_address, "applicant_name": applicant_name}
-    
     logger.info(f"🚀🚀 CREATE REPORT ENTRY POINT - Function called successfully!")
     logger.info(f"🔍 CREATE REPORT CALLED: {report_request.bank_code}/{report_request.template_id}")
     
@@ -4169,17 +4343,13 @@ async def create_report(
                 detail=f"Access denied to organization: {url_org_short_name}"
             )
         
-        from database.multi_db_manager import MultiDatabaseManager
         from services.reference_number_service import ReferenceNumberService
         from services.template_field_mapping import TemplateFieldMappingService
         import uuid
         
-        db_manager = MultiDatabaseManager()
-        await db_manager.connect()
-        
-        # Initialize services
+        # Initialize services on the request's shared-client manager
         ref_service = ReferenceNumberService(db_manager)
-        mapping_service = TemplateFieldMappingService()
+        mapping_service = TemplateFieldMappingService(db_manager)
         await mapping_service.connect()
         
         try:
@@ -4251,7 +4421,7 @@ async def create_report(
         
         # Extract property address from report data for logging/reference
         temp_report = {"report_data": organized_data}
-        display_data = get_report_display_data(temp_report) 
+        display_data = extract_display_data(temp_report) 
         
         # Create report document with organized data
         report = {
@@ -4271,8 +4441,14 @@ async def create_report(
             "version": 1
         }
         
+        # Denormalized list data so GET /api/reports never loads report_data
+        report["summary"] = build_report_summary(report)
+        
         # Insert report
         result = await org_db.reports.insert_one(report)
+        await record_report_created(org_db, report)
+        count_cache.invalidate(org_db.name)
+        invalidate_dashboard_stats(org_db.name)
         
         logger.info(f"✅ Report created with organized structure: {report_id} by {org_context.email}")
         
@@ -4296,11 +4472,12 @@ async def create_report(
             ip_address=get_client_ip(request)
         )
         
+        report.pop("summary", None)
         report["_id"] = str(result.inserted_id)
         report["created_at"] = report["created_at"].isoformat()
         report["updated_at"] = report["updated_at"].isoformat()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=201,
             content={
                 "success": True,
@@ -4309,7 +4486,6 @@ async def create_report(
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
@@ -4318,11 +4494,10 @@ async def create_report(
         logger.error(f"❌ Error creating report: {str(e)}")
         import traceback
         traceback.print_exc()
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
     finally:
         await mapping_service.disconnect()
@@ -4333,103 +4508,214 @@ async def update_report(
     report_id: str, 
     update_request: ReportUpdateRequest, 
     request: Request,
-    org_context: OrganizationContext = Depends(get_organization_context)
+    org_context: OrganizationContext = Depends(get_organization_context),
+    db_manager: MultiDatabaseManager = Depends(get_db_manager)
 ):
     """Update a report (Manager and Employee can update)"""
-    request_data = await api_logger.log_request(request)
-    
     try:
         # Check permission
         if not org_context.has_permission("reports", "update"):
             raise HTTPException(status_code=403, detail="Insufficient permissions to update reports")
         
-        from database.multi_db_manager import MultiDatabaseManager
-        from services.template_field_mapping import TemplateFieldMappingService
-        
-        db_manager = MultiDatabaseManager()
-        await db_manager.connect()
-        
-        mapping_service = TemplateFieldMappingService()
-        await mapping_service.connect()
-        
-        try:
-            # Use org_short_name for database lookup
+        # Patch mode (autosave): write only the changed fields in a single round trip
+        if update_request.changed_fields is not None:
+            from pymongo import ReturnDocument
+            from utils.change_tracker import unflatten_dict
+            
+            if update_request.base_version is None:
+                raise HTTPException(status_code=400, detail="base_version is required when changed_fields is sent")
+            
             org_db = db_manager.get_org_database(org_context.org_short_name)
             
-            # Find existing report (filter by org for security)
-            report = await org_db.reports.find_one({
-                "report_id": report_id
+            set_fields, unset_fields = build_report_patch(update_request.changed_fields, update_request.report_data)
+            new_version = update_request.base_version + 1
+            updated_at = datetime.now(timezone.utc)
+            set_fields.update({
+                "updated_at": updated_at,
+                "updated_by": org_context.user_id,
+                "updated_by_email": org_context.email,
+                "version": new_version
             })
             
-            if not report:
-                raise HTTPException(status_code=404, detail=f"Report {report_id} not found")
+            # Keep the list summary in sync with the fields this patch touches
+            patched_sections = unflatten_dict(set_fields).get("report_data", {})
+            cleared_fields = {path.rsplit(".", 1)[1] for path in unset_fields}
+            set_fields.update(build_summary_update(
+                patched_sections, updated_at, update_request.status, cleared_fields, partial=True
+            ))
             
-            bank_code = report.get("bank_code", "")
-            template_id = report.get("template_id", "")
+            # Only allow status update if explicitly provided
+            if update_request.status:
+                set_fields["status"] = update_request.status
             
-            # Transform flat data structure to template-organized structure
-            logger.info(f"🔄 Transforming flat update data to template structure: {bank_code}/{template_id}")
+            update_doc: Dict[str, Any] = {"$set": set_fields}
+            if unset_fields:
+                update_doc["$unset"] = unset_fields
             
-            # Transform flat data to organized structure using template mapping
-            flat_data = update_request.report_data
-            organized_report_data = await transform_flat_to_template_structure(
-                flat_data, 
-                bank_code, 
-                template_id,
-                mapping_service
+            # Read the pre-update status in the same operation, so a status transition
+            # is counted against the bucket the report actually left
+            previous_report = await org_db.reports.find_one_and_update(
+                report_version_filter(report_id, update_request.base_version),
+                update_doc,
+                projection={"_id": 0, "status": 1},
+                return_document=ReturnDocument.BEFORE
+            )
+            
+            if previous_report is None:
+                await raise_report_write_conflict(org_db, report_id, update_request.base_version)
+            
+            previous_status = previous_report.get("status")
+            new_status = update_request.status or previous_status
+            
+            if update_request.status:
+                await record_status_change(org_db, previous_status, new_status)
+                count_cache.invalidate(org_db.name)
+                invalidate_dashboard_stats(org_db.name)
+            
+            logger.info(f"✅ Report patched: {report_id} v{new_version} ({len(set_fields)} set, {len(unset_fields)} unset) by {org_context.email}")
+            
+            await log_activity(
+                organization_id=org_context.org_short_name,
+                user_id=org_context.user_id,
+                user_email=org_context.email,
+                action="report_updated",
+                resource_type="report",
+                resource_id=report_id,
+                details={
+                    "new_status": new_status,
+                    "version": new_version,
+                    "changed_fields": len(update_request.changed_fields),
+                    "patch": True
+                },
+                ip_address=get_client_ip(request)
+            )
+            
+            response = MongoJSONResponse(
+                status_code=200,
+                content={
+                    "success": True,
+                    "message": "Report updated successfully",
+                    "data": {
+                        "report_id": report_id,
+                        "status": new_status or "draft",
+                        "version": new_version,
+                        "updated_at": updated_at.isoformat()
+                    }
+                }
             )
             
-            # Validate that we received nested structure matching template format
-            if isinstance(organized_report_data, dict) and bank_code and template_id:
-                logger.info(f"✅ Received nested data structure for report: {report_id}")
-                logger.info(f"📋 Update data contains {len(organized_report_data)} top-level sections/tabs")
+            return response
+        
+        from pymongo import ReturnDocument
+        from services.template_field_mapping import TemplateFieldMappingService
+        
+        mapping_service = TemplateFieldMappingService(db_manager)
+        await mapping_service.connect()
+        
+        try:
+            # Use org_short_name for database lookup
+            org_db = db_manager.get_org_database(org_context.org_short_name)
+            flat_data = update_request.report_data
+            
+            report = None
+            if update_request.base_version is None:
+                # Legacy clients: read the report to learn its version and template
+                report = await org_db.reports.find_one(
+                    {"report_id": report_id},
+                    {"bank_code": 1, "template_id": 1, "status": 1, "version": 1}
+                )
                 
-                # Validate the nested structure matches template expectations
-                try:
-                    is_valid, validation_errors = await mapping_service.validate_report_structure(
-                        organized_report_data, bank_code, template_id
-                    )
-                    
-                    if not is_valid:
-                        logger.warning(f"⚠️ Report structure validation warnings for report: {report_id}: {validation_errors}")
-                        # Continue with update but log warnings
-                    else:
-                        logger.info(f"✅ Report structure validation passed for report: {report_id}")
-                        
-                except Exception as validation_error:
-                    logger.warning(f"⚠️ Could not validate report structure: {validation_error}")
-                    # Continue with update
-                    
+                if not report:
+                    raise HTTPException(status_code=404, detail=f"Report {report_id} not found")
+                
+                expected_version = report.get("version", 1)
+                bank_code = report.get("bank_code", "")
+                template_id = report.get("template_id", "")
+                
+                # Transform flat data to organized structure using template mapping
+                logger.info(f"🔄 Transforming flat update data to template structure: {bank_code}/{template_id}")
+                organized_report_data = await transform_flat_to_template_structure(
+                    flat_data, 
+                    bank_code, 
+                    template_id,
+                    mapping_service
+                )
+                report_data_update = {"report_data": organized_report_data}
             else:
-                logger.warning(f"⚠️ Missing bank_code/template_id or data not in expected nested format for report: {report_id}")
-                # Continue with update using data as-is
+                # Clients that send base_version skip the pre-read; the stored template_version is kept
+                expected_version = update_request.base_version
+                organized_sections = organize_flat_report_fields(flat_data)
+                apply_common_field_defaults(organized_sections["common_fields"])
+                report_data_update = {
+                    f"report_data.{section}": section_data
+                    for section, section_data in organized_sections.items()
+                }
             
             # Prepare update data
+            updated_at = datetime.now(timezone.utc)
             update_data = {
-                "report_data": organized_report_data,  # NEW: Organized by tabs
-                "updated_at": datetime.now(timezone.utc),
+                **report_data_update,
+                "updated_at": updated_at,
                 "updated_by": org_context.user_id,
                 "updated_by_email": org_context.email,
-                "version": report.get("version", 1) + 1
+                "version": expected_version + 1
             }
             
             # Only allow status update if explicitly provided
             if update_request.status:
                 update_data["status"] = update_request.status
             
-            # Update report
-            result = await org_db.reports.update_one(
-                {"report_id": report_id},
-                {"$set": update_data}
+            # Keep the list summary in sync with the new report_data
+            written_sections = organized_report_data if report is not None else organized_sections
+            update_data.update(build_summary_update(written_sections, updated_at, update_request.status))
+            
+            # Update report only if nobody saved since expected_version, returning the new document
+            update_filter = report_version_filter(report_id, expected_version)
+            
+            # Status transitions move the report between counter buckets; pin the status we
+            # read so a concurrent submit/delete turns this write into a conflict
+            previous_status = report.get("status") if report else None
+            if update_request.status:
+                if report is None:
+                    previous = await org_db.reports.find_one({"report_id": report_id}, {"status": 1})
+                    previous_status = (previous or {}).get("status")
+                update_filter["status"] = previous_status
+            
+            updated_report = await org_db.reports.find_one_and_update(
+                update_filter,
+                {"$set": update_data},
+                return_document=ReturnDocument.AFTER
             )
             
-            if result.modified_count == 0:
-                raise HTTPException(status_code=400, detail="Failed to update report")
+            if updated_report is None:
+                await raise_report_write_conflict(org_db, report_id, expected_version)
+            
+            if update_request.status:
+                await record_status_change(org_db, previous_status, updated_report.get("status"))
+                count_cache.invalidate(org_db.name)
+                invalidate_dashboard_stats(org_db.name)
             
             logger.info(f"✅ Report updated with organized structure: {report_id} by {org_context.email}")
             
-            # Get the updated report to return to frontend
-            updated_report = await org_db.reports.find_one({"report_id": report_id})
+            bank_code = updated_report.get("bank_code", "")
+            template_id = updated_report.get("template_id", "")
+            
+            # Validate that the stored structure matches template expectations (warnings only)
+            if bank_code and template_id:
+                try:
+                    is_valid, validation_errors = await mapping_service.validate_report_structure(
+                        updated_report.get("report_data", {}), bank_code, template_id
+                    )
+                    
+                    if not is_valid:
+                        logger.warning(f"⚠️ Report structure validation warnings for report: {report_id}: {validation_errors}")
+                    else:
+                        logger.info(f"✅ Report structure validation passed for report: {report_id}")
+                        
+                except Exception as validation_error:
+                    logger.warning(f"⚠️ Could not validate report structure: {validation_error}")
+            else:
+                logger.warning(f"⚠️ Missing bank_code/template_id for report: {report_id}")
             
             # Format the updated report for response (similar to get_report_by_id)
             formatted_report = {
@@ -4462,15 +4748,15 @@ async def update_report(
                 resource_type="report",
                 resource_id=report_id,
                 details={
-                    "previous_status": report.get("status"),
-                    "new_status": update_request.status or report.get("status"),
+                    "previous_status": previous_status,
+                    "new_status": updated_report.get("status"),
                     "version": update_data["version"],
                     "data_organized": bool(bank_code and template_id)
                 },
                 ip_address=get_client_ip(request)
             )
             
-            response = JSONResponse(
+            response = MongoJSONResponse(
                 status_code=200,
                 content={
                     "success": True,
@@ -4479,7 +4765,6 @@ async def update_report(
                 }
             )
             
-            api_logger.log_response(response, request_data)
             return response
         
         finally:
@@ -4489,11 +4774,10 @@ async def update_report(
         raise http_exc
     except Exception as e:
         logger.error(f"❌ Error updating report: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -4501,11 +4785,10 @@ async def update_report(
 async def submit_report(
     report_id: str, 
     request: Request,
-    org_context: OrganizationContext = Depends(get_organization_context)
+    org_context: OrganizationContext = Depends(get_organization_context),
+    db_manager: MultiDatabaseManager = Depends(get_db_manager)
 ):
     """Submit a report for review (Manager ONLY - Employees cannot submit)"""
-    request_data = await api_logger.log_request(request)
-    
     try:
         # Check permission - ONLY Manager can submit
         if not org_context.has_permission("reports", "submit"):
@@ -4514,11 +4797,6 @@ async def submit_report(
                 detail="Insufficient permissions. Only Managers can submit reports."
             )
         
-        from database.multi_db_manager import MultiDatabaseManager
-        
-        db_manager = MultiDatabaseManager()
-        await db_manager.connect()
-        
         # Use org_short_name for database lookup
         org_db = db_manager.get_org_database(org_context.org_short_name)
         
@@ -4535,22 +4813,34 @@ async def submit_report(
             raise HTTPException(status_code=400, detail="Report already submitted")
         
         # Update report status to submitted
+        submitted_at = datetime.now(timezone.utc)
+        # Only transition from the status read above, so the counters move exactly once
         result = await org_db.reports.update_one(
-            {"report_id": report_id},
+            {"report_id": report_id, "status": report.get("status")},
             {
                 "$set": {
                     "status": "submitted",
-                    "submitted_at": datetime.now(timezone.utc),
+                    "submitted_at": submitted_at,
                     "submitted_by": org_context.user_id,
                     "submitted_by_email": org_context.email,
-                    "updated_at": datetime.now(timezone.utc)
+                    "updated_at": submitted_at,
+                    "summary.status": "submitted",
+                    "summary.submitted_at": submitted_at,
+                    "summary.updated_at": submitted_at
                 }
             }
         )
         
+        if result.matched_count == 0:
+            raise HTTPException(status_code=409, detail="Report status changed concurrently; reload and try again")
+        
         if result.modified_count == 0:
             raise HTTPException(status_code=400, detail="Failed to submit report")
         
+        await record_status_change(org_db, report.get("status"), "submitted")
+        count_cache.invalidate(org_db.name)
+        invalidate_dashboard_stats(org_db.name)
+        
         logger.info(f"✅ Report submitted: {report_id} by Manager {org_context.email}")
         
         # Log activity - IMPORTANT: This shows Manager submitted the report
@@ -4573,7 +4863,7 @@ async def submit_report(
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -4581,26 +4871,22 @@ async def submit_report(
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
         logger.error(f"❌ Error submitting report: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
 @app.get("/api/reports/{report_id}/activity")
-async def get_report_activity(report_id: str, request: Request):
-    """Get activity logs for a specific report"""
-    request_data = await api_logger.log_request(request)
-    
+async def get_report_activity(report_id: str, request: Request, include_archived: bool = False):
+    """Get activity logs for a specific report (include_archived also reads archived months)"""
     try:
         from utils.auth_middleware import get_organization_context
         from fastapi.security import HTTPAuthorizationCredentials
@@ -4638,12 +4924,16 @@ async def get_report_activity(report_id: str, request: Request):
             target_org_id = org_context.organization_id
         
         # Get all activity logs for this report
-        activities_cursor = org_db.activity_logs.find({
+        report_filter = {
             "resource_type": "report",
             "resource_id": report_id
-        }).sort("timestamp", -1)  # Most recent first
-        
-        activities = await activities_cursor.to_list(length=None)
+        }
+        if include_archived:
+            from services.log_archive import find_across_archives
+            activities, _ = await find_across_archives(org_db, "activity_logs", report_filter, "timestamp", count=False)
+        else:
+            activities_cursor = org_db.activity_logs.find(report_filter).sort("timestamp", -1)  # Most recent first
+            activities = await activities_cursor.to_list(length=None)
         
         # Convert datetime objects
         for activity in activities:
@@ -4657,7 +4947,7 @@ async def get_report_activity(report_id: str, request: Request):
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -4666,18 +4956,16 @@ async def get_report_activity(report_id: str, request: Request):
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
         logger.error(f"❌ Error fetching activity logs: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -4693,61 +4981,18 @@ async def get_reports(
     page: int = 1,
     limit: int = 20,
     organization_id: Optional[str] = None,  # NEW: Allow explicit org filtering
-    org_context: OrganizationContext = Depends(get_organization_context)
+    cursor: Optional[str] = None,
+    exact_count: bool = False,
+    org_context: OrganizationContext = Depends(get_organization_context),
+    db_manager: MultiDatabaseManager = Depends(get_db_manager)
 ):
-    """Get all reports with filtering options for the reports page"""
-    
-    def get_report_display_data(report: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Extract display data from report handling both old and new structures
-        Old: property_address at root, applicant_name in _common_fields_
-        New: postal_address in report_data.data, applicant_name in report_data.common_fields
-        """
-        # Initialize defaults
-        property_address = "N/A"
-        applicant_name = "N/A"
-        
-        # Get the report_data section
-        report_data = report.get("report_data", {})
-        
-        if isinstance(report_data, dict):
-            # NEW FORMAT: Check report_data.common_fields.applicant_name (direct)
-            if "common_fields" in report_data and isinstance(report_data["common_fields"], dict):
-                applicant_name = report_data["common_fields"].get("applicant_name", "N/A")
-            
-            # NEW FORMAT: Check report_data.data.postal_address (direct) 
-            if "data" in report_data and isinstance(report_data["data"], dict):
-                data_section = report_data["data"]
-                property_address = data_section.get("postal_address") or data_section.get("property_address", "N/A")
-            
-            # OLD FORMAT FALLBACK: report_data.report_data.data (nested)
-            elif "report_data" in report_data and isinstance(report_data["report_data"], dict):
-                nested_report_data = report_data["report_data"]
-                if "data" in nested_report_data and isinstance(nested_report_data["data"], dict):
-                    data_section = nested_report_data["data"]
-                    property_address = data_section.get("postal_address") or data_section.get("property_address", "N/A")
-            
-            # OLD FORMAT: Direct fields in report_data
-            elif isinstance(report_data, dict):
-                property_address = report_data.get("postal_address") or report_data.get("property_address", "N/A")
-            
-            # OLD FORMAT FALLBACK: _common_fields_ inside report_data
-            if applicant_name == "N/A" and "_common_fields_" in report_data and isinstance(report_data["_common_fields_"], dict):
-                applicant_name = report_data["_common_fields_"].get("applicant_name", "N/A")
-        
-        # LEGACY FALLBACK: Try root level
-        if property_address == "N/A":
-            property_address = report.get("property_address", "N/A")
-        
-        if applicant_name == "N/A" and "common_fields" in report and isinstance(report["common_fields"], dict):
-            applicant_name = report["common_fields"].get("applicant_name", "N/A")
-        
-        return {
-            "property_address": property_address,
-            "applicant_name": applicant_name
-        }
+    """
+    Get all reports with filtering options for the reports page
     
-    request_data = await api_logger.log_request(request)
+    Pagination: pass pagination.next_cursor back as `cursor` to fetch the next page
+    at constant cost; `page` (skip/limit) is still accepted for older clients.
+    The total is cached for a few seconds unless exact_count=true.
+    """
     
     try:
         # Check permission
@@ -4811,12 +5056,8 @@ async def get_reports(
                 detail=f"Access denied to organization: {organization_id}"
             )
         
-        from database.multi_db_manager import MultiDatabaseManager
         from datetime import datetime, timezone
         
-        db_manager = MultiDatabaseManager()
-        await db_manager.connect()
-        
         # Use target org for database lookup
         org_db = db_manager.get_org_database(target_org_short_name)
         logger.info(f"📊 Fetching reports from database: {target_org_short_name}")
@@ -4859,95 +5100,49 @@ async def get_reports(
             if date_filter:
                 filter_criteria["created_at"] = date_filter
         
-        # Calculate skip for pagination
-        skip = (page - 1) * limit
+        # Get total count for pagination (cached per worker unless exact_count is requested)
+        total_count, total_is_cached = await count_cache.count(org_db.reports, filter_criteria, exact=exact_count)
         
-        # Get total count for pagination
-        total_count = await org_db.reports.count_documents(filter_criteria)
+        # Get reports with pagination - only the list fields, never report_data.
+        # One extra row tells us whether there is a next page.
+        if cursor:
+            try:
+                page_filter = combine_filters(filter_criteria, keyset_filter("created_at", cursor))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+            reports_cursor = org_db.reports.find(page_filter, REPORT_LIST_PROJECTION)
+        else:
+            skip = (page - 1) * limit
+            reports_cursor = org_db.reports.find(filter_criteria, REPORT_LIST_PROJECTION).skip(skip)
         
-        # Get reports with pagination
-        reports_cursor = org_db.reports.find(filter_criteria).sort("created_at", -1).skip(skip).limit(limit)
-        reports = await reports_cursor.to_list(length=None)
+        reports_cursor = reports_cursor.sort(keyset_sort("created_at")).limit(limit + 1)
+        reports, next_cursor = split_page(await reports_cursor.to_list(length=None), limit, "created_at")
+        
+        # Reports written before summaries existed get one computed (and stored) now
+        await ensure_report_summaries(org_db, reports)
         
         # Format reports for frontend
-        formatted_reports = []
-        for report in reports:
-            # Extract bank branch information from report_data if available
-            report_data = report.get("report_data", {})
-            bank_branch = None
-            bank_branch_name = None
-            
-            # Try to extract bank branch from different possible locations
-            if isinstance(report_data, dict):
-                # PRIORITY 1: Check common_fields first (NEW FORMAT)
-                if "common_fields" in report_data and isinstance(report_data["common_fields"], dict):
-                    bank_branch = report_data["common_fields"].get("bank_branch")
-                
-                # PRIORITY 2: Check direct field (fallback)
-                if not bank_branch:
-                    bank_branch = report_data.get("bank_branch") or report_data.get("bankBranch")
-                
-                # PRIORITY 3: Search in nested structure (old organized format)
-                if not bank_branch:
-                    for tab_key, tab_data in report_data.items():
-                        if isinstance(tab_data, dict):
-                            for section_key, section_data in tab_data.items():
-                                if isinstance(section_data, dict):
-                                    found_branch = section_data.get("bank_branch") or section_data.get("bankBranch")
-                                    if found_branch:
-                                        bank_branch = found_branch
-                                        break
-                            if bank_branch:
-                                break
-                        elif tab_key in ["bank_branch", "bankBranch"]:
-                            bank_branch = tab_data
-                            break
-                
-                # Extract branch name if we have branch ID
-                if bank_branch and isinstance(bank_branch, str):
-                    # For now, use the branch ID as display name
-                    # TODO: Later we can resolve this to actual branch name via bank service
-                    bank_branch_name = bank_branch
-            
-            # Extract display data handling both old and new formats
-            display_data = get_report_display_data(report)
-            
-            formatted_report = {
-                "_id": str(report["_id"]),
-                "report_id": report.get("report_id"),
-                "reference_number": report.get("reference_number"),
-                "property_address": display_data["property_address"],
-                "applicant_name": display_data["applicant_name"],  # NEW: From common_fields
-                "bank_code": report.get("bank_code", ""),
-                "bank_branch": bank_branch,  # NEW: Bank branch ID
-                "bank_branch_name": bank_branch_name,  # NEW: Bank branch display name
-                "template_id": report.get("template_id", ""),
-                "status": report.get("status", "draft"),
-                "created_by_email": report.get("created_by_email", ""),
-                "created_at": report.get("created_at").isoformat() if report.get("created_at") else None,
-                "updated_at": report.get("updated_at").isoformat() if report.get("updated_at") else None,
-                "submitted_at": report.get("submitted_at").isoformat() if report.get("submitted_at") else None,
-                "version": report.get("version", 1)
-            }
-            formatted_reports.append(formatted_report)
+        formatted_reports = [format_report_list_item(report) for report in reports]
         
         await db_manager.disconnect()
         
         # Calculate pagination info
         total_pages = (total_count + limit - 1) // limit  # Ceiling division
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
                 "data": formatted_reports,
                 "pagination": {
                     "total": total_count,
+                    "total_is_cached": total_is_cached,
                     "page": page,
                     "limit": limit,
                     "total_pages": total_pages,
-                    "has_next": page < total_pages,
-                    "has_prev": page > 1
+                    "has_next": next_cursor is not None,
+                    "has_prev": page > 1 or cursor is not None,
+                    "next_cursor": next_cursor
                 },
                 "filters": {
                     "status": status,
@@ -4960,18 +5155,16 @@ async def get_reports(
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
         logger.error(f"❌ Error fetching reports: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -4980,11 +5173,10 @@ async def get_report_by_id(
     report_id: str,
     request: Request,
     organization_id: Optional[str] = None,  # NEW: Allow explicit org filtering
-    org_context: OrganizationContext = Depends(get_organization_context)
+    org_context: OrganizationContext = Depends(get_organization_context),
+    db_manager: MultiDatabaseManager = Depends(get_db_manager)
 ):
     """Get a specific report by ID for viewing/editing"""
-    request_data = await api_logger.log_request(request)
-    
     try:
         # Check permission
         if not org_context.has_permission("reports", "read"):
@@ -5047,13 +5239,9 @@ async def get_report_by_id(
                 detail=f"Access denied to organization: {organization_id}"
             )
         
-        from database.multi_db_manager import MultiDatabaseManager
         from services.template_field_mapping import TemplateFieldMappingService
         
-        db_manager = MultiDatabaseManager()
-        await db_manager.connect()
-        
-        mapping_service = TemplateFieldMappingService()
+        mapping_service = TemplateFieldMappingService(db_manager)
         await mapping_service.connect()
         
         try:
@@ -5104,7 +5292,7 @@ async def get_report_by_id(
                 "version": report.get("version", 1)
             }
             
-            response = JSONResponse(
+            response = MongoJSONResponse(
                 status_code=200,
                 content={
                     "success": True,
@@ -5112,7 +5300,6 @@ async def get_report_by_id(
                 }
             )
             
-            api_logger.log_response(response, request_data)
             return response
         
         finally:
@@ -5122,11 +5309,10 @@ async def get_report_by_id(
         raise http_exc
     except Exception as e:
         logger.error(f"❌ Error fetching report {report_id}: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -5134,21 +5320,15 @@ async def get_report_by_id(
 async def delete_report(
     report_id: str,
     request: Request,
-    org_context: OrganizationContext = Depends(get_organization_context)
+    org_context: OrganizationContext = Depends(get_organization_context),
+    db_manager: MultiDatabaseManager = Depends(get_db_manager)
 ):
     """Delete a report (Manager can delete any, Employee can only delete their own drafts)"""
-    request_data = await api_logger.log_request(request)
-    
     try:
         # Check permission
         if not org_context.has_permission("reports", "delete"):
             raise HTTPException(status_code=403, detail="Insufficient permissions to delete reports")
         
-        from database.multi_db_manager import MultiDatabaseManager
-        
-        db_manager = MultiDatabaseManager()
-        await db_manager.connect()
-        
         # Use org_short_name for database lookup
         org_db = db_manager.get_org_database(org_context.org_short_name)
         
@@ -5171,17 +5351,26 @@ async def delete_report(
             "is_deleted": True,
             "deleted_at": datetime.now(),
             "deleted_by": org_context.email,
-            "status": "deleted"
+            "status": "deleted",
+            "summary.status": "deleted"
         }
         
+        # Only transition from the status read above, so the counters move exactly once
         result = await org_db.reports.update_one(
-            {"report_id": report_id},
+            {"report_id": report_id, "status": report.get("status")},
             {"$set": update_data}
         )
         
+        if result.matched_count == 0:
+            raise HTTPException(status_code=409, detail="Report status changed concurrently; reload and try again")
+        
         if result.modified_count == 0:
             raise HTTPException(status_code=400, detail="Failed to delete report")
         
+        await record_status_change(org_db, report.get("status"), "deleted")
+        count_cache.invalidate(org_db.name)
+        invalidate_dashboard_stats(org_db.name)
+        
         logger.info(f"✅ Report soft deleted: {report_id} by {org_context.email}")
         
         # Log activity
@@ -5202,7 +5391,7 @@ async def delete_report(
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -5210,18 +5399,16 @@ async def delete_report(
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
         logger.error(f"❌ Error deleting report {report_id}: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -5234,8 +5421,6 @@ async def get_custom_template_banks(request: Request):
     """
     Get list of banks available for custom templates
     """
-    request_data = api_logger.log_request(request)
-    
     try:
         from database.multi_db_manager import MultiDatabaseManager
         
@@ -5267,7 +5452,7 @@ async def get_custom_template_banks(request: Request):
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -5275,16 +5460,14 @@ async def get_custom_template_banks(request: Request):
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except Exception as e:
         logger.error(f"❌ Error fetching custom template banks: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 @app.get("/api/custom-templates/fields")
@@ -5298,8 +5481,6 @@ async def get_template_fields(
     This is used when creating/editing custom templates.
     PUBLIC ENDPOINT - No authentication required (returns shared bank template structure)
     """
-    request_data = api_logger.log_request(request)
-    
     try:
         from database.multi_db_manager import MultiDatabaseManager
         
@@ -5350,21 +5531,19 @@ async def get_template_fields(
             }]
         }
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content=response_content
         )
         
-        api_logger.log_response(response, request_data)
         return response
 
     except Exception as e:
         logger.error(f"❌ Error fetching custom template banks: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -5390,8 +5569,6 @@ async def list_custom_templates(
     List all custom templates for the organization.
     Optionally filter by bankCode and/or propertyType.
     """
-    request_data = api_logger.log_request(request)
-    
     try:
         # Verify authentication
         from utils.auth_middleware import get_organization_context
@@ -5450,7 +5627,7 @@ async def list_custom_templates(
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -5460,18 +5637,16 @@ async def list_custom_templates(
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
         logger.error(f"❌ Error listing custom templates: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -5495,8 +5670,6 @@ async def get_custom_template(
     """
     Get a specific custom template with full fieldValues.
     """
-    request_data = api_logger.log_request(request)
-    
     try:
         # Verify authentication
         from utils.auth_middleware import get_organization_context
@@ -5533,7 +5706,7 @@ async def get_custom_template(
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -5541,18 +5714,16 @@ async def get_custom_template(
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
         logger.error(f"❌ Error fetching custom template: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -5578,8 +5749,6 @@ async def create_custom_template(
     Only Manager and Admin can create templates.
     Max 3 templates per bankCode+propertyType combination.
     """
-    request_data = api_logger.log_request(request)
-    
     try:
         # Verify authentication and role
         from utils.auth_middleware import get_organization_context
@@ -5673,7 +5842,7 @@ async def create_custom_template(
         
         logger.info(f"✅ Custom template created: {template_data.templateName}")
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=201,
             content={
                 "success": True,
@@ -5687,18 +5856,16 @@ async def create_custom_template(
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
         logger.error(f"❌ Error creating custom template: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -5713,8 +5880,6 @@ async def update_custom_template(
     Update an existing custom template.
     Only Manager and Admin can update templates.
     """
-    request_data = await api_logger.log_request(request)
-    
     try:
         # Verify authentication and role
         from utils.auth_middleware import get_organization_context
@@ -5801,7 +5966,7 @@ async def update_custom_template(
         
         logger.info(f"✅ Custom template updated: {template_id}")
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -5810,18 +5975,16 @@ async def update_custom_template(
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
         logger.error(f"❌ Error updating custom template: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -5846,8 +6009,6 @@ async def delete_custom_template(
     Delete a custom template (soft delete).
     Only Manager and Admin can delete templates.
     """
-    request_data = api_logger.log_request(request)
-    
     try:
         # Verify authentication and role
         from utils.auth_middleware import get_organization_context
@@ -5918,7 +6079,7 @@ async def delete_custom_template(
         
         logger.info(f"✅ Custom template deleted: {template_id}")
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -5926,18 +6087,16 @@ async def delete_custom_template(
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
         logger.error(f"❌ Error deleting custom template: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -5964,8 +6123,6 @@ async def clone_custom_template(
     Only Manager and Admin can clone templates.
     Validates max 3 templates limit.
     """
-    request_data = api_logger.log_request(request)
-    
     try:
         # Verify authentication and role
         from utils.auth_middleware import get_organization_context
@@ -6060,7 +6217,7 @@ async def clone_custom_template(
         
         logger.info(f"✅ Custom template cloned: {clone_data.newTemplateName}")
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=201,
             content={
                 "success": True,
@@ -6074,18 +6231,16 @@ async def clone_custom_template(
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
         logger.error(f"❌ Error cloning custom template: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -6118,8 +6273,6 @@ async def create_template_from_report(
     - Only non-empty field values are saved
     - Template name must be unique for the org + bank + property type combination
     """
-    request_data = await api_logger.log_request(request)
-    
     try:
         # Verify authentication and role
         from utils.auth_middleware import get_organization_context
@@ -6200,15 +6353,8 @@ async def create_template_from_report(
             )
         
         # Get bank information
-        banks_doc = await admin_db.banks.find_one({"_id": {"$regex": "all_banks_unified"}})
-        if not banks_doc:
-            raise HTTPException(status_code=404, detail="Banks configuration not found")
-        
-        bank_doc = None
-        for bank in banks_doc.get("banks", []):
-            if bank.get("bankCode", "").upper() == template_data.bankCode.upper():
-                bank_doc = bank
-                break
+        registry = await bank_template_registry.ensure_loaded(db_manager)
+        bank_doc = registry.get_bank(template_data.bankCode)
         
         if not bank_doc:
             raise HTTPException(status_code=404, detail=f"Bank {template_data.bankCode} not found")
@@ -6216,11 +6362,7 @@ async def create_template_from_report(
         bank_name = bank_doc.get("bankName", "")
         
         # Get template configuration to identify bank-specific fields
-        template_config = None
-        for tmpl in bank_doc.get("templates", []):
-            if tmpl.get("templateCode", "").upper() == template_data.templateCode.upper():
-                template_config = tmpl
-                break
+        template_config = registry.get_template(template_data.bankCode, template_data.templateCode)
         
         if not template_config:
             raise HTTPException(
@@ -6331,7 +6473,7 @@ async def create_template_from_report(
         
         logger.info(f"✅ Custom template created from report: {template_data.templateName} with {len(filtered_field_values)} fields")
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=201,
             content={
                 "success": True,
@@ -6346,7 +6488,6 @@ async def create_template_from_report(
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except HTTPException as http_exc:
@@ -6354,11 +6495,10 @@ async def create_template_from_report(
     except Exception as e:
         logger.error(f"❌ Error creating custom template from report: {str(e)}")
         logger.exception(e)  # Log full traceback
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -6366,10 +6506,23 @@ async def create_template_from_report(
 # DASHBOARD COMPONENT APIs
 # ================================
 
+# Fields the dashboard report lists read
+DASHBOARD_REPORT_PROJECTION = {
+    "report_id": 1,
+    "property_address": 1,
+    "bank_code": 1,
+    "template_id": 1,
+    "status": 1,
+    "created_by_email": 1,
+    "created_at": 1,
+    "updated_at": 1
+}
+
 @app.get("/api/dashboard/pending-reports")
 async def get_pending_reports(
     request: Request,
-    limit: int = 5
+    limit: int = 5,
+    cursor: Optional[str] = None
 ):
     """Get pending reports for dashboard component"""
     from fastapi.security import HTTPBearer
@@ -6384,8 +6537,6 @@ async def get_pending_reports(
     credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
     org_context = await get_organization_context(credentials)
     """Get pending reports for dashboard component"""
-    request_data = await api_logger.log_request(request)
-    
     try:
         from utils.auth_middleware import get_organization_context
         org_context = await get_organization_context(credentials)
@@ -6405,11 +6556,18 @@ async def get_pending_reports(
             target_org_id = org_context.organization_id
         
         # Get reports with status 'draft' or 'in_progress' (pending completion)
-        pending_reports_cursor = org_db.reports.find({
-            "status": {"$in": ["draft", "in_progress"]}
-        }).sort("updated_at", -1).limit(limit)
+        pending_filter = {"status": {"$in": ["draft", "in_progress"]}}
+        if cursor:
+            try:
+                pending_filter = combine_filters(pending_filter, keyset_filter("updated_at", cursor))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+        
+        pending_reports_cursor = org_db.reports.find(
+            pending_filter, DASHBOARD_REPORT_PROJECTION
+        ).sort(keyset_sort("updated_at")).limit(limit + 1)
         
-        pending_reports = await pending_reports_cursor.to_list(length=None)
+        pending_reports, next_cursor = split_page(await pending_reports_cursor.to_list(length=None), limit, "updated_at")
         
         # Format reports for dashboard display
         formatted_reports = []
@@ -6429,32 +6587,34 @@ async def get_pending_reports(
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
                 "data": formatted_reports,
-                "total": len(formatted_reports)
+                "total": len(formatted_reports),
+                "next_cursor": next_cursor
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
+    except HTTPException as http_exc:
+        raise http_exc
     except Exception as e:
         logger.error(f"❌ Error fetching pending reports: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
 @app.get("/api/dashboard/created-reports")
 async def get_created_reports(
     request: Request,
-    limit: int = 5
+    limit: int = 5,
+    cursor: Optional[str] = None
 ):
     """Get recently created reports for dashboard component"""
     from fastapi.security import HTTPBearer
@@ -6469,8 +6629,6 @@ async def get_created_reports(
     credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
     org_context = await get_organization_context(credentials)
     """Get recently created reports for dashboard component"""
-    request_data = await api_logger.log_request(request)
-    
     try:
         from utils.auth_middleware import get_organization_context
         org_context = await get_organization_context(credentials)
@@ -6490,9 +6648,18 @@ async def get_created_reports(
             target_org_id = org_context.organization_id
         
         # Get recently created reports (all statuses)
-        created_reports_cursor = org_db.reports.find({}).sort("created_at", -1).limit(limit)
+        created_filter = {}
+        if cursor:
+            try:
+                created_filter = combine_filters(created_filter, keyset_filter("created_at", cursor))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+        
+        created_reports_cursor = org_db.reports.find(
+            created_filter, DASHBOARD_REPORT_PROJECTION
+        ).sort(keyset_sort("created_at")).limit(limit + 1)
         
-        created_reports = await created_reports_cursor.to_list(length=None)
+        created_reports, next_cursor = split_page(await created_reports_cursor.to_list(length=None), limit, "created_at")
         
         # Format reports for dashboard display
         formatted_reports = []
@@ -6512,25 +6679,26 @@ async def get_created_reports(
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
                 "data": formatted_reports,
-                "total": len(formatted_reports)
+                "total": len(formatted_reports),
+                "next_cursor": next_cursor
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
+    except HTTPException as http_exc:
+        raise http_exc
     except Exception as e:
         logger.error(f"❌ Error fetching created reports: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -6552,8 +6720,6 @@ async def get_dashboard_banks(
     credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
     org_context = await get_organization_context(credentials)
     """Get banks summary for dashboard component"""
-    request_data = await api_logger.log_request(request)
-    
     try:
         from utils.auth_middleware import get_organization_context
         org_context = await get_organization_context(credentials)
@@ -6593,7 +6759,7 @@ async def get_dashboard_banks(
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -6602,16 +6768,14 @@ async def get_dashboard_banks(
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except Exception as e:
         logger.error(f"❌ Error fetching dashboard banks: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -6633,8 +6797,6 @@ async def get_recent_activities(
     credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
     org_context = await get_organization_context(credentials)
     """Get recent activities for dashboard component"""
-    request_data = await api_logger.log_request(request)
-    
     try:
         from utils.auth_middleware import get_organization_context
         org_context = await get_organization_context(credentials)
@@ -6675,7 +6837,7 @@ async def get_recent_activities(
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -6684,16 +6846,14 @@ async def get_recent_activities(
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except Exception as e:
         logger.error(f"❌ Error fetching recent activities: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -6714,8 +6874,6 @@ async def get_dashboard_templates(
     token = auth_header.replace("Bearer ", "")
     credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
     org_context = await get_organization_context(credentials)
-    request_data = await api_logger.log_request(request)
-    
     try:
         from database.multi_db_manager import MultiDatabaseManager
         
@@ -6761,7 +6919,7 @@ async def get_dashboard_templates(
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -6771,16 +6929,14 @@ async def get_dashboard_templates(
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except Exception as e:
         logger.error(f"❌ Error fetching dashboard templates: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -6790,8 +6946,6 @@ async def get_dashboard_stats(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """Get dashboard statistics summary"""
-    request_data = await api_logger.log_request(request)
-    
     try:
         from utils.auth_middleware import get_organization_context
         org_context = await get_organization_context(credentials)
@@ -6810,39 +6964,12 @@ async def get_dashboard_stats(
             org_db = db_manager.get_org_database(org_context.organization_id)
             target_org_id = org_context.organization_id
         
-        # Get various counts for dashboard stats
-        stats = {}
-        
-        # Reports statistics
-        stats["total_reports"] = await org_db.reports.count_documents({})
-        stats["pending_reports"] = await org_db.reports.count_documents({
-            "status": {"$in": ["draft", "in_progress"]}
-        })
-        stats["submitted_reports"] = await org_db.reports.count_documents({
-            "status": "submitted"
-        })
-        
-        # Custom templates count
-        stats["custom_templates"] = await org_db.custom_templates.count_documents({
-            "isActive": True
-        })
-        
-        # Recent activity count (last 7 days)
-        from datetime import timedelta
-        week_ago = datetime.now(timezone.utc) - timedelta(days=7)
-        stats["recent_activities"] = await org_db.activity_logs.count_documents({
-            "timestamp": {"$gte": week_ago}
-        })
-        
-        # User count (if users collection exists)
-        try:
-            stats["total_users"] = await org_db.users.count_documents({"is_active": True})
-        except:
-            stats["total_users"] = 0
+        # Get various counts for dashboard stats (concurrent, cached for a few seconds per org)
+        stats = await get_dashboard_stats_cached(org_db)
         
         await db_manager.disconnect()
         
-        response = JSONResponse(
+        response = MongoJSONResponse(
             status_code=200,
             content={
                 "success": True,
@@ -6850,16 +6977,14 @@ async def get_dashboard_stats(
             }
         )
         
-        api_logger.log_response(response, request_data)
         return response
         
     except Exception as e:
         logger.error(f"❌ Error fetching dashboard stats: {str(e)}")
-        error_response = JSONResponse(
+        error_response = MongoJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
-        api_logger.log_response(error_response, request_data)
         return error_response
 
 
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Log Archive Script
+
+Moves activity_logs (val_app_config and every organization database) and
+audit_logs (admin database) entries past their hot retention window into
+compressed monthly archive collections, and drops archive months past their
+retention. Same job the app runs when LOG_ARCHIVE_ENABLED=true.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Load environment variables
+from dotenv import load_dotenv
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(dotenv_path=env_path)
+
+from database.multi_db_manager import MultiDatabaseManager
+import logging
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def archive_logs(org_database_names=None, dry_run: bool = False):
+    """Apply log retention (default: config, admin and every organization database)"""
+
+    logger.info("=" * 80)
+    logger.info("Archiving Logs" + (" (dry run)" if dry_run else ""))
+    logger.info("=" * 80)
+
+    from services.log_archive import run_log_retention
+
+    db_manager = MultiDatabaseManager()
+
+    try:
+        await db_manager.connect()
+
+        summary = await run_log_retention(
+            db_manager,
+            org_database_names=org_database_names or None,
+            dry_run=dry_run,
+            logger=logger
+        )
+
+        for key, result in summary["collections"].items():
+            if "error" in result:
+                continue
+            logger.info(
+                f"📊 {key}: {result['eligible']} entries past retention, {result['archived']} archived, "
+                f"{len(result['dropped'])} archive months dropped"
+            )
+        return all("error" not in result for result in summary["collections"].values())
+
+    except Exception as e:
+        logger.error(f"❌ Log archiving failed: {e}")
+        return False
+
+    finally:
+        await db_manager.disconnect()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Archive activity and audit logs past their retention window")
+    parser.add_argument("org_databases", nargs="*", help="Organization databases to archive (default: all, plus config/admin logs)")
+    parser.add_argument("--dry-run", action="store_true", help="Only count entries that would be archived")
+    args = parser.parse_args()
+
+    success = asyncio.run(archive_logs(args.org_databases, dry_run=args.dry_run))
+    sys.exit(0 if success else 1)
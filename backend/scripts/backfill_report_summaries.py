@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Report Summary Backfill Script
+
+One-off backfill of the denormalized `summary` sub-document that GET /api/reports
+reads instead of report_data. Reports created or updated after the summary was
+introduced already have one; this fills in the rest (or rebuilds all with --rebuild).
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Load environment variables
+from dotenv import load_dotenv
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(dotenv_path=env_path)
+
+from database.multi_db_manager import MultiDatabaseManager
+import logging
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def backfill_summaries(org_database_names=None, dry_run: bool = False, rebuild: bool = False):
+    """Backfill report summaries for the given organization databases (default: all)"""
+
+    logger.info("=" * 80)
+    logger.info("Backfilling Report Summaries" + (" (dry run)" if dry_run else ""))
+    logger.info("=" * 80)
+
+    from database.organization_models import NON_ORG_DATABASES, list_org_database_names
+    from services.report_summary import backfill_report_summaries
+
+    db_manager = MultiDatabaseManager()
+
+    try:
+        await db_manager.connect()
+
+        if not org_database_names:
+            org_database_names = await list_org_database_names(db_manager)
+
+        success = True
+        for database_name in org_database_names:
+            if database_name in NON_ORG_DATABASES:
+                continue
+            try:
+                result = await backfill_report_summaries(
+                    db_manager.get_org_database(database_name),
+                    dry_run=dry_run,
+                    rebuild=rebuild
+                )
+                logger.info(f"📊 {database_name}: {result['matched']} reports need a summary, {result['updated']} updated")
+            except Exception as e:
+                logger.error(f"❌ {database_name}: {e}")
+                success = False
+
+        return success
+
+    except Exception as e:
+        logger.error(f"❌ Report summary backfill failed: {e}")
+        return False
+
+    finally:
+        await db_manager.disconnect()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backfill denormalized report list summaries")
+    parser.add_argument("org_databases", nargs="*", help="Organization databases to backfill (default: all)")
+    parser.add_argument("--dry-run", action="store_true", help="Only count reports missing a summary")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute summaries that already exist")
+    args = parser.parse_args()
+
+    success = asyncio.run(backfill_summaries(args.org_databases, dry_run=args.dry_run, rebuild=args.rebuild))
+    sys.exit(0 if success else 1)
@@ -8,6 +8,8 @@ This script ensures an organization's database has all required standard collect
 - users_settings
 - activity_logs
 - files_metadata
+
+and that the reports/activity_logs indexes exist (--reconcile-indexes checks every org).
 """
 
 import asyncio
@@ -125,16 +127,57 @@ async def list_org_databases():
         await db_manager.disconnect()
 
 
+async def reconcile_indexes(dry_run: bool = False):
+    """Find and build missing indexes across all organization databases"""
+    
+    logger.info("=" * 80)
+    logger.info("Reconciling Organization Database Indexes" + (" (dry run)" if dry_run else ""))
+    logger.info("=" * 80)
+    
+    from database.organization_models import reconcile_org_indexes
+    
+    db_manager = MultiDatabaseManager()
+    
+    try:
+        await db_manager.connect()
+        
+        summary = await reconcile_org_indexes(db_manager, dry_run=dry_run, logger=logger)
+        
+        for db_name, collections in summary["databases"].items():
+            logger.info(f"\n📊 {db_name}:")
+            if "error" in collections:
+                logger.info(f"  ❌ {collections['error']}")
+                continue
+            for collection_name, changes in collections.items():
+                for index_name in changes["created"]:
+                    logger.info(f"  {'~' if dry_run else '+'} {collection_name}.{index_name}")
+                for index_name, error in changes["failed"].items():
+                    logger.info(f"  ❌ {collection_name}.{index_name}: {error}")
+        
+        return summary["indexes_failed"] == 0
+        
+    except Exception as e:
+        logger.error(f"❌ Index reconciliation failed: {e}")
+        return False
+    
+    finally:
+        await db_manager.disconnect()
+
+
 if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description="Initialize organization database structure")
     parser.add_argument("org_id", nargs="?", help="Organization ID (e.g., demo_org_001)")
     parser.add_argument("--list", action="store_true", help="List all organization databases")
+    parser.add_argument("--reconcile-indexes", action="store_true", help="Build missing indexes in all organization databases")
+    parser.add_argument("--dry-run", action="store_true", help="With --reconcile-indexes, only report missing indexes")
     args = parser.parse_args()
     
     if args.list:
         success = asyncio.run(list_org_databases())
+    elif args.reconcile_indexes:
+        success = asyncio.run(reconcile_indexes(dry_run=args.dry_run))
     elif args.org_id:
         success = asyncio.run(initialize_org_database(args.org_id))
     else:
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Activity Rollups Rebuild Script
+
+Recomputes the hourly `activity_rollups_hourly` documents that the admin
+activity-stats dashboard reads, from val_app_config.activity_logs. Use it once to
+backfill history recorded before rollups existed, or to repair a date range.
+The current hour is left to the live incremental updates. The dashboard only
+switches to rollups after a full rebuild (no --start/--end) has completed.
+"""
+
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Load environment variables
+from dotenv import load_dotenv
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(dotenv_path=env_path)
+
+from database.multi_db_manager import MultiDatabaseManager
+import logging
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_rollups(start_date=None, end_date=None, dry_run: bool = False):
+    """Rebuild activity rollups for the given range (default: all history)"""
+
+    logger.info("=" * 80)
+    logger.info("Rebuilding Activity Rollups" + (" (dry run)" if dry_run else ""))
+    logger.info("=" * 80)
+
+    from services.activity_rollups import rebuild_activity_rollups
+
+    db_manager = MultiDatabaseManager()
+
+    try:
+        await db_manager.connect()
+        config_db = await db_manager.get_config_db()
+
+        result = await rebuild_activity_rollups(config_db, start_date=start_date, end_date=end_date, dry_run=dry_run)
+        logger.info(
+            f"📊 {result['activities']} activities -> {result['rollups']} hourly rollups "
+            f"({result['start'] or 'beginning'} to {result['end']})"
+        )
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Activity rollup rebuild failed: {e}")
+        return False
+
+    finally:
+        await db_manager.disconnect()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rebuild hourly activity rollups from activity_logs")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="First hour to rebuild (ISO format, UTC)")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="Last hour to rebuild (ISO format, UTC)")
+    parser.add_argument("--dry-run", action="store_true", help="Only count activities and rollups")
+    args = parser.parse_args()
+
+    success = asyncio.run(rebuild_rollups(args.start, args.end, dry_run=args.dry_run))
+    sys.exit(0 if success else 1)
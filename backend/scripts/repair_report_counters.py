@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Report Counters Repair Script
+
+Recomputes the per-organization `report_counters` document from the reports
+collection and reports any drift from the incrementally maintained values.
+Use --dry-run to only report drift without overwriting the counters.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Load environment variables
+from dotenv import load_dotenv
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(dotenv_path=env_path)
+
+from database.multi_db_manager import MultiDatabaseManager
+import logging
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def repair_counters(org_database_names=None, dry_run: bool = False):
+    """Repair report counters for the given organization databases (default: all)"""
+
+    logger.info("=" * 80)
+    logger.info("Repairing Report Counters" + (" (dry run)" if dry_run else ""))
+    logger.info("=" * 80)
+
+    from services.report_counters import repair_report_counters
+
+    db_manager = MultiDatabaseManager()
+
+    try:
+        await db_manager.connect()
+
+        summary = await repair_report_counters(
+            db_manager,
+            org_database_names=org_database_names or None,
+            dry_run=dry_run,
+            logger=logger
+        )
+
+        for database_name, result in summary["databases"].items():
+            if "error" in result:
+                continue
+            status = f"{len(result['drift'])} drifted fields" if result["drift"] else "no drift"
+            logger.info(f"📊 {database_name}: {result['total']} reports, {status}")
+
+        logger.info(
+            f"✅ Checked {summary['databases_checked']} databases, "
+            f"{summary['databases_with_drift']} with drift"
+        )
+        return all("error" not in result for result in summary["databases"].values())
+
+    except Exception as e:
+        logger.error(f"❌ Report counter repair failed: {e}")
+        return False
+
+    finally:
+        await db_manager.disconnect()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Recompute per-organization report counters and report drift")
+    parser.add_argument("org_databases", nargs="*", help="Organization databases to repair (default: all)")
+    parser.add_argument("--dry-run", action="store_true", help="Only report drift, do not overwrite counters")
+    args = parser.parse_args()
+
+    success = asyncio.run(repair_counters(args.org_databases, dry_run=args.dry_run))
+    sys.exit(0 if success else 1)
@@ -0,0 +1,296 @@
+"""
+Activity Rollups Service
+Hourly activity counts for the admin activity-stats dashboard
+
+Every write of val_app_config.activity_logs records is followed by $inc updates
+to one rollup document per (hour, organization) in `activity_rollups_hourly`:
+
+{
+    "_id": "2025-01-31T14|<organization_id>",
+    "bucket": datetime (start of the hour, UTC),
+    "organization_id": str,
+    "organization_name": str,
+    "total": int,
+    "by_action": {"LOGIN": int, ...},
+    "by_status": {"success": int, "failed": int, ...}
+}
+
+Rollups are applied per written batch (see services/activity_writer.py), so a
+batch of activities costs one bulk_write. get_activity_stats_from_rollups()
+answers the dashboard with a single aggregation over these documents instead of
+several $group passes over the full log. rebuild_activity_rollups() recomputes
+completed hours from activity_logs and its monthly archives
+(scripts/rebuild_activity_rollups.py).
+
+Live $inc updates only cover activity written after deploy, so the dashboard
+reads rollups only once a full rebuild has backfilled history; that rebuild
+stores the marker document {"_id": "_meta", "backfilled_at": datetime}.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import ASCENDING, ReplaceOne, UpdateOne
+
+from services.log_archive import list_archive_collections
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_COLLECTION = "activity_rollups_hourly"
+ROLLUP_META_ID = "_meta"
+
+
+def hour_bucket(timestamp: datetime) -> datetime:
+    """Start of the UTC hour containing timestamp"""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _rollup_id(bucket: datetime, organization_id: Any) -> str:
+    return f"{bucket.strftime('%Y-%m-%dT%H')}|{organization_id}"
+
+
+def _key(value: Any, default: str = "unknown") -> str:
+    """Make a value safe as a field name in a dotted update path"""
+    if value is None or value == "":
+        return default
+    return str(value).replace(".", "_").replace("$", "_")
+
+
+def build_rollups(activities: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Group activity records into per-(hour, organization) counts keyed by rollup id"""
+    rollups: Dict[str, Dict[str, Any]] = {}
+    for activity in activities:
+        timestamp = activity.get("timestamp") or datetime.now(timezone.utc)
+        bucket = hour_bucket(timestamp)
+        organization_id = activity.get("organization_id")
+        rollup_id = _rollup_id(bucket, organization_id)
+
+        rollup = rollups.get(rollup_id)
+        if rollup is None:
+            rollup = rollups[rollup_id] = {
+                "bucket": bucket,
+                "organization_id": organization_id,
+                "organization_name": activity.get("organization_name"),
+                "total": 0,
+                "by_action": {},
+                "by_status": {}
+            }
+        rollup["total"] += 1
+        action = _key(activity.get("action"))
+        status = _key(activity.get("status"), "success")
+        rollup["by_action"][action] = rollup["by_action"].get(action, 0) + 1
+        rollup["by_status"][status] = rollup["by_status"].get(status, 0) + 1
+    return rollups
+
+
+async def ensure_rollup_indexes(config_db) -> None:
+    """Indexes for range queries over the rollups (idempotent)"""
+    collection = config_db[ROLLUP_COLLECTION]
+    await collection.create_index([("bucket", ASCENDING)], name="idx_bucket")
+    await collection.create_index([("organization_id", ASCENDING), ("bucket", ASCENDING)], name="idx_org_bucket")
+
+
+async def update_activity_rollups(config_db, activities: List[Dict[str, Any]]) -> None:
+    """Add a batch of written activity records to the hourly rollups (one bulk_write)"""
+    rollups = build_rollups(activities)
+    if not rollups:
+        return
+
+    operations = []
+    for rollup_id, rollup in rollups.items():
+        increments = {"total": rollup["total"]}
+        increments.update({f"by_action.{action}": count for action, count in rollup["by_action"].items()})
+        increments.update({f"by_status.{status}": count for status, count in rollup["by_status"].items()})
+        operations.append(UpdateOne(
+            {"_id": rollup_id},
+            {
+                "$inc": increments,
+                "$set": {"organization_name": rollup["organization_name"]},
+                "$setOnInsert": {"bucket": rollup["bucket"], "organization_id": rollup["organization_id"]}
+            },
+            upsert=True
+        ))
+    await config_db[ROLLUP_COLLECTION].bulk_write(operations, ordered=False)
+
+
+async def rollups_backfilled(config_db) -> bool:
+    """Whether a full rebuild has backfilled history (live updates alone only cover recent activity)"""
+    return await config_db[ROLLUP_COLLECTION].find_one({"_id": ROLLUP_META_ID}, {"_id": 1}) is not None
+
+
+async def get_activity_stats_from_rollups(
+    config_db,
+    organization_id: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Activity statistics from the hourly rollups (same shape as ActivityLogger.get_activity_stats)
+
+    start_date/end_date are applied at hour granularity: the hours containing
+    them are included in full.
+    """
+    match: Dict[str, Any] = {"_id": {"$ne": ROLLUP_META_ID}}
+    if organization_id:
+        match["organization_id"] = organization_id
+    if start_date or end_date:
+        match["bucket"] = {}
+        if start_date:
+            match["bucket"]["$gte"] = hour_bucket(start_date)
+        if end_date:
+            match["bucket"]["$lte"] = hour_bucket(end_date)
+
+    pipeline = [
+        {"$match": match},
+        {"$facet": {
+            "totals": [{"$group": {
+                "_id": None,
+                "total": {"$sum": "$total"},
+                "success": {"$sum": {"$ifNull": ["$by_status.success", 0]}},
+                "failed": {"$sum": {"$ifNull": ["$by_status.failed", 0]}}
+            }}],
+            "actions": [
+                {"$project": {"actions": {"$objectToArray": "$by_action"}}},
+                {"$unwind": "$actions"},
+                {"$group": {"_id": "$actions.k", "count": {"$sum": "$actions.v"}}}
+            ],
+            "organizations": [
+                {"$sort": {"bucket": 1}},
+                {"$group": {
+                    "_id": "$organization_id",
+                    "organization_name": {"$last": "$organization_name"},
+                    "count": {"$sum": "$total"}
+                }},
+                {"$sort": {"count": -1}},
+                {"$limit": 10}
+            ]
+        }}
+    ]
+    result = await config_db[ROLLUP_COLLECTION].aggregate(pipeline).to_list(length=1)
+    facets = result[0] if result else {}
+    totals = (facets.get("totals") or [{}])[0]
+
+    total_activities = totals.get("total", 0)
+    success_count = totals.get("success", 0)
+    failed_count = totals.get("failed", 0)
+
+    return {
+        "total_activities": total_activities,
+        "success_count": success_count,
+        "failed_count": failed_count,
+        "success_rate": (success_count / total_activities * 100) if total_activities > 0 else 0,
+        "actions_breakdown": {item["_id"]: item["count"] for item in facets.get("actions", [])},
+        "top_organizations": [
+            {
+                "organization_id": item["_id"],
+                "organization_name": item["organization_name"],
+                "activity_count": item["count"]
+            }
+            for item in facets.get("organizations", [])
+        ],
+        "granularity": "hour"
+    }
+
+
+def _add_rollup_row(rollups: Dict[str, Dict[str, Any]], row: Dict[str, Any]) -> None:
+    """Fold one (hour, organization, action, status) count into the rollup documents"""
+    group = row["_id"]
+    bucket = hour_bucket(group["bucket"])
+    rollup_id = _rollup_id(bucket, group.get("organization_id"))
+    rollup = rollups.setdefault(rollup_id, {
+        "bucket": bucket,
+        "organization_id": group.get("organization_id"),
+        "organization_name": row.get("organization_name"),
+        "total": 0,
+        "by_action": {},
+        "by_status": {}
+    })
+    action = _key(group.get("action"))
+    status = _key(group.get("status"), "success")
+    rollup["total"] += row["count"]
+    rollup["by_action"][action] = rollup["by_action"].get(action, 0) + row["count"]
+    rollup["by_status"][status] = rollup["by_status"].get(status, 0) + row["count"]
+
+
+async def rebuild_activity_rollups(
+    config_db,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    dry_run: bool = False,
+    activity_collection: str = "activity_logs"
+) -> Dict[str, Any]:
+    """
+    Recompute rollups for completed hours from the activity log and its archives
+
+    The current hour is never rebuilt (live writes are still incrementing it), so
+    the rebuild can run while the app is serving traffic.
+
+    Returns:
+        {"start", "end", "rollups", "activities", "dry_run"}
+    """
+    current_hour = hour_bucket(datetime.now(timezone.utc))
+    end_bucket = min(hour_bucket(end_date) + timedelta(hours=1), current_hour) if end_date else current_hour
+    start_bucket = hour_bucket(start_date) if start_date else None
+
+    time_filter: Dict[str, Any] = {"$lt": end_bucket}
+    if start_bucket:
+        time_filter["$gte"] = start_bucket
+
+    pipeline = [
+        {"$match": {"timestamp": time_filter}},
+        {"$group": {
+            "_id": {
+                "bucket": {"$dateTrunc": {"date": "$timestamp", "unit": "hour"}},
+                "organization_id": "$organization_id",
+                "action": "$action",
+                "status": "$status"
+            },
+            "organization_name": {"$last": "$organization_name"},
+            "count": {"$sum": 1}
+        }}
+    ]
+
+    # Entries past the hot retention window live in monthly archive collections
+    sources = [activity_collection] + await list_archive_collections(config_db, activity_collection)
+
+    rollups: Dict[str, Dict[str, Any]] = {}
+    activities = 0
+    for source in sources:
+        async for row in config_db[source].aggregate(pipeline, allowDiskUse=True):
+            _add_rollup_row(rollups, row)
+            activities += row["count"]
+
+    summary = {
+        "start": start_bucket.isoformat() if start_bucket else None,
+        "end": end_bucket.isoformat(),
+        "rollups": len(rollups),
+        "activities": activities,
+        "dry_run": dry_run
+    }
+    if dry_run:
+        return summary
+
+    await ensure_rollup_indexes(config_db)
+    collection = config_db[ROLLUP_COLLECTION]
+    # Replace per document (no delete + insert), so a live $inc upsert landing
+    # mid-rebuild cannot cause duplicate keys or leave the range half empty
+    operations = [
+        ReplaceOne({"_id": rollup_id}, {"_id": rollup_id, **rollup}, upsert=True)
+        for rollup_id, rollup in rollups.items()
+    ]
+    for offset in range(0, len(operations), 1000):
+        await collection.bulk_write(operations[offset:offset + 1000], ordered=False)
+
+    if start_bucket is None and end_date is None:
+        # Full history rebuilt: the dashboard can rely on the rollups from now on
+        await collection.update_one(
+            {"_id": ROLLUP_META_ID},
+            {"$set": {"backfilled_at": datetime.now(timezone.utc), "backfilled_through": end_bucket}},
+            upsert=True
+        )
+
+    logger.info(f"📊 Rebuilt {len(rollups)} activity rollups from {activities} activities")
+    return summary
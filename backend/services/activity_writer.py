@@ -0,0 +1,221 @@
+"""
+Activity Write Buffer
+Write-behind, batched inserts for activity and audit log records
+
+Activity logging used to cost every user action a synchronous insert_one (and,
+in main.log_activity, a whole connection setup). Records are now put on a
+bounded in-process asyncio queue and a background task writes them with
+insert_many, grouped per (database, collection), whenever ACTIVITY_LOG_BATCH_SIZE
+records are waiting or ACTIVITY_LOG_FLUSH_SECONDS have passed.
+
+Backpressure: when the buffer (ACTIVITY_LOG_MAX_BUFFER records) is full, callers
+wait up to ACTIVITY_LOG_ENQUEUE_TIMEOUT_SECONDS for space; after that the record
+is dropped and counted, so logging can slow a request down but never fail it.
+The FastAPI lifespan starts the writer and flushes the buffer on shutdown. When
+the writer is not running (scripts, or no shared client) records are inserted
+directly, as before. Write hooks (add_write_hook) run after each successful
+write of a collection, e.g. to maintain rollups from the same batch.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pymongo.errors import BulkWriteError
+
+from utils.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+ActivityRecord = Tuple[str, str, Dict[str, Any]]
+WriteHook = Callable[[Any, List[Dict[str, Any]]], Awaitable[None]]
+
+activity_records_total = metrics_registry.counter(
+    "activity_log_records_total", "Activity log records by outcome (written, dropped, failed)", ("result",)
+)
+activity_buffer_depth = metrics_registry.gauge(
+    "activity_log_buffer_depth", "Activity log records waiting to be written"
+)
+
+
+class ActivityWriteBuffer:
+    """Bounded queue of activity records flushed in batches by a background task"""
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_buffer: Optional[int] = None,
+        enqueue_timeout: Optional[float] = None
+    ):
+        self.batch_size = batch_size or int(os.getenv("ACTIVITY_LOG_BATCH_SIZE", "100"))
+        self.flush_interval = flush_interval or float(os.getenv("ACTIVITY_LOG_FLUSH_SECONDS", "1.0"))
+        self.max_buffer = max_buffer or int(os.getenv("ACTIVITY_LOG_MAX_BUFFER", "10000"))
+        if enqueue_timeout is None:
+            enqueue_timeout = float(os.getenv("ACTIVITY_LOG_ENQUEUE_TIMEOUT_SECONDS", "0.5"))
+        self.enqueue_timeout = enqueue_timeout
+
+        self._queue: Optional["asyncio.Queue[ActivityRecord]"] = None
+        self._task: Optional[asyncio.Task] = None
+        self._client = None
+        self._stopping = False
+        self._write_hooks: Dict[Tuple[str, str], WriteHook] = {}
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done() and not self._stopping
+
+    def add_write_hook(self, database_name: str, collection_name: str, hook: WriteHook) -> None:
+        """Call hook(database, documents) after records are written to database.collection"""
+        self._write_hooks[(database_name, collection_name)] = hook
+
+    async def _after_write(self, database, collection_name: str, documents: List[Dict[str, Any]]) -> None:
+        hook = self._write_hooks.get((database.name, collection_name))
+        if hook is None:
+            return
+        try:
+            await hook(database, documents)
+        except Exception as e:
+            logger.error(f"❌ Activity write hook failed for {database.name}.{collection_name}: {e}")
+
+    def start(self, client) -> None:
+        """Start the background writer on the running event loop (idempotent)"""
+        if self.running:
+            return
+        self._client = client
+        self._stopping = False
+        self._queue = asyncio.Queue(maxsize=self.max_buffer)
+        self._has_records = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"📝 Activity log writer started (batch {self.batch_size}, every {self.flush_interval}s)")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Flush everything still buffered and stop the writer"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._has_records.set()
+        # The writer drains the queue and exits on its own
+        done, _ = await asyncio.wait({self._task}, timeout=timeout)
+        if not done:
+            logger.error(f"❌ Activity log writer did not finish within {timeout}s; {self._queue.qsize()} records lost")
+            # Don't leave it running against a client that is about to be closed
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        elif not self._task.cancelled() and self._task.exception() is not None:
+            logger.error(f"❌ Activity log writer failed: {self._task.exception()}")
+        self._task = None
+        activity_buffer_depth.set(0)
+        if self.dropped:
+            logger.warning(f"⚠️ Dropped {self.dropped} activity log records (buffer full)")
+        logger.info("🔒 Activity log writer stopped")
+
+    async def submit(self, database_name: str, collection_name: str, document: Dict[str, Any]) -> bool:
+        """
+        Queue one record for writing (inserted directly when the writer is not running)
+
+        Returns:
+            False if the record was dropped or could not be written
+        """
+        if not self.running:
+            return await self._write_direct(database_name, collection_name, document)
+
+        record = (database_name, collection_name, document)
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            try:
+                # Backpressure: wait briefly for the writer to make room
+                await asyncio.wait_for(self._queue.put(record), timeout=self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                self.dropped += 1
+                activity_records_total.inc(result="dropped")
+                logger.warning(f"⚠️ Activity log buffer full, dropped {document.get('action')} record")
+                return False
+        self._has_records.set()
+        return True
+
+    async def _write_direct(self, database_name: str, collection_name: str, document: Dict[str, Any]) -> bool:
+        from database.multi_db_manager import MultiDatabaseManager
+
+        db_manager = MultiDatabaseManager()
+        try:
+            if not await db_manager.connect():
+                raise RuntimeError("Failed to establish database connection")
+            database = db_manager.client[database_name]
+            await database[collection_name].insert_one(document)
+            activity_records_total.inc(result="written")
+            await self._after_write(database, collection_name, [document])
+            return True
+        except Exception as e:
+            activity_records_total.inc(result="failed")
+            logger.error(f"❌ Failed to write activity log to {database_name}.{collection_name}: {e}")
+            return False
+        finally:
+            # Closes the client unless it was borrowed from the shared one
+            await db_manager.disconnect()
+
+    async def _next_batch(self) -> List[ActivityRecord]:
+        """Up to batch_size records, waiting at most flush_interval after the first one"""
+        batch: List[ActivityRecord] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            if self._queue.empty():
+                timeout = deadline - time.monotonic()
+                if timeout <= 0 or self._stopping:
+                    break
+                self._has_records.clear()
+                try:
+                    # Event.wait is safe to time out (unlike Queue.get, it cannot lose a record)
+                    await asyncio.wait_for(self._has_records.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    if batch:
+                        break
+                    deadline = time.monotonic() + self.flush_interval
+                    continue
+                if self._queue.empty():
+                    continue
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        while not (self._stopping and self._queue.empty()):
+            batch = await self._next_batch()
+            activity_buffer_depth.set(self._queue.qsize())
+            if batch:
+                await self._write(batch)
+
+    async def _write(self, batch: List[ActivityRecord]) -> None:
+        """insert_many per (database, collection); failures are logged, never raised"""
+        grouped: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for database_name, collection_name, document in batch:
+            grouped.setdefault((database_name, collection_name), []).append(document)
+
+        for (database_name, collection_name), documents in grouped.items():
+            database = self._client[database_name]
+            try:
+                await database[collection_name].insert_many(documents, ordered=False)
+                activity_records_total.inc(len(documents), result="written")
+            except BulkWriteError as e:
+                # Unordered insert: everything except the reported write errors was written
+                failed_indexes = {error["index"] for error in e.details.get("writeErrors", [])}
+                written = [document for index, document in enumerate(documents) if index not in failed_indexes]
+                activity_records_total.inc(e.details.get("nInserted", len(written)), result="written")
+                activity_records_total.inc(len(failed_indexes), result="failed")
+                logger.error(f"❌ Failed to write {len(failed_indexes)} of {len(documents)} activity logs to {database_name}.{collection_name}: {e}")
+                documents = written
+            except Exception as e:
+                activity_records_total.inc(len(documents), result="failed")
+                logger.error(f"❌ Failed to write {len(documents)} activity logs to {database_name}.{collection_name}: {e}")
+                continue
+            if documents:
+                await self._after_write(database, collection_name, documents)
+
+
+# Global instance for import (one per worker process)
+activity_writer = ActivityWriteBuffer()
@@ -0,0 +1,125 @@
+"""
+Bank/Template Registry
+Indexed, per-worker view of the bank and template definitions in valuation_admin
+
+Resolving a template used to mean fetching the whole all_banks_comprehensive_v4
+document and scanning banks and templates with upper-cased comparisons on every
+request. The registry loads the definitions once, builds dictionaries keyed by
+bankCode, templateCode/templateId and collectionRef, and is reloaded when the
+template caches are invalidated (admin refreshes, admin writes, template
+versioning) or its TTL expires.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+COMPREHENSIVE_BANKS_DOC_ID = "all_banks_comprehensive_v4"
+
+
+class BankTemplateRegistry:
+    """O(1) lookups over bank and template definitions for one worker process"""
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("TEMPLATE_CACHE_TTL_SECONDS", "300"))
+        self.ttl_seconds = ttl_seconds
+        self._banks: Dict[str, Dict[str, Any]] = {}
+        self._templates: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._by_collection: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        self._collection_names: FrozenSet[str] = frozenset()
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at <= self.ttl_seconds
+
+    async def ensure_loaded(self, db_manager: Any) -> "BankTemplateRegistry":
+        """Load the registry if it is empty or stale; concurrent callers share one load"""
+        if self.is_loaded:
+            return self
+
+        async with self._lock:
+            if not self.is_loaded:
+                await self._load(db_manager.get_database("admin"))
+        return self
+
+    async def _load(self, admin_db: Any) -> None:
+        banks: Dict[str, Dict[str, Any]] = {}
+        templates: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        by_collection: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+
+        unified_doc = await admin_db.banks.find_one({"_id": COMPREHENSIVE_BANKS_DOC_ID})
+        if not unified_doc:
+            # Fallback to any document with banks data
+            any_doc = await admin_db.banks.find_one({"banks": {"$exists": True}})
+            if any_doc:
+                logger.warning(f"⚠️ {COMPREHENSIVE_BANKS_DOC_ID} not found, using banks document {any_doc.get('_id')}")
+                unified_doc = any_doc
+
+        # Standalone per-bank documents fill in banks missing from the unified document
+        bank_docs = [] if not unified_doc else list(unified_doc.get("banks", []))
+        standalone_docs = await admin_db.banks.find({"bankCode": {"$exists": True}}).to_list(length=None)
+        bank_docs.extend(standalone_docs)
+
+        for bank in bank_docs:
+            bank_key = bank.get("bankCode", "").upper()
+            if not bank_key or bank_key in banks:
+                continue
+            banks[bank_key] = bank
+
+            for template in bank.get("templates", []):
+                for code in (template.get("templateCode"), template.get("templateId")):
+                    if code:
+                        templates.setdefault((bank_key, str(code).upper()), template)
+                collection_ref = template.get("collectionRef")
+                if collection_ref:
+                    by_collection.setdefault(collection_ref, (bank, template))
+
+        collection_names = frozenset(await admin_db.list_collection_names())
+
+        self._banks = banks
+        self._templates = templates
+        self._by_collection = by_collection
+        self._collection_names = collection_names
+        self._loaded_at = time.monotonic()
+        logger.info(f"📚 Bank/template registry loaded: {len(banks)} banks, {len(by_collection)} template collections")
+
+    def invalidate(self) -> None:
+        """Mark the registry stale so the next ensure_loaded() reloads it"""
+        self._loaded_at = None
+
+    def get_bank(self, bank_code: str) -> Optional[Dict[str, Any]]:
+        """Bank definition by bankCode (case-insensitive)"""
+        return self._banks.get(bank_code.upper())
+
+    def get_template(self, bank_code: str, template_id: str) -> Optional[Dict[str, Any]]:
+        """Template definition by bankCode and templateCode or templateId (case-insensitive)"""
+        return self._templates.get((bank_code.upper(), template_id.upper()))
+
+    def get_by_collection(self, collection_ref: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """(bank, template) definitions that use a template collection"""
+        return self._by_collection.get(collection_ref)
+
+    def has_collection(self, collection_name: str) -> bool:
+        """Whether the admin database contained the collection when the registry was loaded"""
+        return collection_name in self._collection_names
+
+    def stats(self) -> Dict[str, Any]:
+        """Registry statistics for health/admin endpoints"""
+        return {
+            "loaded": self.is_loaded,
+            "banks": len(self._banks),
+            "templates": len(self._by_collection),
+            "collections": len(self._collection_names),
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+# Global instance for import (one per worker process)
+bank_template_registry = BankTemplateRegistry()
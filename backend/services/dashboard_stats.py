@@ -0,0 +1,117 @@
+"""
+Dashboard Statistics Service
+Computes the /api/dashboard/stats summary for an organization database
+
+All counts are gathered concurrently (report counts come from the maintained
+per-org counters in services/report_counters.py), and the result is cached per
+organization database for a few seconds. Report writes (create, submit, delete) invalidate the cache entry
+for their organization so users see their own changes immediately.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from services.report_counters import ensure_report_counters
+
+logger = logging.getLogger(__name__)
+
+PENDING_STATUSES = ("draft", "in_progress")
+
+
+class DashboardStatsCache:
+    """Per-worker, short-TTL cache of dashboard stats keyed by organization database name"""
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("DASHBOARD_STATS_TTL_SECONDS", "10"))
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[Dict[str, Any], float]] = {}
+
+    def get(self, database_name: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(database_name)
+        if entry is None or time.monotonic() - entry[1] > self.ttl_seconds:
+            return None
+        return entry[0]
+
+    def set(self, database_name: str, stats: Dict[str, Any]) -> None:
+        self._entries[database_name] = (stats, time.monotonic())
+
+    def invalidate(self, database_name: Optional[str] = None) -> None:
+        """Drop cached stats for one organization database (or all)"""
+        if database_name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(database_name, None)
+
+
+# Global instance for import (one per worker process)
+dashboard_stats_cache = DashboardStatsCache()
+
+
+async def _report_counters(org_db) -> Dict[str, Any]:
+    """Maintained report counters; falls back to one grouping pass over reports if they are unavailable"""
+    try:
+        return await ensure_report_counters(org_db)
+    except Exception as e:
+        logger.warning(f"⚠️ Report counters unavailable for {org_db.name}, counting reports: {e}")
+
+    pipeline = [{"$group": {"_id": "$status", "count": {"$sum": 1}}}]
+    by_status: Dict[str, int] = {}
+    async for row in org_db.reports.aggregate(pipeline):
+        by_status[row["_id"] or "draft"] = by_status.get(row["_id"] or "draft", 0) + row["count"]
+    return {"total": sum(by_status.values()), "by_status": by_status, "by_bank": {}, "by_creator": {}}
+
+
+async def _safe_count(collection, filter_dict: Dict[str, Any]) -> int:
+    try:
+        return await collection.count_documents(filter_dict)
+    except Exception as e:
+        logger.warning(f"⚠️ Dashboard count on {collection.name} failed: {e}")
+        return 0
+
+
+async def compute_dashboard_stats(org_db) -> Dict[str, Any]:
+    """Gather dashboard statistics for an organization database (all queries run concurrently)"""
+    week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+
+    counters, custom_templates, recent_activities, total_users = await asyncio.gather(
+        _report_counters(org_db),
+        org_db.custom_templates.count_documents({"isActive": True}),
+        org_db.activity_logs.count_documents({"timestamp": {"$gte": week_ago}}),
+        # User count (if users collection exists)
+        _safe_count(org_db.users, {"is_active": True})
+    )
+
+    by_status = counters.get("by_status", {})
+
+    return {
+        # Reports statistics
+        "total_reports": counters.get("total", 0),
+        "pending_reports": sum(by_status.get(status, 0) for status in PENDING_STATUSES),
+        "submitted_reports": by_status.get("submitted", 0),
+        "custom_templates": custom_templates,
+        "recent_activities": recent_activities,
+        "total_users": total_users,
+        # Breakdowns from the maintained counters
+        "reports_by_status": by_status,
+        "reports_by_bank": counters.get("by_bank", {}),
+        "reports_by_creator": counters.get("by_creator", {})
+    }
+
+
+async def get_dashboard_stats_cached(org_db) -> Dict[str, Any]:
+    """Dashboard stats for an organization database, served from the short-TTL cache when fresh"""
+    stats = dashboard_stats_cache.get(org_db.name)
+    if stats is None:
+        stats = await compute_dashboard_stats(org_db)
+        dashboard_stats_cache.set(org_db.name, stats)
+    return stats
+
+
+def invalidate_dashboard_stats(database_name: str) -> None:
+    """Call after report writes so the organization's next dashboard load is fresh"""
+    dashboard_stats_cache.invalidate(database_name)
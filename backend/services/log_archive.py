@@ -0,0 +1,309 @@
+"""
+Log Archive Service
+Retention tiers for activity and audit logs
+
+Hot collections keep only recent entries so their indexes stay in RAM:
+
+- val_app_config.activity_logs (admin activity log)
+- activity_logs in every organization database
+- audit_logs in the admin database (AuditLogSchema)
+
+Older entries are moved, not deleted, into monthly archive collections in the
+same database (`<collection>_archive_YYYY_MM`), created with zstd block
+compression and a time index. Whole archive months past the archive retention
+are dropped. Retention is configured per collection:
+
+    ACTIVITY_LOGS_HOT_DAYS=90       AUDIT_LOGS_HOT_DAYS=180
+    ACTIVITY_LOGS_ARCHIVE_MONTHS=24 AUDIT_LOGS_ARCHIVE_MONTHS=84   (0 keeps archives forever)
+
+Moves copy a batch into the archive (keeping _id, so re-runs are idempotent)
+and only then delete it from the hot collection. find_across_archives() lets
+the existing log endpoints read hot and archived entries as one
+newest-first result.
+"""
+
+import asyncio
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo.errors import BulkWriteError, CollectionInvalid, DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_STORAGE_ENGINE = {"wiredTiger": {"configString": "block_compressor=zstd"}}
+LOCK_COLLECTION = "maintenance_locks"
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """How long one log collection stays hot and how long its archives are kept"""
+    collection: str
+    time_field: str
+    hot_days: int
+    archive_months: int
+
+    @classmethod
+    def from_env(cls, collection: str, time_field: str, hot_days: int, archive_months: int) -> "RetentionPolicy":
+        prefix = collection.upper()
+        return cls(
+            collection=collection,
+            time_field=time_field,
+            hot_days=int(os.getenv(f"{prefix}_HOT_DAYS", str(hot_days))),
+            archive_months=int(os.getenv(f"{prefix}_ARCHIVE_MONTHS", str(archive_months)))
+        )
+
+    def hot_cutoff(self, now: Optional[datetime] = None) -> datetime:
+        return (now or datetime.now(timezone.utc)) - timedelta(days=self.hot_days)
+
+    def reaches_archive(self, start_date: Optional[datetime]) -> bool:
+        """Whether a query starting at start_date may need archived entries"""
+        return start_date is not None and _as_utc(start_date) < self.hot_cutoff()
+
+
+ACTIVITY_LOGS_POLICY = RetentionPolicy.from_env("activity_logs", "timestamp", hot_days=90, archive_months=24)
+AUDIT_LOGS_POLICY = RetentionPolicy.from_env("audit_logs", "created_at", hot_days=180, archive_months=84)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Treat naive datetimes (as returned by the driver) as UTC"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def archive_collection_name(collection: str, month: datetime) -> str:
+    return f"{collection}_archive_{month.year:04d}_{month.month:02d}"
+
+
+def _archive_month(name: str, collection: str) -> Optional[Tuple[int, int]]:
+    match = re.fullmatch(rf"{re.escape(collection)}_archive_(\d{{4}})_(\d{{2}})", name)
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+async def list_archive_collections(db, collection: str) -> List[str]:
+    """Archive collection names for a log collection, newest month first"""
+    names = await db.list_collection_names(filter={"name": {"$regex": f"^{re.escape(collection)}_archive_"}})
+    archives = [(month, name) for name in names if (month := _archive_month(name, collection))]
+    return [name for _, name in sorted(archives, reverse=True)]
+
+
+async def _ensure_archive_collection(db, name: str, time_field: str) -> None:
+    try:
+        await db.create_collection(name, storageEngine=ARCHIVE_STORAGE_ENGINE)
+        await db[name].create_index([(time_field, -1)], name=f"idx_{time_field}_desc")
+        logger.info(f"🗄️ Created archive collection {db.name}.{name}")
+    except CollectionInvalid:
+        pass  # Already exists
+
+
+async def archive_collection(
+    db,
+    policy: RetentionPolicy,
+    dry_run: bool = False,
+    batch_size: int = 1000,
+    now: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Move entries older than the policy's hot window into monthly archives and
+    drop archive months past retention
+
+    Returns:
+        {"eligible": int, "archived": int, "archives": [names written], "dropped": [names dropped]}
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = policy.hot_cutoff(now)
+    hot = db[policy.collection]
+    old_filter = {policy.time_field: {"$lt": cutoff}}
+
+    result: Dict[str, Any] = {"eligible": 0, "archived": 0, "archives": [], "dropped": []}
+    result["eligible"] = await hot.count_documents(old_filter)
+
+    if not dry_run:
+        ensured = set()
+        while True:
+            batch = await hot.find(old_filter).sort(policy.time_field, 1).limit(batch_size).to_list(length=batch_size)
+            if not batch:
+                break
+
+            by_month: Dict[str, List[Dict[str, Any]]] = {}
+            for document in batch:
+                timestamp = document[policy.time_field]
+                name = archive_collection_name(policy.collection, timestamp)
+                by_month.setdefault(name, []).append(document)
+
+            for name, documents in by_month.items():
+                if name not in ensured:
+                    await _ensure_archive_collection(db, name, policy.time_field)
+                    ensured.add(name)
+                try:
+                    await db[name].insert_many(documents, ordered=False)
+                except BulkWriteError as e:
+                    # Entries copied by an interrupted earlier run are already there
+                    if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                        raise
+
+            await hot.delete_many({"_id": {"$in": [document["_id"] for document in batch]}})
+            result["archived"] += len(batch)
+            result["archives"] = sorted(set(result["archives"]) | set(by_month))
+            # Yield between batches so request handlers keep running
+            await asyncio.sleep(0)
+
+    if policy.archive_months > 0:
+        oldest_kept = (now.year * 12 + now.month - 1) - policy.archive_months
+        for name in await list_archive_collections(db, policy.collection):
+            year, month = _archive_month(name, policy.collection)
+            if year * 12 + month - 1 < oldest_kept:
+                if not dry_run:
+                    await db.drop_collection(name)
+                    logger.info(f"🗑️ Dropped expired archive {db.name}.{name}")
+                result["dropped"].append(name)
+
+    return result
+
+
+async def find_across_archives(
+    db,
+    collection: str,
+    filter_query: Dict[str, Any],
+    time_field: str,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    count: bool = True
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    Query a log collection and its monthly archives as one newest-first result
+
+    Archive months outside [start_date, end_date] are not touched. Pass
+    count=False when no total is needed (archives are then only read until
+    the page is full).
+
+    Returns:
+        (documents, total) - total is None when count=False
+    """
+    start_date = _as_utc(start_date)
+    end_date = _as_utc(end_date)
+    sources = [collection]
+    for name in await list_archive_collections(db, collection):
+        year, month = _archive_month(name, collection)
+        month_start = datetime(year, month, 1, tzinfo=timezone.utc)
+        month_end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+        if start_date and month_end <= start_date:
+            continue
+        if end_date and month_start > end_date:
+            continue
+        sources.append(name)
+
+    documents: List[Dict[str, Any]] = []
+    total = 0 if count else None
+    remaining_skip = skip
+
+    for source in sources:
+        page_full = limit is not None and len(documents) >= limit
+        if page_full and not count:
+            break
+
+        # Counts are needed for the total, or to spread a skip across sources
+        matched = await db[source].count_documents(filter_query) if count or remaining_skip else None
+        if count:
+            total += matched
+        if page_full:
+            continue
+        if matched is not None and remaining_skip >= matched:
+            remaining_skip -= matched
+            continue
+
+        cursor = db[source].find(filter_query).sort(time_field, -1).skip(remaining_skip)
+        if limit is not None:
+            cursor = cursor.limit(limit - len(documents))
+        documents.extend(await cursor.to_list(length=None))
+        remaining_skip = 0
+
+    return documents, total
+
+
+async def _acquire_lock(config_db, name: str, ttl: timedelta) -> bool:
+    """Hold a named maintenance lease so only one worker runs a periodic job"""
+    now = datetime.now(timezone.utc)
+    try:
+        await config_db[LOCK_COLLECTION].find_one_and_update(
+            {"_id": name, "expires_at": {"$lt": now}},
+            {"$set": {"expires_at": now + ttl, "acquired_at": now, "holder": os.getpid()}},
+            upsert=True
+        )
+        return True
+    except DuplicateKeyError:
+        return False
+
+
+async def run_log_retention(
+    db_manager,
+    org_database_names: Optional[List[str]] = None,
+    dry_run: bool = False,
+    logger=None
+) -> Dict[str, Any]:
+    """
+    Apply retention to every log collection (config, admin and organization databases)
+
+    Args:
+        db_manager: Connected MultiDatabaseManager
+        org_database_names: Organization databases to process (default: all)
+        dry_run: Only count entries that would move and archives that would be dropped
+
+    Returns:
+        Summary keyed by "<database>.<collection>"
+    """
+    from database.organization_models import NON_ORG_DATABASES, list_org_database_names
+
+    if logger is None:
+        logger = logging.getLogger(__name__)
+
+    targets: List[Tuple[Any, RetentionPolicy]] = []
+    if org_database_names is None:
+        targets.append((await db_manager.get_config_db(), ACTIVITY_LOGS_POLICY))
+        targets.append((db_manager.get_database("admin"), AUDIT_LOGS_POLICY))
+        org_database_names = await list_org_database_names(db_manager)
+    for database_name in org_database_names:
+        if database_name not in NON_ORG_DATABASES:
+            targets.append((db_manager.get_org_database(database_name), ACTIVITY_LOGS_POLICY))
+
+    summary: Dict[str, Any] = {"dry_run": dry_run, "archived": 0, "collections": {}}
+    for db, policy in targets:
+        key = f"{db.name}.{policy.collection}"
+        try:
+            result = await archive_collection(db, policy, dry_run=dry_run)
+            summary["archived"] += result["archived"]
+            if result["eligible"] or result["dropped"]:
+                summary["collections"][key] = result
+        except Exception as e:
+            logger.error(f"❌ Log retention failed for {key}: {e}")
+            summary["collections"][key] = {"error": str(e)}
+
+    action = "eligible" if dry_run else "archived"
+    eligible = sum(r.get("eligible", 0) for r in summary["collections"].values())
+    logger.info(f"🗄️ Log retention: {eligible if dry_run else summary['archived']} entries {action} across {len(targets)} collections")
+    return summary
+
+
+async def log_retention_loop(connect_db_manager, interval_hours: float) -> None:
+    """Run log retention periodically; a lease in val_app_config keeps it to one worker per interval"""
+    interval = timedelta(hours=interval_hours)
+    while True:
+        db_manager = None
+        try:
+            db_manager = await connect_db_manager()
+            if await _acquire_lock(await db_manager.get_config_db(), "log_retention", interval):
+                await run_log_retention(db_manager)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Scheduled log retention failed: {e}")
+        finally:
+            if db_manager is not None:
+                await db_manager.disconnect()
+        await asyncio.sleep(interval.total_seconds())
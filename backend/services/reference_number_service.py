@@ -3,17 +3,137 @@ Report Reference Number Service
 Handles atomic generation and validation of unique report reference numbers
 Format: {initials}/{sequence:04d}/{date_DDMMYYYY}
 Example: CEV/RVO/0001/02122025
+
+Optional block allocation: with REFERENCE_NUMBER_BLOCK_SIZE > 1 each worker
+reserves a range of sequence numbers per organization with a single $inc and
+hands them out locally, so bursts of report creation do not serialize on the
+organization document. Numbers stay unique but may be issued out of order
+across workers, and unused ranges become gaps (logged on shutdown).
 """
 
+import asyncio
 import logging
+import os
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from pymongo.collection import Collection
 from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError
 
 logger = logging.getLogger(__name__)
 
+SEQUENCE_COUNTER_FIELD = "settings.report_sequence_counter"
+
+
+class ReferenceBlockAllocator:
+    """Per-worker allocator handing out reserved ranges of report sequence numbers"""
+    
+    def __init__(self, block_size: Optional[int] = None):
+        """
+        Args:
+            block_size: Sequence numbers reserved per round trip (default: REFERENCE_NUMBER_BLOCK_SIZE, 1 = disabled).
+                        This is also the largest gap a worker restart can leave per organization.
+        """
+        if block_size is None:
+            block_size = int(os.getenv("REFERENCE_NUMBER_BLOCK_SIZE", "1"))
+        self.block_size = max(1, block_size)
+        # org_short_name -> {"initials", "next", "end"} (end inclusive)
+        self._blocks: Dict[str, Dict[str, Any]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+    
+    @property
+    def enabled(self) -> bool:
+        return self.block_size > 1
+    
+    def peek(self, org_short_name: str) -> Optional[int]:
+        """Next sequence this worker would hand out for an organization, if it holds a block"""
+        block = self._blocks.get(org_short_name)
+        if block and block["next"] <= block["end"]:
+            return block["next"]
+        return None
+    
+    async def allocate(self, orgs_collection, org_short_name: str) -> Tuple[str, int]:
+        """
+        Take the next sequence number from this worker's block, reserving a new block when exhausted
+        
+        Returns:
+            (initials, sequence)
+            
+        Raises:
+            ValueError: If organization not found or missing initials configuration
+        """
+        lock = self._locks.setdefault(org_short_name, asyncio.Lock())
+        async with lock:
+            block = self._blocks.get(org_short_name)
+            if not block or block["next"] > block["end"]:
+                block = await self._reserve_block(orgs_collection, org_short_name)
+                self._blocks[org_short_name] = block
+            
+            sequence = block["next"]
+            block["next"] += 1
+            return block["initials"], sequence
+    
+    async def _reserve_block(self, orgs_collection, org_short_name: str) -> Dict[str, Any]:
+        result = await orgs_collection.find_one_and_update(
+            {"org_short_name": org_short_name},
+            {"$inc": {SEQUENCE_COUNTER_FIELD: self.block_size}},
+            projection={"settings.report_reference_initials": 1, SEQUENCE_COUNTER_FIELD: 1},
+            return_document=ReturnDocument.AFTER
+        )
+        
+        if not result:
+            raise ValueError(f"Organization '{org_short_name}' not found")
+        
+        settings = result.get("settings", {})
+        initials = settings.get("report_reference_initials")
+        end = settings.get("report_sequence_counter", self.block_size)
+        
+        if not initials:
+            # Rollback the reservation
+            await orgs_collection.update_one(
+                {"org_short_name": org_short_name},
+                {"$inc": {SEQUENCE_COUNTER_FIELD: -self.block_size}}
+            )
+            raise ValueError(f"Organization '{org_short_name}' has not configured report reference initials")
+        
+        start = end - self.block_size + 1
+        logger.info(f"📦 Reserved reference sequence block {start}-{end} for {org_short_name}")
+        return {"initials": initials, "next": start, "end": end}
+    
+    async def release_unused(self, orgs_collection) -> Dict[str, Any]:
+        """
+        Give back or log the unused part of every block held by this worker (call on shutdown)
+        
+        A range is returned to the counter only when no later block was reserved after it;
+        otherwise it is logged as a permanent gap.
+        """
+        summary: Dict[str, Any] = {"returned": {}, "gaps": {}}
+        
+        for org_short_name, block in list(self._blocks.items()):
+            unused = block["end"] - block["next"] + 1
+            if unused <= 0:
+                continue
+            
+            unused_range = f"{block['next']}-{block['end']}"
+            result = await orgs_collection.update_one(
+                {"org_short_name": org_short_name, SEQUENCE_COUNTER_FIELD: block["end"]},
+                {"$inc": {SEQUENCE_COUNTER_FIELD: -unused}}
+            )
+            
+            if result.modified_count:
+                summary["returned"][org_short_name] = unused_range
+                logger.info(f"↩️ Returned unused reference sequences {unused_range} for {org_short_name}")
+            else:
+                summary["gaps"][org_short_name] = unused_range
+                logger.warning(f"⚠️ Unused reference sequences {unused_range} for {org_short_name} left as a gap")
+        
+        self._blocks.clear()
+        return summary
+
+
+# Global instance for import (one per worker process)
+reference_block_allocator = ReferenceBlockAllocator()
+
 
 class ReferenceNumberService:
     """Service for generating and validating report reference numbers"""
@@ -58,9 +178,9 @@ class ReferenceNumberService:
             if not initials:
                 raise ValueError(f"Organization '{org_short_name}' has not configured report reference initials")
             
-            # Get current counter (next sequence will be current + 1)
+            # Get current counter (next sequence will be current + 1, or the next number in this worker's block)
             current_counter = settings.get("report_sequence_counter", 0)
-            next_sequence = current_counter + 1
+            next_sequence = reference_block_allocator.peek(org_short_name) or current_counter + 1
             
             # Format the reference number
             reference_number = self._format_reference_number(initials, next_sequence)
@@ -99,6 +219,13 @@ class ReferenceNumberService:
             config_db = self.db_manager.client.val_app_config
             orgs_collection = config_db.organizations
             
+            if reference_block_allocator.enabled:
+                # Hand out the next number from this worker's reserved block
+                initials, sequence = await reference_block_allocator.allocate(orgs_collection, org_short_name)
+                reference_number = self._format_reference_number(initials, sequence)
+                logger.info(f"✅ Generated reference number for {org_short_name}: {reference_number} (sequence: {sequence}, block)")
+                return reference_number
+            
             # Atomically increment the counter and get the new value
             # This is thread-safe and prevents race conditions
             result = await orgs_collection.find_one_and_update(
@@ -0,0 +1,195 @@
+"""
+Report Counters Service
+Incrementally maintained per-organization report counts
+
+Each organization database holds one document in `report_counters`:
+{
+    "_id": "reports",
+    "total": int,
+    "by_status": {"draft": int, "submitted": int, ...},
+    "by_bank": {"SBI": int, ...},
+    "by_creator": {"<user_id>": int, ...},
+    "updated_at": datetime
+}
+
+Report writes adjust it with $inc, so dashboards read counts without scanning
+reports. The document is created from a full recount the first time it is read
+(ensure_report_counters); increments never create it, so a partially counted
+document cannot appear. Counter updates are best-effort (a failed $inc is
+logged, never raised into the request); repair_report_counters() recomputes
+every document from the reports collection and reports any drift.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+COUNTERS_COLLECTION = "report_counters"
+COUNTERS_DOC_ID = "reports"
+
+
+def _counter_key(value: Any, default: str = "unknown") -> str:
+    """Make a value safe as a field name in a dotted update path"""
+    if value is None or value == "":
+        return default
+    return str(value).replace(".", "_").replace("$", "_")
+
+
+async def _apply_increments(org_db, increments: Dict[str, int]) -> None:
+    increments = {path: amount for path, amount in increments.items() if amount}
+    if not increments:
+        return
+    try:
+        await org_db[COUNTERS_COLLECTION].update_one(
+            {"_id": COUNTERS_DOC_ID},
+            {"$inc": increments, "$set": {"updated_at": datetime.now(timezone.utc)}}
+        )
+    except Exception as e:
+        logger.error(f"❌ Failed to update report counters in {org_db.name}: {e}")
+
+
+async def record_report_created(org_db, report: Dict[str, Any]) -> None:
+    """Count a newly inserted report"""
+    await _apply_increments(org_db, {
+        "total": 1,
+        f"by_status.{_counter_key(report.get('status'), 'draft')}": 1,
+        f"by_bank.{_counter_key(report.get('bank_code'))}": 1,
+        f"by_creator.{_counter_key(report.get('created_by'))}": 1
+    })
+
+
+async def record_status_change(org_db, old_status: Optional[str], new_status: Optional[str]) -> None:
+    """Move one report between status buckets (no-op when the status did not change)"""
+    old_key = _counter_key(old_status, "draft")
+    new_key = _counter_key(new_status, "draft")
+    if old_key == new_key:
+        return
+    await _apply_increments(org_db, {
+        f"by_status.{old_key}": -1,
+        f"by_status.{new_key}": 1
+    })
+
+
+async def get_report_counters(org_db) -> Optional[Dict[str, Any]]:
+    """Current counters document for an organization database, or None if never initialized"""
+    return await org_db[COUNTERS_COLLECTION].find_one({"_id": COUNTERS_DOC_ID})
+
+
+async def compute_report_counters(org_db) -> Dict[str, Any]:
+    """Recompute counters from the reports collection (single $facet pass)"""
+    pipeline = [
+        {"$facet": {
+            "by_status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+            "by_bank": [{"$group": {"_id": "$bank_code", "count": {"$sum": 1}}}],
+            "by_creator": [{"$group": {"_id": "$created_by", "count": {"$sum": 1}}}]
+        }}
+    ]
+    result = await org_db.reports.aggregate(pipeline).to_list(length=1)
+    facets = result[0] if result else {}
+
+    counters: Dict[str, Any] = {"total": 0, "by_status": {}, "by_bank": {}, "by_creator": {}}
+    for bucket, default in (("by_status", "draft"), ("by_bank", "unknown"), ("by_creator", "unknown")):
+        for row in facets.get(bucket, []):
+            key = _counter_key(row["_id"], default)
+            counters[bucket][key] = counters[bucket].get(key, 0) + row["count"]
+    counters["total"] = sum(counters["by_status"].values())
+    return counters
+
+
+async def ensure_report_counters(org_db) -> Dict[str, Any]:
+    """Counters document for an organization database, initialized from a full recount if missing"""
+    counters = await get_report_counters(org_db)
+    if counters is not None:
+        return counters
+
+    counters = {
+        "_id": COUNTERS_DOC_ID,
+        **await compute_report_counters(org_db),
+        "updated_at": datetime.now(timezone.utc)
+    }
+    try:
+        await org_db[COUNTERS_COLLECTION].insert_one(counters)
+        logger.info(f"📊 Initialized report counters for {org_db.name}: {counters['total']} reports")
+    except DuplicateKeyError:
+        # Another request initialized it first
+        counters = await get_report_counters(org_db) or counters
+    return counters
+
+
+def _diff_counters(stored: Dict[str, Any], actual: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields whose stored value differs from the recomputed one: {path: {"stored", "actual"}}"""
+    drift: Dict[str, Any] = {}
+    if stored.get("total", 0) != actual["total"]:
+        drift["total"] = {"stored": stored.get("total", 0), "actual": actual["total"]}
+    for bucket in ("by_status", "by_bank", "by_creator"):
+        stored_bucket = stored.get(bucket) or {}
+        for key in set(stored_bucket) | set(actual[bucket]):
+            stored_value = stored_bucket.get(key, 0)
+            actual_value = actual[bucket].get(key, 0)
+            if stored_value != actual_value:
+                drift[f"{bucket}.{key}"] = {"stored": stored_value, "actual": actual_value}
+    return drift
+
+
+async def repair_report_counters(
+    db_manager,
+    org_database_names: Optional[List[str]] = None,
+    dry_run: bool = False,
+    logger=None
+) -> Dict[str, Any]:
+    """
+    Recompute report counters from scratch and report drift
+
+    Args:
+        db_manager: Connected MultiDatabaseManager
+        org_database_names: Databases to check (default: every organization in val_app_config)
+        dry_run: Only report drift, do not overwrite counters
+
+    Returns:
+        Summary with per-database drift
+    """
+    from database.organization_models import NON_ORG_DATABASES, list_org_database_names
+
+    if logger is None:
+        logger = logging.getLogger(__name__)
+
+    if org_database_names is None:
+        org_database_names = await list_org_database_names(db_manager)
+
+    summary: Dict[str, Any] = {
+        "dry_run": dry_run,
+        "databases_checked": 0,
+        "databases_with_drift": 0,
+        "databases": {}
+    }
+
+    for database_name in org_database_names:
+        if database_name in NON_ORG_DATABASES:
+            continue
+        org_db = db_manager.get_org_database(database_name)
+        try:
+            actual = await compute_report_counters(org_db)
+            stored = await get_report_counters(org_db) or {}
+            drift = _diff_counters(stored, actual)
+
+            if drift:
+                summary["databases_with_drift"] += 1
+                logger.warning(f"⚠️ Report counter drift in {database_name}: {drift}")
+            if not dry_run and (drift or not stored):
+                await org_db[COUNTERS_COLLECTION].replace_one(
+                    {"_id": COUNTERS_DOC_ID},
+                    {**actual, "updated_at": datetime.now(timezone.utc), "repaired_at": datetime.now(timezone.utc)},
+                    upsert=True
+                )
+
+            summary["databases"][database_name] = {"drift": drift, "total": actual["total"]}
+            summary["databases_checked"] += 1
+        except Exception as e:
+            logger.error(f"❌ Report counter repair failed for {database_name}: {e}")
+            summary["databases"][database_name] = {"error": str(e)}
+
+    return summary
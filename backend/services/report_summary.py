@@ -0,0 +1,304 @@
+"""
+Report Summary Service
+Compact, denormalized list data stored on each report as `summary`
+
+The reports list only needs a handful of display fields, but extracting them
+means walking report_data (including tables) across several legacy layouts.
+The walk now happens once at write time; list endpoints project `summary`
+instead of loading report_data.
+
+Summary shape:
+{
+    "applicant_name": str,
+    "property_address": str | None,
+    "bank_branch": str | None,
+    "bank_code": str,
+    "status": str,
+    "created_at": datetime,
+    "updated_at": datetime,
+    "submitted_at": datetime | None
+}
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+# Fields the reports list reads; report_data is deliberately excluded
+REPORT_LIST_PROJECTION = {
+    "report_id": 1,
+    "reference_number": 1,
+    "bank_code": 1,
+    "template_id": 1,
+    "status": 1,
+    "created_by_email": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "submitted_at": 1,
+    "version": 1,
+    "property_address": 1,  # Legacy root-level address
+    "summary": 1
+}
+
+# Summary fields every complete summary has. Report updates $set dotted summary
+# paths, which can leave a partial summary on reports written before summaries
+# existed; those still need a full build.
+SUMMARY_REQUIRED_FIELDS = ("applicant_name", "property_address", "bank_branch")
+
+# Common fields and data fields that feed the summary
+SUMMARY_COMMON_FIELDS = {"applicant_name", "bank_branch"}
+SUMMARY_ADDRESS_FIELDS = ("postal_address", "property_address")
+
+
+def extract_display_data(report: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract display data from report handling both old and new structures
+    Old: property_address at root, applicant_name in _common_fields_
+    New: postal_address in report_data.data, applicant_name in report_data.common_fields
+    """
+    # Initialize defaults
+    property_address = "N/A"
+    applicant_name = "N/A"
+
+    # Get the report_data section
+    report_data = report.get("report_data", {})
+
+    if isinstance(report_data, dict):
+        # NEW FORMAT: Check report_data.common_fields.applicant_name (direct)
+        if "common_fields" in report_data and isinstance(report_data["common_fields"], dict):
+            applicant_name = report_data["common_fields"].get("applicant_name", "N/A")
+
+        # NEW FORMAT: Check report_data.data.postal_address (direct)
+        if "data" in report_data and isinstance(report_data["data"], dict):
+            data_section = report_data["data"]
+            property_address = data_section.get("postal_address") or data_section.get("property_address", "N/A")
+
+        # OLD FORMAT FALLBACK: report_data.report_data.data (nested)
+        elif "report_data" in report_data and isinstance(report_data["report_data"], dict):
+            nested_report_data = report_data["report_data"]
+            if "data" in nested_report_data and isinstance(nested_report_data["data"], dict):
+                data_section = nested_report_data["data"]
+                property_address = data_section.get("postal_address") or data_section.get("property_address", "N/A")
+
+        # OLD FORMAT: Direct fields in report_data
+        else:
+            property_address = report_data.get("postal_address") or report_data.get("property_address", "N/A")
+
+        # OLD FORMAT FALLBACK: _common_fields_ inside report_data
+        if applicant_name == "N/A" and "_common_fields_" in report_data and isinstance(report_data["_common_fields_"], dict):
+            applicant_name = report_data["_common_fields_"].get("applicant_name", "N/A")
+
+    # LEGACY FALLBACK: Try root level
+    if property_address == "N/A":
+        property_address = report.get("property_address", "N/A")
+
+    if applicant_name == "N/A" and "common_fields" in report and isinstance(report["common_fields"], dict):
+        applicant_name = report["common_fields"].get("applicant_name", "N/A")
+
+    return {
+        "property_address": property_address,
+        "applicant_name": applicant_name
+    }
+
+
+def extract_bank_branch(report_data: Any) -> Optional[str]:
+    """Find the bank branch id in report_data across new and old layouts"""
+    if not isinstance(report_data, dict):
+        return None
+
+    bank_branch = None
+
+    # PRIORITY 1: Check common_fields first (NEW FORMAT)
+    if "common_fields" in report_data and isinstance(report_data["common_fields"], dict):
+        bank_branch = report_data["common_fields"].get("bank_branch")
+
+    # PRIORITY 2: Check direct field (fallback)
+    if not bank_branch:
+        bank_branch = report_data.get("bank_branch") or report_data.get("bankBranch")
+
+    # PRIORITY 3: Search in nested structure (old organized format)
+    if not bank_branch:
+        for tab_key, tab_data in report_data.items():
+            if isinstance(tab_data, dict):
+                for section_data in tab_data.values():
+                    if isinstance(section_data, dict):
+                        found_branch = section_data.get("bank_branch") or section_data.get("bankBranch")
+                        if found_branch:
+                            bank_branch = found_branch
+                            break
+                if bank_branch:
+                    break
+            elif tab_key in ["bank_branch", "bankBranch"]:
+                bank_branch = tab_data
+                break
+
+    return bank_branch
+
+
+def build_report_summary(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the summary sub-document from a full report document"""
+    display_data = extract_display_data(report)
+
+    return {
+        "applicant_name": display_data["applicant_name"],
+        "property_address": display_data["property_address"],
+        "bank_branch": extract_bank_branch(report.get("report_data", {})),
+        "bank_code": report.get("bank_code", ""),
+        "status": report.get("status", "draft"),
+        "created_at": report.get("created_at"),
+        "updated_at": report.get("updated_at"),
+        "submitted_at": report.get("submitted_at")
+    }
+
+
+def build_summary_update(
+    sections: Dict[str, Dict[str, Any]],
+    updated_at: datetime,
+    status: Optional[str] = None,
+    cleared_fields: Optional[Iterable[str]] = None,
+    partial: bool = False
+) -> Dict[str, Any]:
+    """
+    Build dotted $set paths that keep `summary` in sync with a report update
+
+    Args:
+        sections: Organized report_data sections being written (common_fields/data/tables)
+        updated_at: New updated_at timestamp
+        status: New status, if the update changes it
+        cleared_fields: Field ids removed by a patch update
+        partial: Patch update - only touch summary fields whose source fields are in the update
+    """
+    common_fields = sections.get("common_fields", {})
+    data_section = sections.get("data", {})
+    cleared = set(cleared_fields or ())
+
+    summary_update: Dict[str, Any] = {"summary.updated_at": updated_at}
+    if status:
+        summary_update["summary.status"] = status
+
+    for field_id in SUMMARY_COMMON_FIELDS:
+        if field_id in common_fields:
+            summary_update[f"summary.{field_id}"] = common_fields[field_id]
+        elif not partial or field_id in cleared:
+            summary_update[f"summary.{field_id}"] = "N/A" if field_id == "applicant_name" else None
+
+    address = next((data_section[field_id] for field_id in SUMMARY_ADDRESS_FIELDS if data_section.get(field_id)), None)
+    if address or not partial or cleared.intersection(SUMMARY_ADDRESS_FIELDS):
+        summary_update["summary.property_address"] = address
+
+    return summary_update
+
+
+def needs_summary(report: Dict[str, Any]) -> bool:
+    """Whether a report has no summary yet, or only a partial one"""
+    summary = report.get("summary") or {}
+    return any(field not in summary for field in SUMMARY_REQUIRED_FIELDS)
+
+
+def needs_summary_filter() -> Dict[str, Any]:
+    """Query matching reports for which needs_summary() is true"""
+    return {"$or": [{f"summary.{field}": {"$exists": False}} for field in SUMMARY_REQUIRED_FIELDS]}
+
+
+def format_report_list_item(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a report projected with REPORT_LIST_PROJECTION for the reports list"""
+    summary = report.get("summary") or {}
+
+    def iso(value: Any) -> Optional[str]:
+        return value.isoformat() if value else None
+
+    bank_branch = summary.get("bank_branch")
+
+    return {
+        "_id": str(report["_id"]),
+        "report_id": report.get("report_id"),
+        "reference_number": report.get("reference_number"),
+        "property_address": summary.get("property_address") or report.get("property_address") or "N/A",
+        "applicant_name": summary.get("applicant_name") or "N/A",
+        "bank_code": report.get("bank_code", ""),
+        "bank_branch": bank_branch,
+        # For now, use the branch ID as display name
+        "bank_branch_name": bank_branch if isinstance(bank_branch, str) else None,
+        "template_id": report.get("template_id", ""),
+        "status": report.get("status", "draft"),
+        "created_by_email": report.get("created_by_email", ""),
+        "created_at": iso(report.get("created_at")),
+        "updated_at": iso(report.get("updated_at")),
+        "submitted_at": iso(report.get("submitted_at")),
+        "version": report.get("version", 1)
+    }
+
+
+async def ensure_report_summaries(org_db, reports: List[Dict[str, Any]]) -> None:
+    """
+    Fill in `summary` for listed reports written before summaries existed (in place)
+
+    Reports with only a partial summary (dotted updates applied to a legacy
+    report) are rebuilt too.
+
+    Loads report_data only for those reports and persists the computed summaries,
+    so each report pays the extraction cost once.
+    """
+    missing_ids = [report["_id"] for report in reports if needs_summary(report)]
+    if not missing_ids:
+        return
+
+    full_reports = await org_db.reports.find({"_id": {"$in": missing_ids}}).to_list(length=None)
+    summaries = {report["_id"]: build_report_summary(report) for report in full_reports}
+
+    for report in reports:
+        if report["_id"] in summaries:
+            report["summary"] = summaries[report["_id"]]
+
+    # Listed reports can be deleted before the fetch above; bulk_write rejects an empty batch
+    if not summaries:
+        return
+
+    await org_db.reports.bulk_write(
+        [UpdateOne({"_id": _id}, {"$set": {"summary": summary}}) for _id, summary in summaries.items()],
+        ordered=False
+    )
+    logger.info(f"📝 Stored summaries for {len(summaries)} reports on first listing")
+
+
+async def backfill_report_summaries(
+    org_db,
+    batch_size: int = 500,
+    dry_run: bool = False,
+    rebuild: bool = False
+) -> Dict[str, Any]:
+    """
+    One-off backfill of `summary` for an organization's existing reports
+
+    Args:
+        org_db: Organization database
+        batch_size: Reports updated per bulk_write
+        dry_run: Only count reports that need a summary
+        rebuild: Recompute summaries that already exist
+
+    Returns:
+        {"matched": int, "updated": int}
+    """
+    query = {} if rebuild else needs_summary_filter()
+    matched = await org_db.reports.count_documents(query)
+    if dry_run or matched == 0:
+        return {"matched": matched, "updated": 0}
+
+    updated = 0
+    operations: List[UpdateOne] = []
+    async for report in org_db.reports.find(query):
+        operations.append(UpdateOne({"_id": report["_id"]}, {"$set": {"summary": build_report_summary(report)}}))
+        if len(operations) >= batch_size:
+            result = await org_db.reports.bulk_write(operations, ordered=False)
+            updated += result.modified_count
+            operations = []
+
+    if operations:
+        result = await org_db.reports.bulk_write(operations, ordered=False)
+        updated += result.modified_count
+
+    return {"matched": matched, "updated": updated}
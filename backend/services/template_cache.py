@@ -0,0 +1,175 @@
+"""
+Aggregated Template Cache
+Per-worker cache of fully assembled /api/templates/{bank}/{template}/aggregated-fields responses
+
+Templates only change through admin refreshes and template versioning, so the
+compiled response (common fields + bank-specific tabs/sections) is kept in
+memory keyed by bank code, template code and template version. Writers call
+invalidate() explicitly. Lookups without a version use the version in the
+bank/template registry while it is loaded, so a worker serves a new template
+version as soon as its registry has reloaded; otherwise the version this
+worker last compiled is used, and the TTL bounds staleness on workers that
+did not see the write.
+
+Each entry also keeps a PreparedBody (serialized JSON, gzip body and ETag) so
+cache hits are served as raw bytes or a 304 Not Modified.
+"""
+
+import logging
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from services.bank_template_registry import bank_template_registry
+from utils.http_cache import PreparedBody, PreparedBodyCache
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str, str]
+
+# Payload fields that change on every compile without the template changing
+VOLATILE_PAYLOAD_FIELDS = frozenset({"aggregatedAt"})
+
+
+class AggregatedTemplateCache:
+    """In-memory cache of compiled aggregated-fields payloads for one worker process"""
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("TEMPLATE_CACHE_TTL_SECONDS", "300"))
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[CacheKey, Dict[str, Any]] = {}
+        # Latest compiled version per (bank, template), used when the caller does not know the version
+        self._current_versions: Dict[Tuple[str, str], str] = {}
+        # Bumped on every invalidation so derived caches (ETags, serialized bodies) can detect changes
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(bank_code: str, template_id: str) -> Tuple[str, str]:
+        return bank_code.upper(), template_id.upper()
+
+    def _current_version(self, bank_key: str, template_key: str) -> Optional[str]:
+        """Version to serve when the caller does not name one: the registry's, else the last compiled"""
+        if bank_template_registry.is_loaded:
+            template = bank_template_registry.get_template(bank_key, template_key)
+            if template is None:
+                return None
+            # Same default as compile_aggregated_template_fields uses for templateInfo.version
+            return template.get("version", "1.0")
+        return self._current_versions.get((bank_key, template_key))
+
+    def _get_entry(self, bank_code: str, template_id: str, version: Optional[str]) -> Optional[Dict[str, Any]]:
+        bank_key, template_key = self._normalize(bank_code, template_id)
+        if version is None:
+            version = self._current_version(bank_key, template_key)
+            if version is None:
+                self.misses += 1
+                return None
+
+        entry = self._entries.get((bank_key, template_key, version))
+        if entry is None or time.monotonic() - entry["compiled_at"] > self.ttl_seconds:
+            if entry is not None:
+                del self._entries[(bank_key, template_key, version)]
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def get(self, bank_code: str, template_id: str, version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached payload for a template, or None if missing or expired
+
+        Args:
+            bank_code: Bank code (case-insensitive)
+            template_id: Template code or id (case-insensitive)
+            version: Template version; defaults to the registry's current version (or the
+                latest version compiled by this worker while the registry is not loaded)
+        """
+        entry = self._get_entry(bank_code, template_id, version)
+        return entry["payload"] if entry is not None else None
+
+    def get_prepared(self, bank_code: str, template_id: str, version: Optional[str] = None) -> Optional[PreparedBody]:
+        """Return the serialized/compressed body for a template, or None if missing, expired or superseded"""
+        entry = self._get_entry(bank_code, template_id, version)
+        return entry["prepared"] if entry is not None else None
+
+    def set(self, bank_code: str, template_id: str, version: str, payload: Dict[str, Any]) -> PreparedBody:
+        """Store a compiled payload (ObjectId/datetime values are encoded by PreparedBody) and mark it as the current version"""
+        bank_key, template_key = self._normalize(bank_code, template_id)
+        previous_version = self._current_versions.get((bank_key, template_key))
+        if previous_version is not None and previous_version != version:
+            self._entries.pop((bank_key, template_key, previous_version), None)
+
+        # aggregatedAt differs per compile and per worker; leave it out of the ETag so
+        # unchanged templates keep the same ETag everywhere
+        prepared = PreparedBody(
+            payload,
+            etag_payload={key: value for key, value in payload.items() if key not in VOLATILE_PAYLOAD_FIELDS}
+        )
+        self._entries[(bank_key, template_key, version)] = {
+            "payload": payload,
+            "prepared": prepared,
+            "compiled_at": time.monotonic()
+        }
+        self._current_versions[(bank_key, template_key)] = version
+        logger.debug(f"📦 Cached aggregated template {bank_key}/{template_key} v{version}")
+        return prepared
+
+    def invalidate(self, bank_code: Optional[str] = None, template_id: Optional[str] = None) -> int:
+        """
+        Drop cached payloads
+
+        Args:
+            bank_code: Only drop entries for this bank (default: all banks)
+            template_id: Only drop entries for this template (requires bank_code)
+
+        Returns:
+            Number of entries removed
+        """
+        if bank_code is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            self._current_versions.clear()
+        else:
+            bank_key = bank_code.upper()
+            template_key = template_id.upper() if template_id else None
+            keys = [
+                key for key in self._entries
+                if key[0] == bank_key and (template_key is None or key[1] == template_key)
+            ]
+            for key in keys:
+                del self._entries[key]
+            for key in [k for k in self._current_versions if k[0] == bank_key and (template_key is None or k[1] == template_key)]:
+                del self._current_versions[key]
+            removed = len(keys)
+
+        self.generation += 1
+        logger.info(f"🧹 Invalidated {removed} aggregated template cache entries (bank={bank_code}, template={template_id})")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics for health/admin endpoints"""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "generation": self.generation,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+# Global instances for import (one per worker process)
+aggregated_template_cache = AggregatedTemplateCache()
+
+# Prepared bodies for /api/banks and /api/banks/{bank_code}/branches
+bank_metadata_cache = PreparedBodyCache()
+
+
+def invalidate_template_caches(bank_code: Optional[str] = None, template_id: Optional[str] = None) -> None:
+    """Invalidate every in-process cache derived from bank/template definitions"""
+    aggregated_template_cache.invalidate(bank_code, template_id)
+    bank_metadata_cache.invalidate()
+    bank_template_registry.invalidate()
@@ -8,19 +8,24 @@ based on the existing MongoDB template structure in valuation_admin database.
 import asyncio
 from typing import Dict, List, Any, Optional, Tuple, Set
 from database.multi_db_manager import MultiDatabaseManager
+from services.bank_template_registry import bank_template_registry
 
 class TemplateFieldMappingService:
-    def __init__(self):
-        self.db_manager = MultiDatabaseManager()
+    def __init__(self, db_manager: Optional[MultiDatabaseManager] = None):
+        # Reuse the caller's connected manager when given; otherwise own one
+        self._owns_db_manager = db_manager is None
+        self.db_manager = db_manager or MultiDatabaseManager()
         self._template_cache: Dict[str, Dict[str, Any]] = {}
     
     async def connect(self):
         """Connect to MongoDB"""
-        await self.db_manager.connect()
+        if self._owns_db_manager or not self.db_manager.is_connected:
+            await self.db_manager.connect()
     
     async def disconnect(self):
-        """Disconnect from MongoDB"""
-        await self.db_manager.disconnect()
+        """Disconnect from MongoDB (a manager passed in by the caller is left open)"""
+        if self._owns_db_manager:
+            await self.db_manager.disconnect()
     
     async def get_template_structure(self, bank_code: str, template_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -42,50 +47,19 @@ class TemplateFieldMappingService:
         try:
             admin_db = self.db_manager.get_database("admin")
             
-            # Try multiple approaches to find the template
+            # Resolve the template collection from the in-memory registry
+            registry = await bank_template_registry.ensure_loaded(self.db_manager)
+            
             collection_ref = None
             template_name = None
             
-            # Approach 1: Find via unified document
-            unified_doc = await admin_db.banks.find_one({"_id": "all_banks_comprehensive_v4"})
+            # Approach 1: Bank/template definitions (unified document or per-bank documents)
+            template = registry.get_template(bank_code, template_id)
+            if template:
+                collection_ref = template.get("collectionRef")
+                template_name = template.get("templateName", "")
             
-            if unified_doc:
-                # Find the specific bank
-                bank_doc = None
-                all_banks = unified_doc.get("banks", [])
-                
-                for bank in all_banks:
-                    if bank.get("bankCode", "").upper() == bank_code.upper():
-                        bank_doc = bank
-                        break
-                
-                if bank_doc:
-                    # Find the specific template
-                    templates = bank_doc.get("templates", [])
-                    for template in templates:
-                        if (template.get("templateCode", "").upper() == template_id.upper() or 
-                            template.get("templateId", "").upper() == template_id.upper()):
-                            collection_ref = template.get("collectionRef")
-                            template_name = template.get("templateName", "")
-                            break
-            
-            # Approach 2: Find via banks collection
-            if not collection_ref:
-                banks_collection = admin_db["banks"]
-                bank_doc = await banks_collection.find_one(
-                    {"bankCode": {"$regex": f"^{bank_code}$", "$options": "i"}}
-                )
-                
-                if bank_doc:
-                    templates = bank_doc.get("templates", [])
-                    for template in templates:
-                        if (template.get("templateCode", "").upper() == template_id.upper() or 
-                            template.get("templateId", "").upper() == template_id.upper()):
-                            collection_ref = template.get("collectionRef")
-                            template_name = template.get("templateName", "")
-                            break
-            
-            # Approach 3: Direct collection lookup by naming convention
+            # Approach 2: Direct collection lookup by naming convention
             if not collection_ref:
                 # Try common template collection naming patterns
                 possible_collections = [
@@ -95,9 +69,8 @@ class TemplateFieldMappingService:
                     f"{bank_code.lower()}_{template_id.lower()}"
                 ]
                 
-                collections = await admin_db.list_collection_names()
                 for possible_collection in possible_collections:
-                    if possible_collection in collections:
+                    if registry.has_collection(possible_collection):
                         collection_ref = possible_collection
                         template_name = f"{bank_code} {template_id.title()} Template"
                         print(f"🔍 Found template in direct collection: {collection_ref}")
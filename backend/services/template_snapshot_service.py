@@ -232,6 +232,10 @@ class TemplateSnapshotService:
             
             result = await db.template_versions.insert_one(new_template_version)
             
+            # Drop compiled aggregated-fields payloads for this bank
+            from services.template_cache import invalidate_template_caches
+            invalidate_template_caches(bank_code if bank_code != "UNKNOWN" else None)
+            
             logger.info(f"Created new template version {template_id} v{new_version}")
             return str(result.inserted_id)
             
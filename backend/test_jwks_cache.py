@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+JWKS Cache Tests
+Tests single-flight fetching, kid-miss refresh limits and failure fallback
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.jwks_cache import JWKSCache, JWKSUnavailable
+
+JWKS_URL = "https://cognito-idp.test.amazonaws.com/pool/.well-known/jwks.json"
+
+
+def make_jwk(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    return jwk
+
+
+class StubJWKSEndpoint:
+    """httpx transport handler serving a configurable JWKS document"""
+
+    def __init__(self, keys, delay=0.0):
+        self.keys = keys
+        self.delay = delay
+        self.fail = False
+        self.calls = 0
+
+    async def __call__(self, request):
+        self.calls += 1
+        assert str(request.url) == JWKS_URL
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            return httpx.Response(503, text="unavailable")
+        return httpx.Response(200, json={"keys": self.keys})
+
+
+def make_cache(endpoint, **kwargs):
+    kwargs.setdefault("ttl_seconds", 3600)
+    kwargs.setdefault("refresh_ahead_seconds", 0)
+    kwargs.setdefault("miss_refresh_seconds", 60)
+    return JWKSCache(JWKS_URL, transport=httpx.MockTransport(endpoint), **kwargs)
+
+
+def test_concurrent_callers_share_one_fetch():
+    endpoint = StubJWKSEndpoint([make_jwk("key-1")], delay=0.05)
+    cache = make_cache(endpoint)
+
+    async def run():
+        return await asyncio.gather(*(cache.get_signing_key("key-1") for _ in range(20)))
+
+    keys = asyncio.run(run())
+
+    assert endpoint.calls == 1
+    assert all(key is not None for key in keys)
+    assert all(key is keys[0] for key in keys)
+
+
+def test_unknown_kid_refreshes_at_most_once_per_interval():
+    endpoint = StubJWKSEndpoint([make_jwk("key-1")])
+    cache = make_cache(endpoint)
+
+    async def run():
+        assert await cache.get_signing_key("key-1") is not None
+        assert await cache.get_signing_key("forged-1") is None
+        assert await cache.get_signing_key("forged-2") is None
+        assert await cache.get_signing_key("forged-3") is None
+
+    asyncio.run(run())
+
+    # Initial load plus a single kid-miss refresh
+    assert endpoint.calls == 2
+
+
+def test_unknown_kid_picks_up_rotated_keys():
+    endpoint = StubJWKSEndpoint([make_jwk("key-1")])
+    cache = make_cache(endpoint)
+
+    async def run():
+        await cache.get_jwks()
+        endpoint.keys = endpoint.keys + [make_jwk("key-2")]
+        return await cache.get_signing_key("key-2")
+
+    assert asyncio.run(run()) is not None
+    assert endpoint.calls == 2
+
+
+def test_failed_refresh_keeps_previous_keys():
+    endpoint = StubJWKSEndpoint([make_jwk("key-1")])
+    cache = make_cache(endpoint, ttl_seconds=0.05, miss_refresh_seconds=0)
+
+    async def run():
+        first = await cache.get_signing_key("key-1")
+        endpoint.fail = True
+        await asyncio.sleep(0.1)
+        # Expired: the refresh fails, the cached key is still served
+        return first, await cache.get_signing_key("key-1")
+
+    first, after_failure = asyncio.run(run())
+
+    assert endpoint.calls == 2
+    assert after_failure is first
+    assert asyncio.run(cache.get_jwks())["keys"][0]["kid"] == "key-1"
+
+
+def test_no_keys_ever_loaded_raises():
+    endpoint = StubJWKSEndpoint([])
+    endpoint.fail = True
+    cache = make_cache(endpoint)
+
+    with pytest.raises(JWKSUnavailable):
+        asyncio.run(cache.get_signing_key("key-1"))
+
+    # A second lookup inside the retry interval does not hit the endpoint again
+    with pytest.raises(JWKSUnavailable):
+        asyncio.run(cache.get_jwks())
+    assert endpoint.calls == 1
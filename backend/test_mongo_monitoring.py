@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+MongoDB Monitoring Tests
+Tests the redacted query shapes written to the slow-query log
+"""
+
+import os
+import sys
+from datetime import datetime
+
+from bson import ObjectId
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.mongo_monitoring import command_shape, redact_shape
+
+
+def test_redact_shape_keeps_fields_and_operators_only():
+    query = {
+        "status": "submitted",
+        "created_at": {"$gte": datetime(2024, 1, 1)},
+        "created_by": ObjectId(),
+        "is_deleted": {"$ne": True}
+    }
+
+    assert redact_shape(query) == {
+        "status": "?str",
+        "created_at": {"$gte": "?datetime"},
+        "created_by": "?ObjectId",
+        "is_deleted": {"$ne": "?bool"}
+    }
+
+
+def test_redact_shape_collapses_scalar_lists():
+    assert redact_shape({"status": {"$in": ["draft", "submitted", "approved"]}}) == {"status": {"$in": ["?str"]}}
+    assert redact_shape({"tags": []}) == {"tags": []}
+
+
+def test_redact_shape_keeps_every_stage_of_document_lists():
+    pipeline = [{"$match": {"bank_code": "SBI"}}, {"$group": {"_id": "$status", "n": {"$sum": 1}}}]
+
+    assert redact_shape(pipeline) == [
+        {"$match": {"bank_code": "?str"}},
+        {"$group": {"_id": "?str", "n": {"$sum": "?int"}}}
+    ]
+
+
+def test_redact_shape_stops_at_max_depth():
+    nested = "leaf"
+    for _ in range(30):
+        nested = {"a": nested}
+
+    shape = redact_shape(nested)
+    for _ in range(21):
+        shape = shape["a"]
+    assert shape == "?..."
+
+
+def test_command_shape_find_keeps_sort_and_projection_names():
+    command = {
+        "find": "reports",
+        "filter": {"report_id": "RPT-1"},
+        "sort": {"created_at": -1},
+        "projection": {"_id": 0, "summary": 1},
+        "limit": 21,
+        "lsid": {"id": "session"}
+    }
+
+    assert command_shape("find", command) == {
+        "filter": {"report_id": "?str"},
+        "sort": {"created_at": -1},
+        "projection": {"_id": 0, "summary": 1}
+    }
+
+
+def test_command_shape_writes_use_first_statement_filter_only():
+    command = {
+        "update": "reports",
+        "updates": [
+            {"q": {"report_id": "RPT-1"}, "u": {"$set": {"applicant_name": "A. Kumar"}}},
+            {"q": {"report_id": "RPT-2", "version": 3}, "u": {"$set": {"status": "draft"}}}
+        ]
+    }
+
+    assert command_shape("update", command) == {"updates": [{"q": {"report_id": "?str"}}]}
+
+
+def test_command_shape_insert_and_unknown_commands_carry_no_values():
+    assert command_shape("insert", {"insert": "activity_logs", "documents": [{"email": "a@b.com"}]}) == {}
+    assert command_shape("createIndexes", {"createIndexes": "reports", "indexes": []}) == {}
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Pagination Utility Tests
+Tests cursor encoding/decoding and keyset filters for list endpoints
+"""
+
+import base64
+import json
+import os
+import sys
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.pagination import combine_filters, decode_cursor, encode_cursor, keyset_filter, split_page
+
+LAST_ID = ObjectId("65a000000000000000000001")
+
+
+def make_token(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("value", [
+    datetime(2024, 5, 1, 10, 30, 15, 123000),
+    "RPT-2024-001",
+    "",
+    42,
+    3.75,
+    None
+])
+def test_cursor_round_trips_sort_value_and_type(value):
+    token = encode_cursor("created_at", {"created_at": value, "_id": LAST_ID})
+
+    decoded_value, decoded_id = decode_cursor(token, "created_at")
+
+    assert decoded_value == value
+    assert type(decoded_value) is type(value)
+    assert decoded_id == LAST_ID
+
+
+def test_cursor_treats_missing_sort_field_as_null():
+    token = encode_cursor("updated_at", {"_id": LAST_ID})
+    assert decode_cursor(token, "updated_at") == (None, LAST_ID)
+
+
+@pytest.mark.parametrize("value", [True, {"nested": 1}, ["a"], ObjectId()])
+def test_cursor_rejects_unsupported_sort_values(value):
+    with pytest.raises(TypeError):
+        encode_cursor("created_at", {"created_at": value, "_id": LAST_ID})
+
+
+def test_cursor_for_another_sort_field_is_rejected():
+    token = encode_cursor("created_at", {"created_at": datetime(2024, 1, 1), "_id": LAST_ID})
+    with pytest.raises(ValueError):
+        decode_cursor(token, "updated_at")
+
+
+@pytest.mark.parametrize("token", [
+    "not-a-cursor",
+    make_token({"f": "created_at", "t": "number", "v": "12", "id": str(LAST_ID)}),
+    make_token({"f": "created_at", "t": "bytes", "v": "x", "id": str(LAST_ID)}),
+    make_token({"f": "created_at", "t": "null", "v": None, "id": "not-an-object-id"})
+])
+def test_malformed_cursor_raises_value_error(token):
+    with pytest.raises(ValueError):
+        decode_cursor(token, "created_at")
+
+
+def test_untagged_cursor_decodes_as_datetime():
+    # Cursors issued before type tags carried only ISO datetimes (or null)
+    token = make_token({"f": "created_at", "v": "2024-05-01T10:30:00", "id": str(LAST_ID)})
+    assert decode_cursor(token, "created_at") == (datetime(2024, 5, 1, 10, 30), LAST_ID)
+
+    token = make_token({"f": "created_at", "v": None, "id": str(LAST_ID)})
+    assert decode_cursor(token, "created_at") == (None, LAST_ID)
+
+
+def test_keyset_filter_after_valued_document():
+    token = encode_cursor("reference_number", {"reference_number": "RPT-7", "_id": LAST_ID})
+
+    assert keyset_filter("reference_number", token) == {
+        "$or": [
+            {"reference_number": {"$lt": "RPT-7"}},
+            {"reference_number": "RPT-7", "_id": {"$lt": LAST_ID}},
+            {"reference_number": None}
+        ]
+    }
+
+
+def test_keyset_filter_after_null_document_stays_in_null_tail():
+    token = encode_cursor("created_at", {"created_at": None, "_id": LAST_ID})
+    assert keyset_filter("created_at", token) == {"created_at": None, "_id": {"$lt": LAST_ID}}
+
+
+def test_combine_filters_keeps_both_or_clauses():
+    first = {"$or": [{"a": 1}, {"b": 2}]}
+    second = {"$or": [{"c": 3}]}
+    assert combine_filters(first, None, {}) == first
+    assert combine_filters(first, second) == {"$and": [first, second]}
+
+
+def test_split_page_returns_cursor_only_when_more_rows_exist():
+    documents = [{"_id": ObjectId(), "created_at": datetime(2024, 1, day)} for day in (3, 2, 1)]
+
+    page, next_cursor = split_page(documents, 3, "created_at")
+    assert page == documents
+    assert next_cursor is None
+
+    page, next_cursor = split_page(documents, 2, "created_at")
+    assert page == documents[:2]
+    assert decode_cursor(next_cursor, "created_at") == (datetime(2024, 1, 2), documents[1]["_id"])
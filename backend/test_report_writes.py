@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Report Write Helper Tests
+Tests patch building, version-conditioned filters and write conflict errors
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+from fastapi import HTTPException
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+
+from main import build_report_patch, raise_report_write_conflict, report_version_filter
+
+
+class FakeReports:
+    """reports collection stub answering find_one with a fixed document"""
+
+    def __init__(self, document):
+        self.document = document
+        self.queries = []
+
+    async def find_one(self, query, projection=None):
+        self.queries.append(query)
+        return self.document
+
+
+class FakeOrgDb:
+    def __init__(self, document):
+        self.reports = FakeReports(document)
+
+
+@pytest.mark.parametrize("field_id", ["", "report_data.common_fields", "$set", "$where"])
+def test_build_report_patch_rejects_unsafe_field_ids(field_id):
+    with pytest.raises(HTTPException) as exc_info:
+        build_report_patch([field_id], {field_id: "value"})
+    assert exc_info.value.status_code == 400
+
+
+def test_build_report_patch_sets_changed_fields_in_their_sections():
+    set_fields, unset_fields = build_report_patch(
+        ["applicant_name", "land_area"],
+        {"applicant_name": "A. Kumar", "land_area": "120", "untouched": "ignored"}
+    )
+
+    assert set_fields == {
+        "report_data.common_fields.applicant_name": "A. Kumar",
+        "report_data.data.land_area": "120"
+    }
+    assert unset_fields == {}
+
+
+def test_build_report_patch_writes_tables_whole():
+    table = {"rows": [["1", "2"]], "columns": ["a", "b"]}
+    set_fields, _ = build_report_patch(["floor_table"], {"floor_table": table})
+
+    assert list(set_fields) == ["report_data.tables.floor_table"]
+    assert set_fields["report_data.tables.floor_table"]["original_data"] == table
+
+
+@pytest.mark.parametrize("cleared_value", [None, ""])
+def test_build_report_patch_unsets_cleared_fields(cleared_value):
+    set_fields, unset_fields = build_report_patch(["owner_name"], {"owner_name": cleared_value})
+
+    assert set_fields == {}
+    assert unset_fields == {
+        "report_data.common_fields.owner_name": "",
+        "report_data.data.owner_name": "",
+        "report_data.tables.owner_name": ""
+    }
+
+
+def test_build_report_patch_treats_missing_fields_as_cleared():
+    _, unset_fields = build_report_patch(["owner_name"], {})
+    assert "report_data.data.owner_name" in unset_fields
+
+
+def test_report_version_filter_matches_exact_version():
+    assert report_version_filter("RPT-1", 4) == {"report_id": "RPT-1", "version": 4}
+
+
+def test_report_version_filter_matches_legacy_reports_as_v1():
+    # Reports saved before versioning have no version field
+    assert report_version_filter("RPT-1", 1) == {"report_id": "RPT-1", "version": {"$in": [1, None]}}
+
+
+def test_raise_report_write_conflict_missing_report_is_404():
+    org_db = FakeOrgDb(None)
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(raise_report_write_conflict(org_db, "RPT-1", 3))
+    assert exc_info.value.status_code == 404
+    assert org_db.reports.queries == [{"report_id": "RPT-1"}]
+
+
+def test_raise_report_write_conflict_stale_version_is_409():
+    org_db = FakeOrgDb({"report_id": "RPT-1", "version": 5})
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(raise_report_write_conflict(org_db, "RPT-1", 3))
+    assert exc_info.value.status_code == 409
+    assert exc_info.value.detail["current_version"] == 5
+
+
+def test_raise_report_write_conflict_reports_legacy_version_as_1():
+    org_db = FakeOrgDb({"report_id": "RPT-1"})
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(raise_report_write_conflict(org_db, "RPT-1", 2))
+    assert exc_info.value.status_code == 409
+    assert exc_info.value.detail["current_version"] == 1
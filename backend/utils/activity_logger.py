@@ -51,7 +51,14 @@ class ActivityLogger:
     async def initialize(self):
         """Initialize connection to config database"""
         try:
+            from services.activity_rollups import ensure_rollup_indexes, update_activity_rollups
+            from services.activity_writer import activity_writer
+            
             self.config_db = await self.db_manager.get_config_db()
+            
+            # Keep the hourly rollups in step with every written batch
+            activity_writer.add_write_hook(self.config_db.name, self.collection_name, update_activity_rollups)
+            await ensure_rollup_indexes(self.config_db)
             logger.info("Activity logger initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize activity logger: {str(e)}")
@@ -89,7 +96,7 @@ class ActivityLogger:
             bool: True if logged successfully, False otherwise
         """
         try:
-            if not self.config_db:
+            if self.config_db is None:
                 await self.initialize()
             
             activity_log = {
@@ -106,9 +113,12 @@ class ActivityLogger:
                 "error_message": error_message
             }
             
-            await self.config_db[self.collection_name].insert_one(activity_log)
+            # Written in batches by the activity write buffer
+            from services.activity_writer import activity_writer
+            
+            logged = await activity_writer.submit(self.config_db.name, self.collection_name, activity_log)
             logger.debug(f"Activity logged: {action.value} by {user_email} in {organization_name}")
-            return True
+            return logged
             
         except Exception as e:
             logger.error(f"Failed to log activity: {str(e)}")
@@ -125,7 +135,8 @@ class ActivityLogger:
         status: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        include_archived: bool = False
     ) -> Dict[str, Any]:
         """
         Retrieve activity logs with filters and pagination
@@ -140,12 +151,16 @@ class ActivityLogger:
             start_date: Filter by start date
             end_date: Filter by end date
             search: Search in user_email, organization_name, or details
+            include_archived: Also search monthly archives (implied when start_date is
+                older than the hot retention window)
             
         Returns:
             Dict with 'activities' list and 'total_count'
         """
+        from services.log_archive import ACTIVITY_LOGS_POLICY, find_across_archives
+        
         try:
-            if not self.config_db:
+            if self.config_db is None:
                 await self.initialize()
             
             # Build filter query
@@ -180,15 +195,21 @@ class ActivityLogger:
                     {"details.file_name": {"$regex": search, "$options": "i"}}
                 ]
             
-            # Get total count
-            total_count = await self.config_db[self.collection_name].count_documents(filter_query)
-            
-            # Get paginated activities
-            activities_cursor = self.config_db[self.collection_name].find(filter_query).sort(
-                "timestamp", -1
-            ).skip(skip).limit(limit)
-            
-            activities = await activities_cursor.to_list(length=limit)
+            if include_archived or ACTIVITY_LOGS_POLICY.reaches_archive(start_date):
+                activities, total_count = await find_across_archives(
+                    self.config_db, self.collection_name, filter_query, "timestamp",
+                    skip=skip, limit=limit, start_date=start_date, end_date=end_date
+                )
+            else:
+                # Get total count
+                total_count = await self.config_db[self.collection_name].count_documents(filter_query)
+                
+                # Get paginated activities
+                activities_cursor = self.config_db[self.collection_name].find(filter_query).sort(
+                    "timestamp", -1
+                ).skip(skip).limit(limit)
+                
+                activities = await activities_cursor.to_list(length=limit)
             
             # Convert ObjectId to string for JSON serialization
             for activity in activities:
@@ -215,6 +236,9 @@ class ActivityLogger:
         """
         Get activity statistics
         
+        Answered from the hourly rollups (dates apply at hour granularity); falls
+        back to scanning activity_logs until a full rollup rebuild has backfilled history.
+        
         Args:
             organization_id: Filter by organization
             start_date: Filter by start date
@@ -223,10 +247,22 @@ class ActivityLogger:
         Returns:
             Dict with activity statistics
         """
+        from services.activity_rollups import get_activity_stats_from_rollups, rollups_backfilled
+        
         try:
-            if not self.config_db:
+            if self.config_db is None:
                 await self.initialize()
             
+            if await rollups_backfilled(self.config_db):
+                return await get_activity_stats_from_rollups(
+                    self.config_db,
+                    organization_id=organization_id,
+                    start_date=start_date,
+                    end_date=end_date
+                )
+            
+            logger.warning("Activity rollups not backfilled yet - scanning activity_logs (run scripts/rebuild_activity_rollups.py)")
+            
             # Build filter query
             filter_query = {}
             
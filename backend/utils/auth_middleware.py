@@ -6,17 +6,18 @@ Handles AWS Cognito JWT token validation and organization-based access control
 import os
 import json
 import jwt
-import requests
+import hashlib
 import logging
-from typing import Optional, Dict, Any, List, Union, Callable
+import time
+from typing import Optional, Dict, Any, FrozenSet, List, Tuple, Union, Callable
 from functools import wraps
 from datetime import datetime, timezone
 from fastapi import Request, HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from cachetools import TTLCache
 import asyncio
 from database.multi_db_manager import MultiDatabaseManager
 from database.organization_models import AuditLogSchema, FILTERED_COLLECTIONS
+from utils.jwks_cache import JWKSCache, JWKSUnavailable
 
 logger = logging.getLogger(__name__)
 
@@ -40,35 +41,37 @@ class CognitoJWTValidator:
         else:
             self.enabled = True
             
-        # JWK cache (24-hour TTL)
-        self.jwk_cache = TTLCache(maxsize=1, ttl=86400)  # 24 hours
+        self.issuer = f"https://cognito-idp.{self.region}.amazonaws.com/{self.user_pool_id}"
+        
+        # Build JWK URL (JWKS_URL overrides it, e.g. to point at a local stub server)
+        self.jwk_url = os.getenv("JWKS_URL") or f"{self.issuer}/.well-known/jwks.json"
+        
+        # Signing keys (async single-flight fetch, background refresh, parsed per kid)
+        self.jwks = JWKSCache(self.jwk_url)
         
-        # Build JWK URL
         if self.enabled:
-            self.jwk_url = f"https://cognito-idp.{self.region}.amazonaws.com/{self.user_pool_id}/.well-known/jwks.json"
             logger.info(f"🔐 Cognito JWT validator initialized for region: {self.region}")
     
     async def get_jwk_keys(self) -> Dict[str, Any]:
         """Fetch and cache JWK keys from Cognito"""
-        if "jwk_keys" in self.jwk_cache:
-            return self.jwk_cache["jwk_keys"]
-        
         try:
-            # Fetch JWK keys from Cognito
-            response = requests.get(self.jwk_url, timeout=10)
-            response.raise_for_status()
-            jwk_data = response.json()
-            
-            # Cache the keys
-            self.jwk_cache["jwk_keys"] = jwk_data
-            logger.debug("🔄 JWK keys fetched and cached")
-            
-            return jwk_data
-            
-        except Exception as e:
+            return await self.jwks.get_jwks()
+        except JWKSUnavailable as e:
             logger.error(f"❌ Failed to fetch JWK keys: {e}")
             raise HTTPException(status_code=500, detail="Unable to validate token")
     
+    async def get_signing_key(self, kid: str) -> Any:
+        """Public key for a token's kid (raises 401 if the issuer does not publish it)"""
+        try:
+            key = await self.jwks.get_signing_key(kid)
+        except JWKSUnavailable as e:
+            logger.error(f"❌ Failed to fetch JWK keys: {e}")
+            raise HTTPException(status_code=500, detail="Unable to validate token")
+        
+        if key is None:
+            raise HTTPException(status_code=401, detail="Invalid token key")
+        return key
+    
     async def validate_token(self, token: str) -> Dict[str, Any]:
         """Validate JWT token and extract claims"""
         # Check if this is a development token first
@@ -82,9 +85,6 @@ class CognitoJWTValidator:
             return self._get_development_claims(token)
         
         try:
-            # Get JWK keys
-            jwk_data = await self.get_jwk_keys()
-            
             # Decode token header to get key ID
             unverified_header = jwt.get_unverified_header(token)
             kid = unverified_header.get("kid")
@@ -93,14 +93,7 @@ class CognitoJWTValidator:
                 raise HTTPException(status_code=401, detail="Invalid token format")
             
             # Find matching key
-            key = None
-            for jwk_key in jwk_data.get("keys", []):
-                if jwk_key.get("kid") == kid:
-                    key = jwt.algorithms.RSAAlgorithm.from_jwk(jwk_key)
-                    break
-            
-            if not key:
-                raise HTTPException(status_code=401, detail="Invalid token key")
+            key = await self.get_signing_key(kid)
             
             # Validate and decode token
             payload = jwt.decode(
@@ -108,12 +101,14 @@ class CognitoJWTValidator:
                 key,
                 algorithms=["RS256"],
                 audience=self.client_id,
-                issuer=f"https://cognito-idp.{self.region}.amazonaws.com/{self.user_pool_id}"
+                issuer=self.issuer
             )
             
             logger.debug(f"✅ JWT token validated for user: {payload.get('email', 'unknown')}")
             return payload
             
+        except HTTPException as http_exc:
+            raise http_exc
         except jwt.ExpiredSignatureError:
             raise HTTPException(status_code=401, detail="Token has expired")
         except jwt.InvalidTokenError as e:
@@ -208,6 +203,29 @@ class CognitoJWTValidator:
 # Global JWT validator instance
 jwt_validator = CognitoJWTValidator()
 
+# Role-based permissions as (resource, action) sets
+# Manager: Full access including report submission
+# Employee: Can create/edit/save reports but CANNOT submit them
+ROLE_PERMISSIONS: Dict[str, FrozenSet[Tuple[str, str]]] = {
+    role: frozenset((resource, action) for resource, actions in resources.items() for action in actions)
+    for role, resources in {
+        "manager": {
+            "organization": ["read", "update"],
+            "users": ["read", "update"], # Managers can only read and update users, not create
+            "reports": ["create", "read", "update", "delete", "submit"],  # Can submit reports
+            "templates": ["read", "update"],
+            "audit_logs": ["read"],
+            "files": ["create", "read", "update", "delete"]
+        },
+        "employee": {
+            "organization": ["read"],
+            "reports": ["create", "read", "update"],  # CANNOT submit (no "submit" permission)
+            "templates": ["read"],
+            "files": ["create", "read", "update"]
+        }
+    }.items()
+}
+
 class OrganizationContext:
     """
     Organization context extracted from JWT token
@@ -227,6 +245,8 @@ class OrganizationContext:
         self.is_manager = "manager" in self.roles or self.is_system_admin
         self.is_employee = "employee" in self.roles
         self.dev_mode = jwt_claims.get("dev_mode", False)
+        self.expires_at = jwt_claims.get("exp")
+        self.permissions = ROLE_PERMISSIONS["manager" if self.is_manager else "employee"]
         
         # Validate required fields
         if not self.org_short_name:
@@ -247,31 +267,7 @@ class OrganizationContext:
         if self.is_system_admin:
             return True  # System admin has all permissions
         
-        # Define role-based permissions
-        # Manager: Full access including report submission
-        # Employee: Can create/edit/save reports but CANNOT submit them
-        permissions = {
-            "manager": {
-                "organization": ["read", "update"],
-                "users": ["read", "update"], # Managers can only read and update users, not create
-                "reports": ["create", "read", "update", "delete", "submit"],  # Can submit reports
-                "templates": ["read", "update"],
-                "audit_logs": ["read"],
-                "files": ["create", "read", "update", "delete"]
-            },
-            "employee": {
-                "organization": ["read"],
-                "reports": ["create", "read", "update"],  # CANNOT submit (no "submit" permission)
-                "templates": ["read"],
-                "files": ["create", "read", "update"]
-            }
-        }
-        
-        user_role = "manager" if self.is_manager else "employee"
-        user_perms = permissions.get(user_role, {})
-        resource_perms = user_perms.get(resource, [])
-        
-        return action in resource_perms
+        return (resource, action) in self.permissions
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for logging"""
@@ -286,28 +282,86 @@ class OrganizationContext:
             "dev_mode": self.dev_mode
         }
 
+class OrganizationContextCache:
+    """
+    Per-worker cache of verified organization contexts keyed by a SHA-256 hash of the token
+
+    Entries live until the token's exp claim, capped at AUTH_CONTEXT_CACHE_TTL_SECONDS,
+    so a cached token is never accepted past its own expiry.
+    """
+    
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("AUTH_CONTEXT_CACHE_TTL_SECONDS", "300"))
+        if max_entries is None:
+            max_entries = int(os.getenv("AUTH_CONTEXT_CACHE_MAX_ENTRIES", "10000"))
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[OrganizationContext, float]] = {}
+    
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+    
+    def get(self, token: str) -> Optional[OrganizationContext]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() >= entry[1]:
+            del self._entries[key]
+            return None
+        return entry[0]
+    
+    def set(self, token: str, org_context: OrganizationContext) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        if org_context.expires_at is not None:
+            expires_at = min(expires_at, float(org_context.expires_at))
+        if expires_at <= now:
+            return
+        
+        if len(self._entries) >= self.max_entries:
+            # Drop expired entries first, then the oldest ones
+            for key in [k for k, (_, exp) in self._entries.items() if exp <= now]:
+                del self._entries[key]
+            while len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+        
+        self._entries[self._key(token)] = (org_context, expires_at)
+    
+    def invalidate(self, token: Optional[str] = None) -> None:
+        """Drop one token's cached context (or all)"""
+        if token is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(self._key(token), None)
+
+# Global instance for import (one per worker process)
+org_context_cache = OrganizationContextCache()
+
 async def get_organization_context(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> OrganizationContext:
     """
     FastAPI dependency to extract and validate organization context from JWT token
     """
+    token = credentials.credentials
+    org_context = org_context_cache.get(token)
+    if org_context is not None:
+        return org_context
+    
     try:
-        # Debug: Log the token being processed
-        logger.info(f"🔍 Processing token: {credentials.credentials[:50]}...")
-        
         # Validate JWT token
-        jwt_claims = await jwt_validator.validate_token(credentials.credentials)
-        
-        # Debug: Log the JWT claims
-        logger.info(f"🔍 JWT Claims: {jwt_claims}")
+        jwt_claims = await jwt_validator.validate_token(token)
         
         # Create organization context
         org_context = OrganizationContext(jwt_claims)
+        org_context_cache.set(token, org_context)
         
-        # Debug: Log the organization context
-        logger.info(f"🏢 Organization context created: {org_context.org_short_name} ({org_context.email})")
-        logger.info(f"🏢 Roles: {org_context.roles}, is_manager: {org_context.is_manager}")
+        logger.debug(f"🏢 Organization context created: {org_context.org_short_name} ({org_context.email}), roles: {org_context.roles}")
         
         return org_context
         
@@ -19,17 +19,26 @@ IMMUTABLE_FIELDS = {
 }
 
 
-def flatten_dict(d: Dict[str, Any], parent_key: str = '', sep: str = '.') -> Dict[str, Any]:
+def flatten_dict(
+    d: Dict[str, Any],
+    parent_key: str = '',
+    sep: str = '.',
+    max_depth: Optional[int] = None
+) -> Dict[str, Any]:
     """
     Flatten nested dictionary for field-level comparison
     Example: {'contact_info': {'email': 'test@example.com'}} 
     => {'contact_info.email': 'test@example.com'}
+    
+    With max_depth, keys are joined at most max_depth levels deep and deeper
+    dictionaries are kept whole as values (useful for building $set paths).
     """
     items = []
     for k, v in d.items():
         new_key = f"{parent_key}{sep}{k}" if parent_key else k
-        if isinstance(v, dict):
-            items.extend(flatten_dict(v, new_key, sep=sep).items())
+        if isinstance(v, dict) and (max_depth is None or max_depth > 1):
+            next_depth = None if max_depth is None else max_depth - 1
+            items.extend(flatten_dict(v, new_key, sep=sep, max_depth=next_depth).items())
         else:
             items.append((new_key, v))
     return dict(items)
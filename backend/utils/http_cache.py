@@ -0,0 +1,134 @@
+"""
+HTTP Cache Helpers
+Pre-serialized, pre-compressed JSON bodies with ETag / If-None-Match support
+
+Bank and template metadata endpoints return large payloads that rarely change.
+A PreparedBody holds the serialized JSON, its gzip-compressed form and a content
+hash used as a weak ETag, so repeat requests are answered with either a
+304 Not Modified or the stored bytes without re-serializing anything.
+
+The ETag is weak (W/"...") because it is shared by the plain and gzip bodies
+and, when volatile fields are excluded, does not cover every byte served.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from utils.json_response import dumps
+
+logger = logging.getLogger(__name__)
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_SIZE = 1024
+
+
+class PreparedBody:
+    """Serialized JSON payload with its gzip form and ETag"""
+
+    __slots__ = ("body", "gzip_body", "etag", "created_at")
+
+    def __init__(self, payload: Any, default: Optional[Callable[[Any], Any]] = None, etag_payload: Any = None):
+        """
+        Args:
+            payload: JSON payload to serialize
+            default: Serializer for non-JSON types (default: json_default, which handles ObjectId, datetime, Decimal)
+            etag_payload: Content the ETag is derived from when the payload carries volatile
+                fields (e.g. a compile timestamp); defaults to the serialized body
+        """
+        # Same encoder as the app's JSON responses so clients see identical bytes
+        self.body = dumps(payload, default=default)
+        self.gzip_body = gzip.compress(self.body, compresslevel=6) if len(self.body) >= GZIP_MIN_SIZE else None
+        # Hash the encoded body rather than re-encoding the payload with sorted keys
+        etag_source = self.body if etag_payload is None else dumps(etag_payload, default=default)
+        self.etag = f'W/"{hashlib.sha256(etag_source).hexdigest()}"'
+        self.created_at = time.monotonic()
+
+
+def _opaque_tag(etag: str) -> str:
+    """Strip the weak indicator from an ETag"""
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag (weak comparison)"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque_tag = _opaque_tag(etag)
+    for candidate in if_none_match.split(","):
+        if _opaque_tag(candidate.strip()) == opaque_tag:
+            return True
+    return False
+
+
+def conditional_json_response(request: Request, prepared: PreparedBody, cache_control: str = "no-cache") -> Response:
+    """
+    Build the response for a prepared body
+
+    Returns 304 Not Modified when If-None-Match matches, the gzip body when the
+    client accepts it, and the plain serialized body otherwise.
+    """
+    headers = {
+        "ETag": prepared.etag,
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding"
+    }
+
+    if etag_matches(request, prepared.etag):
+        return Response(status_code=304, headers=headers)
+
+    if prepared.gzip_body is not None and "gzip" in request.headers.get("accept-encoding", "").lower():
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=prepared.gzip_body, media_type="application/json", headers=headers)
+
+    return Response(content=prepared.body, media_type="application/json", headers=headers)
+
+
+class PreparedBodyCache:
+    """Per-worker store of PreparedBody objects keyed by string, with a TTL"""
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("TEMPLATE_CACHE_TTL_SECONDS", "300"))
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, PreparedBody] = {}
+
+    def get(self, key: str) -> Optional[PreparedBody]:
+        """Return the prepared body for a key, or None if missing or expired"""
+        prepared = self._entries.get(key)
+        if prepared is None:
+            return None
+        if time.monotonic() - prepared.created_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        return prepared
+
+    def set(self, key: str, payload: Any, default: Optional[Callable[[Any], Any]] = None) -> PreparedBody:
+        """Serialize, compress and store a payload (see PreparedBody for default)"""
+        prepared = PreparedBody(payload, default)
+        self._entries[key] = prepared
+        logger.debug(f"📦 Prepared response body for {key} ({len(prepared.body)} bytes, etag {prepared.etag})")
+        return prepared
+
+    def invalidate(self, prefix: Optional[str] = None) -> int:
+        """Drop all entries, or only those whose key starts with prefix"""
+        if prefix is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+
+        keys = [key for key in self._entries if key.startswith(prefix)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
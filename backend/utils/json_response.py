@@ -0,0 +1,63 @@
+"""
+JSON Responses
+Single-pass JSON encoding for MongoDB documents
+
+Handlers used to make query results JSON-safe by round-tripping them through
+json.loads(json.dumps(obj, default=json_serializer)), encoding every payload
+twice, or by walking them with convert_datetimes_to_iso. dumps() encodes
+ObjectId, datetime/date, Decimal and Decimal128 directly with orjson, so a
+result goes from documents to response bytes in one pass. MongoJSONResponse
+renders with it and is the app's default response class.
+
+Output matches the old encoding: compact, UTF-8, datetimes in isoformat(),
+ObjectId and Decimal values as strings. Without orjson installed the standard
+library encoder is used with the same hook (same bytes, just slower).
+"""
+
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Optional
+
+from bson import Decimal128, ObjectId
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def json_default(obj: Any) -> Any:
+    """Encode types JSON does not know (ObjectId, datetime, Decimal, ...)"""
+    if isinstance(obj, (ObjectId, Decimal, Decimal128)):
+        return str(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    if hasattr(obj, '__dict__'):
+        return obj.__dict__
+    return str(obj)
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes (default: json_default)"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=default or json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        obj,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=default or json_default
+    ).encode("utf-8")
+
+
+class MongoJSONResponse(JSONResponse):
+    """JSONResponse that serializes MongoDB documents directly (no pre-conversion needed)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,176 @@
+"""
+JWKS Cache
+Async, single-flight cache of Cognito signing keys
+
+Token validation needs the user pool's public keys (the JWKS document). They
+are fetched with an async HTTP client, so a slow Cognito endpoint never blocks
+the event loop, and concurrent callers share one in-flight fetch instead of
+each hitting the URL when the cache expires.
+
+Keys are parsed once per fetch into RSA key objects indexed by kid. Shortly
+before the TTL runs out (JWKS_REFRESH_AHEAD_SECONDS) a background task
+refreshes them while requests keep using the current set. A token signed with
+an unknown kid (Cognito rotated its keys) triggers an immediate refresh, at
+most once every JWKS_MISS_REFRESH_SECONDS, so forged kids cannot be used to
+hammer the endpoint. If a refresh fails, the previous keys stay in use.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+import jwt
+
+from utils.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+jwks_fetches_total = metrics_registry.counter(
+    "jwks_fetches_total", "JWKS fetches by trigger (initial, expired, background, kid_miss) and result", ("trigger", "result")
+)
+
+
+class JWKSUnavailable(Exception):
+    """Raised when no signing keys could be loaded"""
+
+
+class JWKSCache:
+    """Per-worker cache of JWKS signing keys for one issuer"""
+
+    def __init__(
+        self,
+        jwks_url: str,
+        ttl_seconds: Optional[float] = None,
+        refresh_ahead_seconds: Optional[float] = None,
+        miss_refresh_seconds: Optional[float] = None,
+        timeout_seconds: float = 10.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("JWKS_CACHE_TTL_SECONDS", "86400"))
+        if refresh_ahead_seconds is None:
+            refresh_ahead_seconds = float(os.getenv("JWKS_REFRESH_AHEAD_SECONDS", "3600"))
+        if miss_refresh_seconds is None:
+            miss_refresh_seconds = float(os.getenv("JWKS_MISS_REFRESH_SECONDS", "60"))
+
+        self.jwks_url = jwks_url
+        self.ttl_seconds = ttl_seconds
+        self.refresh_ahead_seconds = min(refresh_ahead_seconds, ttl_seconds / 2)
+        self.miss_refresh_seconds = miss_refresh_seconds
+        self.timeout_seconds = timeout_seconds
+        # Custom httpx transport (e.g. httpx.MockTransport); None uses the network
+        self.transport = transport
+
+        self._keys: Dict[str, Any] = {}
+        self._jwks: Optional[Dict[str, Any]] = None
+        self._fetched_at: Optional[float] = None
+        self._last_attempt: Optional[float] = None
+        self._last_miss_refresh: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _age(self) -> Optional[float]:
+        if self._fetched_at is None:
+            return None
+        return time.monotonic() - self._fetched_at
+
+    def _recently_attempted(self) -> bool:
+        return self._last_attempt is not None and time.monotonic() - self._last_attempt < self.miss_refresh_seconds
+
+    async def _fetch(self, trigger: str) -> None:
+        """Fetch the JWKS document and replace the parsed keys (keeps the old keys on failure)"""
+        self._last_attempt = time.monotonic()
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout_seconds, transport=self.transport) as client:
+                response = await client.get(self.jwks_url)
+                response.raise_for_status()
+                jwks = response.json()
+
+            keys: Dict[str, Any] = {}
+            for jwk_key in jwks.get("keys", []):
+                kid = jwk_key.get("kid")
+                if not kid:
+                    continue
+                try:
+                    keys[kid] = jwt.algorithms.RSAAlgorithm.from_jwk(jwk_key)
+                except Exception as e:
+                    logger.warning(f"⚠️ Skipping unusable JWK {kid}: {e}")
+
+            self._jwks = jwks
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+            jwks_fetches_total.inc(trigger=trigger, result="ok")
+            logger.debug(f"🔄 JWK keys fetched and cached ({len(keys)} keys, trigger: {trigger})")
+
+        except Exception as e:
+            jwks_fetches_total.inc(trigger=trigger, result="failed")
+            if self._keys:
+                logger.warning(f"⚠️ JWK refresh failed, keeping {len(self._keys)} cached keys: {e}")
+            else:
+                logger.error(f"❌ Failed to fetch JWK keys: {e}")
+
+    async def _refresh(self, trigger: str) -> None:
+        """Run a fetch, joining the one already in flight if there is one"""
+        task = self._refresh_task
+        if task is None or task.done():
+            task = asyncio.create_task(self._fetch(trigger))
+            self._refresh_task = task
+        # shield: a cancelled caller must not cancel the fetch other callers are waiting on
+        await asyncio.shield(task)
+
+    def _schedule_background_refresh(self) -> None:
+        if (self._refresh_task is None or self._refresh_task.done()) and not self._recently_attempted():
+            self._refresh_task = asyncio.create_task(self._fetch("background"))
+
+    async def _ensure_fresh(self) -> None:
+        age = self._age()
+        if age is None:
+            if not self._recently_attempted() or (self._refresh_task and not self._refresh_task.done()):
+                await self._refresh("initial")
+        elif age >= self.ttl_seconds:
+            if not self._recently_attempted():
+                await self._refresh("expired")
+        elif age >= self.ttl_seconds - self.refresh_ahead_seconds:
+            self._schedule_background_refresh()
+
+    async def get_jwks(self) -> Dict[str, Any]:
+        """
+        Raw JWKS document
+
+        Raises:
+            JWKSUnavailable: If keys have never been fetched successfully
+        """
+        await self._ensure_fresh()
+        if self._jwks is None:
+            raise JWKSUnavailable(f"No JWKS loaded from {self.jwks_url}")
+        return self._jwks
+
+    async def get_signing_key(self, kid: str) -> Optional[Any]:
+        """
+        Parsed public key for a token's kid, or None if the issuer does not publish it
+
+        An unknown kid forces a refresh (rate limited to one per
+        miss_refresh_seconds) in case the keys were rotated.
+
+        Raises:
+            JWKSUnavailable: If keys have never been fetched successfully
+        """
+        await self._ensure_fresh()
+        if not self._keys:
+            # The load _ensure_fresh just attempted (or skipped within the retry interval) failed
+            raise JWKSUnavailable(f"No JWKS loaded from {self.jwks_url}")
+
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        now = time.monotonic()
+        if self._last_miss_refresh is None or now - self._last_miss_refresh >= self.miss_refresh_seconds:
+            self._last_miss_refresh = now
+            logger.info(f"🔑 Unknown JWK kid {kid}, refreshing keys")
+            await self._refresh("kid_miss")
+            key = self._keys.get(kid)
+
+        return key
@@ -1,15 +1,23 @@
 """
 Request/Response Logger for ValuationApp Backend
 Logs all incoming requests and outgoing responses with timestamps
+
+Request and database log records are handed to a bounded in-memory queue and
+written to the log files and console by a background QueueListener thread, so
+file I/O never runs on the event loop. When the queue is full, records are
+dropped (and counted) instead of blocking the request. The app lifespan starts
+and stops the writer; anywhere else (scripts) it starts on the first queued
+record and is flushed at interpreter exit.
 """
 
+import atexit
 import json
-import time
+import queue
+import threading
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 from pathlib import Path
-from fastapi import Request, Response
-from fastapi.responses import JSONResponse
+from logging.handlers import QueueHandler, QueueListener
 import logging
 import os
 
@@ -17,151 +25,100 @@ import os
 LOGS_DIR = Path(__file__).parent.parent / "logs"
 LOGS_DIR.mkdir(exist_ok=True)
 
-# Configure request/response logger
-request_logger = logging.getLogger("valuation_app.requests")
-request_logger.setLevel(logging.INFO)
 
-# Create file handler for request logs
-request_log_file = LOGS_DIR / "backend_requests.log"
-request_handler = logging.FileHandler(request_log_file, encoding='utf-8')
-request_handler.setLevel(logging.INFO)
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records when the queue is full instead of raising"""
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if _log_listener is None:
+            # Nothing drains the queue yet (e.g. a script): start the writer now
+            start_log_writer()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+# Bounded queue shared by the request and database loggers
+log_queue: queue.Queue = queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_MAX_RECORDS", "10000")))
+queue_handler = DroppingQueueHandler(log_queue)
 
 # Create formatter for request logs
 request_formatter = logging.Formatter(
     '%(asctime)s | %(levelname)s | %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
+
+# Create file handler for request logs
+request_log_file = LOGS_DIR / "backend_requests.log"
+request_handler = logging.FileHandler(request_log_file, encoding='utf-8', delay=True)
+request_handler.setLevel(logging.INFO)
 request_handler.setFormatter(request_formatter)
-request_logger.addHandler(request_handler)
+request_handler.addFilter(lambda record: record.name.startswith("valuation_app.requests"))
 
 # Also add console handler for development
 console_handler = logging.StreamHandler()
 console_handler.setLevel(logging.INFO)
 console_handler.setFormatter(request_formatter)
-request_logger.addHandler(console_handler)
 
-class RequestResponseLogger:
-    """Middleware for logging all API requests and responses"""
-    
-    def __init__(self):
-        self.start_time = None
-        self.request_id = None
-    
-    async def log_request(self, request: Request) -> Dict[str, Any]:
-        """Log incoming request details"""
-        self.start_time = time.time()
-        self.request_id = f"{int(self.start_time * 1000)}"
-        
-        # Extract request body if present
-        request_body = None
-        try:
-            if request.method in ["POST", "PUT", "PATCH"]:
-                body_bytes = await request.body()
-                if body_bytes:
-                    request_body = body_bytes.decode('utf-8')
-                    try:
-                        # Try to parse as JSON for better formatting
-                        request_body = json.loads(request_body)
-                    except json.JSONDecodeError:
-                        # Keep as string if not valid JSON
-                        pass
-        except Exception as e:
-            request_body = f"Error reading body: {str(e)}"
-        
-        # Get query parameters
-        query_params = dict(request.query_params) if request.query_params else None
-        
-        # Get headers (filter out sensitive ones)
-        headers = dict(request.headers)
-        sensitive_headers = ['authorization', 'cookie', 'x-api-key']
-        filtered_headers = {k: v for k, v in headers.items() 
-                          if k.lower() not in sensitive_headers}
-        
-        request_data = {
-            "request_id": self.request_id,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "method": request.method,
-            "url": str(request.url),
-            "path": request.url.path,
-            "query_params": query_params,
-            "headers": filtered_headers,
-            "client_host": request.client.host if request.client else None,
-            "request_body": request_body
-        }
-        
-        # Log the request
-        request_logger.info(f"REQUEST | {self.request_id} | {request.method} {request.url.path} | {json.dumps(request_data, indent=2)}")
-        
-        return request_data
-    
-    def log_response(self, response: Response, request_data: Dict[str, Any]) -> None:
-        """Log outgoing response details"""
-        if not self.start_time:
-            return
-        
-        processing_time = (time.time() - self.start_time) * 1000  # in milliseconds
-        
-        # Extract response body if it's a JSONResponse
-        response_body = None
-        try:
-            if hasattr(response, 'body') and response.body:
-                if isinstance(response, JSONResponse):
-                    # For JSONResponse, get the content
-                    response_body = response.body.decode('utf-8')
-                    try:
-                        response_body = json.loads(response_body)
-                    except json.JSONDecodeError:
-                        pass
-                else:
-                    # For other responses, try to decode
-                    response_body = response.body.decode('utf-8')[:1000]  # Limit size
-        except Exception as e:
-            response_body = f"Error reading response body: {str(e)}"
-        
-        response_data = {
-            "request_id": self.request_id,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "status_code": response.status_code,
-            "processing_time_ms": round(processing_time, 2),
-            "response_headers": dict(response.headers) if hasattr(response, 'headers') else None,
-            "response_body": response_body
-        }
-        
-        # Determine log level based on status code
-        if response.status_code >= 500:
-            log_level = "ERROR"
-        elif response.status_code >= 400:
-            log_level = "WARNING"
-        else:
-            log_level = "INFO"
-        
-        # Log the response
-        getattr(request_logger, log_level.lower())(
-            f"RESPONSE | {self.request_id} | {response.status_code} | {processing_time:.2f}ms | {json.dumps(response_data, indent=2)}"
-        )
-
-# Global logger instance
-logger_instance = RequestResponseLogger()
-
-async def log_request_middleware(request: Request):
-    """Middleware function to log requests"""
-    return await logger_instance.log_request(request)
-
-def log_response_middleware(response: Response, request_data: Dict[str, Any]):
-    """Middleware function to log responses"""
-    logger_instance.log_response(response, request_data)
+# Configure request/response logger
+request_logger = logging.getLogger("valuation_app.requests")
+request_logger.setLevel(logging.INFO)
+request_logger.propagate = False
+request_logger.addHandler(queue_handler)
 
 # Database operation logger
 db_logger = logging.getLogger("valuation_app.database")
 db_logger.setLevel(logging.INFO)
+db_logger.propagate = False
+db_logger.addHandler(queue_handler)
 
 # Create file handler for database logs
 db_log_file = LOGS_DIR / "backend_database.log"
-db_handler = logging.FileHandler(db_log_file, encoding='utf-8')
+db_handler = logging.FileHandler(db_log_file, encoding='utf-8', delay=True)
 db_handler.setLevel(logging.INFO)
 db_handler.setFormatter(request_formatter)
-db_logger.addHandler(db_handler)
-db_logger.addHandler(console_handler)
+db_handler.addFilter(lambda record: record.name.startswith("valuation_app.database"))
+
+# Background writer draining log_queue into the file and console handlers
+_log_listener: Optional[QueueListener] = None
+_log_listener_lock = threading.Lock()
+_exit_flush_registered = False
+
+
+def start_log_writer() -> None:
+    """Start the background log writer thread (idempotent; called on app startup or first use)"""
+    global _log_listener, _exit_flush_registered
+    with _log_listener_lock:
+        if _log_listener is not None:
+            return
+        listener = QueueListener(
+            log_queue, request_handler, db_handler, console_handler,
+            respect_handler_level=True
+        )
+        listener.start()
+        _log_listener = listener
+        if not _exit_flush_registered:
+            # Scripts never call stop_log_writer(); flush what is queued at exit
+            atexit.register(stop_log_writer)
+            _exit_flush_registered = True
+
+
+def stop_log_writer() -> None:
+    """Flush queued records and stop the writer thread (call on app shutdown)"""
+    global _log_listener
+    with _log_listener_lock:
+        listener, _log_listener = _log_listener, None
+    if listener is None:
+        return
+    listener.stop()
+    if queue_handler.dropped:
+        logging.getLogger(__name__).warning(f"⚠️ Dropped {queue_handler.dropped} log records (queue full)")
+
 
 class DatabaseLogger:
     """Logger for database operations"""
@@ -179,7 +136,25 @@ class DatabaseLogger:
             "execution_time_ms": round(execution_time * 1000, 2) if execution_time else None
         }
         
-        db_logger.info(f"DB_QUERY | {operation} | {collection} | {json.dumps(log_data, indent=2)}")
+        db_logger.info(f"DB_QUERY | {operation} | {collection} | {json.dumps(log_data, separators=(',', ':'), default=str)}")
+    
+    @staticmethod
+    def log_slow_query(operation: str, database: str, collection: str, query_shape: Any,
+                       result_count: Optional[int], execution_time: float,
+                       request_id: Optional[str] = None):
+        """Log a database command slower than the configured threshold (values redacted)"""
+        log_data = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "operation": operation,
+            "database": database,
+            "collection": collection,
+            "shape": query_shape,
+            "result_count": result_count,
+            "execution_time_ms": round(execution_time * 1000, 2),
+            "request_id": request_id
+        }
+        
+        db_logger.warning(f"DB_SLOW_QUERY | {operation} | {collection} | {json.dumps(log_data, separators=(',', ':'), default=str)}")
     
     @staticmethod
     def log_error(operation: str, collection: str, error: Exception):
@@ -192,7 +167,7 @@ class DatabaseLogger:
             "error_type": type(error).__name__
         }
         
-        db_logger.error(f"DB_ERROR | {operation} | {collection} | {json.dumps(log_data, indent=2)}")
+        db_logger.error(f"DB_ERROR | {operation} | {collection} | {json.dumps(log_data, separators=(',', ':'), default=str)}")
 
 # Export instances
 db_logger_instance = DatabaseLogger()
\ No newline at end of file
@@ -0,0 +1,316 @@
+"""
+Metrics Registry
+In-process request and MongoDB metrics in the Prometheus text exposition format
+
+Collected per worker process (each uvicorn worker serves its own /metrics), with
+no external dependency:
+
+- http_requests_total{method,route,status}
+- http_request_duration_seconds{method,route} (histogram)
+- http_requests_in_flight{method}
+- http_request_errors_total{method,route} (5xx responses and unhandled exceptions)
+- mongodb_command_duration_seconds{command,collection} (histogram)
+- mongodb_command_failures_total{command,collection}
+
+Routes are labelled with their path template (/api/reports/{report_id}), never
+the raw path, so label cardinality stays bounded. MetricsMiddleware records the
+HTTP metrics; the MongoDB ones are fed by the command listener in
+utils/mongo_monitoring.py. RecentRequestStats keeps a one-minute window for the
+admin health dashboard.
+"""
+
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MONGO_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+            *self.samples()
+        ]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set"""
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def total(self) -> float:
+        with self._lock:
+            return sum(self._values.values())
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """Value that goes up and down per label set"""
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._label_values(labels)] = value
+
+    def total(self) -> float:
+        with self._lock:
+            return sum(self._values.values())
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """Cumulative bucketed observations (plus sum and count) per label set"""
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-1] += value
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), state[:-1]):
+                cumulative += count
+                labels = _format_labels(self.label_names, key, ("le", _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {_format_value(cumulative)}"
+            plain = _format_labels(self.label_names, key)
+            yield f"{self.name}_sum{plain} {_format_value(state[-1])}"
+            yield f"{self.name}_count{plain} {_format_value(cumulative)}"
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def render(self) -> str:
+        """Text exposition format (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class RecentRequestStats:
+    """Request count, latency and errors over a sliding window of one-second slots"""
+
+    def __init__(self, window_seconds: int = 60):
+        self.window_seconds = window_seconds
+        # slot -> [second, requests, errors, duration_sum]
+        self._slots: List[List[float]] = [[-1, 0, 0, 0.0] for _ in range(window_seconds)]
+        self._lock = threading.Lock()
+
+    def record(self, duration_seconds: float, error: bool) -> None:
+        second = int(time.time())
+        with self._lock:
+            slot = self._slots[second % self.window_seconds]
+            if slot[0] != second:
+                slot[0], slot[1], slot[2], slot[3] = second, 0, 0, 0.0
+            slot[1] += 1
+            slot[2] += 1 if error else 0
+            slot[3] += duration_seconds
+
+    def snapshot(self) -> Dict[str, float]:
+        oldest = int(time.time()) - self.window_seconds
+        with self._lock:
+            live = [slot for slot in self._slots if slot[0] > oldest]
+        requests = sum(slot[1] for slot in live)
+        errors = sum(slot[2] for slot in live)
+        duration = sum(slot[3] for slot in live)
+        return {
+            "requests": requests,
+            "errors": errors,
+            "avg_response_time_ms": round(duration / requests * 1000, 2) if requests else 0,
+            "error_rate_percent": round(errors / requests * 100, 2) if requests else 0
+        }
+
+
+# Global registry for import (one per worker process)
+metrics_registry = MetricsRegistry()
+recent_requests = RecentRequestStats()
+PROCESS_START_TIME = time.time()
+
+http_requests_total = metrics_registry.counter(
+    "http_requests_total", "HTTP requests by method, route and status code", ("method", "route", "status"))
+http_request_duration_seconds = metrics_registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds", ("method", "route"))
+http_requests_in_flight = metrics_registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled", ("method",))
+http_request_errors_total = metrics_registry.counter(
+    "http_request_errors_total", "HTTP requests that failed with a 5xx status or an unhandled exception", ("method", "route"))
+mongodb_command_duration_seconds = metrics_registry.histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency in seconds", ("command", "collection"), MONGO_BUCKETS)
+mongodb_command_failures_total = metrics_registry.counter(
+    "mongodb_command_failures_total", "MongoDB commands that returned an error", ("command", "collection"))
+
+
+def route_label(scope) -> str:
+    """Path template of the matched route, or "unmatched" (never the raw path)"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route HTTP metrics"""
+
+    def __init__(self, app, exclude_paths: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_holder = {"status": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder["status"] = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc(method=method)
+        start = time.perf_counter()
+        failed = False
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            http_requests_in_flight.dec(method=method)
+            route = route_label(scope)
+            status = status_holder["status"]
+            error = failed or status >= 500
+            http_requests_total.inc(method=method, route=route, status=str(status))
+            http_request_duration_seconds.observe(duration, method=method, route=route)
+            if error:
+                http_request_errors_total.inc(method=method, route=route)
+            recent_requests.record(duration, error)
+
+
+def get_performance_metrics() -> Dict[str, float]:
+    """Summary for the admin health dashboard, from the same registry /metrics serves"""
+    recent = recent_requests.snapshot()
+    return {
+        "requests_per_minute": round(recent["requests"] * 60 / recent_requests.window_seconds, 2),
+        "avg_response_time_ms": recent["avg_response_time_ms"],
+        "error_rate_percent": recent["error_rate_percent"],
+        "in_flight_requests": int(http_requests_in_flight.total()),
+        "total_requests": int(http_requests_total.total()),
+        "total_errors": int(http_request_errors_total.total()),
+        "process_uptime_seconds": round(time.time() - PROCESS_START_TIME, 0)
+    }
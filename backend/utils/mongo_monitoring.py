@@ -0,0 +1,311 @@
+"""
+MongoDB Command Monitoring
+pymongo CommandListener feeding the metrics registry and the slow-query log
+
+Registered on every client built by database.shared_client.create_motor_client,
+so all MongoDB traffic (shared client and fallback clients) is timed per
+command name and collection, with the number of documents each command
+returned or affected.
+
+Commands slower than MONGO_SLOW_QUERY_MS are written to the database log
+(DatabaseLogger.log_slow_query) as a redacted shape: field names and operators
+are kept, every value is replaced by its type, e.g.
+
+    {"status": "?str", "created_at": {"$gte": "?datetime"}}
+
+Slow shapes are also aggregated in memory (slow_query_tracker) with the last
+raw command of each, so explain_slow_queries() can capture query plans for the
+slowest shapes on demand and flag collection scans. Raw commands never leave
+the process except as explain() input.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+
+from utils.logger import DatabaseLogger
+from utils.request_logging import get_request_id
+from utils.metrics import (
+    metrics_registry,
+    mongodb_command_duration_seconds,
+    mongodb_command_failures_total
+)
+
+logger = logging.getLogger(__name__)
+
+# Commands issued by the driver itself (handshakes, heartbeats, auth)
+IGNORED_COMMANDS = frozenset({
+    "hello", "ismaster", "isMaster", "ping", "buildinfo", "buildInfo",
+    "saslStart", "saslContinue", "getnonce", "authenticate", "endSessions", "killCursors"
+})
+
+# Command document fields that carry the query, per command
+SHAPE_FIELDS = {
+    "find": ("filter", "sort", "projection"),
+    "aggregate": ("pipeline",),
+    "count": ("query",),
+    "distinct": ("key", "query"),
+    "findAndModify": ("query", "sort"),
+    "update": ("updates",),
+    "delete": ("deletes",),
+    "insert": ()
+}
+
+# Commands the server can explain
+EXPLAINABLE_COMMANDS = frozenset({"find", "aggregate", "count", "distinct", "findAndModify", "update", "delete"})
+
+# Session/transport fields stripped from commands before explain()
+_SESSION_FIELDS = frozenset({"lsid", "txnNumber", "autocommit", "startTransaction", "writeConcern", "readConcern"})
+
+mongodb_documents_total = metrics_registry.counter(
+    "mongodb_command_documents_total",
+    "Documents returned (reads) or affected (writes) by MongoDB commands",
+    ("command", "collection")
+)
+mongodb_slow_commands_total = metrics_registry.counter(
+    "mongodb_slow_commands_total", "MongoDB commands slower than MONGO_SLOW_QUERY_MS", ("command", "collection")
+)
+
+
+def redact_shape(value: Any, depth: int = 0) -> Any:
+    """Replace every value with its type name, keeping field names and operators"""
+    if depth > 20:
+        return "?..."
+    if isinstance(value, dict):
+        return {key: redact_shape(item, depth + 1) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if not value:
+            return []
+        # Lists of scalars ($in, $nin) collapse to one entry; pipelines and update batches keep their stages
+        if all(not isinstance(item, (dict, list, tuple)) for item in value):
+            return [redact_shape(value[0], depth + 1)]
+        return [redact_shape(item, depth + 1) for item in value]
+    return f"?{type(value).__name__}"
+
+
+def command_shape(command_name: str, command: Dict[str, Any]) -> Dict[str, Any]:
+    """Redacted shape of the query-bearing fields of a command"""
+    fields = SHAPE_FIELDS.get(command_name)
+    if fields is None:
+        return {}
+    shape: Dict[str, Any] = {}
+    for field in fields:
+        if field not in command:
+            continue
+        if field in ("updates", "deletes"):
+            shape[field] = [redact_shape({"q": statement.get("q")}) for statement in command[field][:1]]
+        elif field in ("sort", "projection", "key"):
+            # Field names only; the values are directions/flags, not user data
+            shape[field] = command[field]
+        else:
+            shape[field] = redact_shape(command[field])
+    return shape
+
+
+def returned_documents(command_name: str, reply: Dict[str, Any]) -> Optional[int]:
+    """Number of documents a command returned (reads) or affected (writes), if the reply says"""
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        batch = cursor.get("firstBatch", cursor.get("nextBatch"))
+        return len(batch) if batch is not None else None
+    if command_name == "findAndModify":
+        return 1 if reply.get("value") is not None else 0
+    if command_name == "distinct" and isinstance(reply.get("values"), list):
+        return len(reply["values"])
+    n = reply.get("n")
+    return n if isinstance(n, int) else None
+
+
+def _explainable_command(command_name: str, command: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a command suitable as explain() input (no session fields, one write statement)"""
+    example = {
+        key: value for key, value in command.items()
+        if not key.startswith("$") and key not in _SESSION_FIELDS
+    }
+    for batch_field in ("updates", "deletes"):
+        if batch_field in example:
+            example[batch_field] = list(example[batch_field][:1])
+    return example
+
+
+class SlowQueryTracker:
+    """Per-worker aggregate of slow command shapes (bounded)"""
+
+    def __init__(self, max_shapes: int = 200):
+        self.max_shapes = max_shapes
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, command_name: str, database: str, collection: str, shape: Dict[str, Any],
+               duration_ms: float, documents: Optional[int], command: Dict[str, Any]) -> None:
+        key = f"{database}.{collection}:{command_name}:{shape!r}"
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_shapes:
+                    # Evict the shape with the lowest worst-case latency
+                    fastest = min(self._entries, key=lambda k: self._entries[k]["max_ms"])
+                    del self._entries[fastest]
+                entry = self._entries[key] = {
+                    "command": command_name,
+                    "database": database,
+                    "collection": collection,
+                    "shape": shape,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "explain": None
+                }
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            entry["last_documents"] = documents
+            entry["last_seen"] = time.time()
+            entry["_example"] = command
+
+    def top(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Slowest shapes first (by worst-case latency)"""
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda e: e["max_ms"], reverse=True)[:limit]
+            return [dict(entry) for entry in entries]
+
+    def set_explain(self, entry: Dict[str, Any], summary: Dict[str, Any]) -> None:
+        key = f"{entry['database']}.{entry['collection']}:{entry['command']}:{entry['shape']!r}"
+        with self._lock:
+            if key in self._entries:
+                self._entries[key]["explain"] = summary
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _plan_stages(plan: Any) -> List[str]:
+    """Flatten a queryPlanner winningPlan into its stage names (outermost first)"""
+    stages: List[str] = []
+    while isinstance(plan, dict):
+        # Classic plans use "stage"; SBE plans wrap the tree in "queryPlan"
+        plan = plan.get("queryPlan", plan)
+        if "stage" in plan:
+            stage = plan["stage"]
+            if plan.get("indexName"):
+                stage = f"{stage}({plan['indexName']})"
+            stages.append(stage)
+        plan = plan.get("inputStage") or (plan.get("inputStages") or [None])[0]
+    return stages
+
+
+def summarize_explain(explain: Dict[str, Any]) -> Dict[str, Any]:
+    """Winning-plan stages and whether the query scans the whole collection"""
+    planner = explain.get("queryPlanner")
+    if planner is None:
+        # Aggregations report the planner of their first ($cursor) stage
+        for stage in explain.get("stages", []):
+            if "$cursor" in stage:
+                planner = stage["$cursor"].get("queryPlanner")
+                break
+    winning_plan = (planner or {}).get("winningPlan", {})
+    stages = _plan_stages(winning_plan)
+    return {
+        "stages": stages,
+        "collection_scan": any(stage.startswith("COLLSCAN") for stage in stages),
+        "namespace": (planner or {}).get("namespace")
+    }
+
+
+async def explain_slow_queries(client, limit: int = 10, refresh: bool = False) -> List[Dict[str, Any]]:
+    """
+    Capture queryPlanner explain() output for the slowest shapes
+
+    Args:
+        client: Motor client to run explain on
+        limit: Number of slowest shapes to explain
+        refresh: Re-explain shapes that already have a captured plan
+    """
+    entries = slow_query_tracker.top(limit)
+    for entry in entries:
+        if entry["command"] not in EXPLAINABLE_COMMANDS or (entry["explain"] and not refresh):
+            continue
+        try:
+            explain = await client[entry["database"]].command(
+                {"explain": _explainable_command(entry["command"], entry["_example"]), "verbosity": "queryPlanner"}
+            )
+            entry["explain"] = summarize_explain(explain)
+        except Exception as e:
+            entry["explain"] = {"error": str(e)}
+        slow_query_tracker.set_explain(entry, entry["explain"])
+    return entries
+
+
+class MongoMetricsListener(monitoring.CommandListener):
+    """Times MongoDB commands by name and collection and logs slow ones"""
+
+    def __init__(self, slow_query_ms: Optional[float] = None):
+        if slow_query_ms is None:
+            slow_query_ms = float(os.getenv("MONGO_SLOW_QUERY_MS", "100"))
+        self.slow_query_ms = slow_query_ms
+        # (connection id, request id) -> (collection name, command), filled on start
+        self._pending: Dict[Tuple[Any, int], Tuple[str, Dict[str, Any]]] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            # getMore names the collection separately; database-level commands have none
+            collection = event.command.get("collection", "")
+        self._pending[(event.connection_id, event.request_id)] = (collection, event.command)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        collection, command = pending
+        command_name = event.command_name
+        mongodb_command_duration_seconds.observe(
+            event.duration_micros / 1_000_000, command=command_name, collection=collection
+        )
+
+        documents = returned_documents(command_name, event.reply)
+        if documents:
+            mongodb_documents_total.inc(documents, command=command_name, collection=collection)
+
+        duration_ms = event.duration_micros / 1000
+        if self.slow_query_ms > 0 and duration_ms >= self.slow_query_ms:
+            self._record_slow(event, collection, command, duration_ms, documents)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        collection = pending[0]
+        mongodb_command_duration_seconds.observe(
+            event.duration_micros / 1_000_000, command=event.command_name, collection=collection
+        )
+        mongodb_command_failures_total.inc(command=event.command_name, collection=collection)
+
+    def _record_slow(self, event: monitoring.CommandSucceededEvent, collection: str,
+                     command: Dict[str, Any], duration_ms: float, documents: Optional[int]) -> None:
+        try:
+            # getMore has no shape of its own (it continues an earlier find/aggregate)
+            shape = command_shape(event.command_name, command)
+            mongodb_slow_commands_total.inc(command=event.command_name, collection=collection)
+            DatabaseLogger.log_slow_query(
+                event.command_name, event.database_name, collection, shape,
+                documents, duration_ms / 1000, request_id=get_request_id()
+            )
+            slow_query_tracker.record(
+                event.command_name, event.database_name, collection, shape, duration_ms, documents,
+                _explainable_command(event.command_name, command)
+            )
+        except Exception as e:
+            logger.debug(f"Slow query record failed: {e}")
+
+
+# Global instances for import (one per worker process)
+slow_query_tracker = SlowQueryTracker()
+mongo_metrics_listener = MongoMetricsListener()
@@ -322,9 +322,10 @@ class OrganizationDatabaseService:
         org_context: OrganizationContext,
         action_filter: Optional[str] = None,
         user_filter: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        include_archived: bool = False
     ) -> List[Dict[str, Any]]:
-        """Get audit logs for organization (manager+ required)"""
+        """Get audit logs for organization (manager+ required; include_archived also reads archived months)"""
         
         if not org_context.is_manager:
             raise PermissionError("Manager role required to view audit logs")
@@ -335,6 +336,18 @@ class OrganizationDatabaseService:
         if user_filter:
             filter_dict["user_id"] = user_filter
         
+        if include_archived:
+            from services.log_archive import AUDIT_LOGS_POLICY, find_across_archives
+            
+            filtered_query = self.org_middleware.apply_organization_filter(
+                "audit_logs", filter_dict.copy(), org_context
+            )
+            logs, _ = await find_across_archives(
+                self.db_manager.get_database("admin"), "audit_logs", filtered_query,
+                AUDIT_LOGS_POLICY.time_field, limit=limit, count=False
+            )
+            return logs
+        
         logs = await self.find_many(
             org_context=org_context,
             collection_name="audit_logs",
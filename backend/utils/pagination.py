@@ -0,0 +1,196 @@
+"""
+Pagination Utilities
+Keyset (cursor) pagination and cached counts for list endpoints
+
+Skip/limit pagination makes MongoDB walk every skipped document, so deep pages
+get slower linearly. Keyset pagination instead filters on the last row seen,
+(sort_field, _id) in descending order, and every page costs the same. The
+position is handed to clients as an opaque cursor token.
+
+Exact totals are a full count_documents per request; CountCache keeps them per
+worker for a short TTL so paging does not recount on every page.
+"""
+
+import base64
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_value(value: Any) -> Tuple[str, Any]:
+    """Tag a sort value with its type so decode_cursor restores the same BSON type"""
+    if value is None:
+        return "null", None
+    if isinstance(value, datetime):
+        return "datetime", value.isoformat()
+    if isinstance(value, str):
+        return "str", value
+    # bool is an int subclass but sorts as its own BSON type
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return "number", value
+    raise TypeError(f"unsupported cursor sort value type: {type(value).__name__}")
+
+
+def _decode_value(value_type: str, value: Any) -> Any:
+    if value_type == "null":
+        return None
+    if value_type == "datetime":
+        return datetime.fromisoformat(value)
+    if value_type == "str" and isinstance(value, str):
+        return value
+    if value_type == "number" and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    raise ValueError(f"invalid cursor value for type {value_type!r}")
+
+
+def encode_cursor(sort_field: str, document: Dict[str, Any]) -> str:
+    """
+    Build an opaque cursor pointing just after a document in (sort_field desc, _id desc) order
+
+    The sort value is stored with a type tag (datetime, str, number or null).
+
+    Raises:
+        TypeError: If the sort value is of any other type
+    """
+    value_type, value = _encode_value(document.get(sort_field))
+    payload = {
+        "f": sort_field,
+        "t": value_type,
+        "v": value,
+        "id": str(document["_id"])
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort_field: str) -> Tuple[Any, ObjectId]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Returns:
+        (sort_value, last_id) - sort_value has the type it was encoded with (None for missing/null)
+
+    Raises:
+        ValueError: If the token is malformed or was issued for a different sort field
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if payload.get("f") != sort_field:
+            raise ValueError("cursor was issued for a different sort order")
+        # Cursors issued before type tags only carried datetimes (or null)
+        value_type = payload.get("t", "datetime" if payload.get("v") else "null")
+        value = _decode_value(value_type, payload.get("v"))
+        return value, ObjectId(payload["id"])
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"malformed cursor: {e}")
+
+
+def keyset_filter(sort_field: str, cursor: str) -> Dict[str, Any]:
+    """
+    Filter selecting documents after the cursor in (sort_field desc, _id desc) order
+
+    Documents without the sort field sort last in descending order, so they are
+    included after every valued document. Comparisons only match values of the
+    cursor's type, so the sort field is expected to hold one type (plus nulls).
+    """
+    value, last_id = decode_cursor(cursor, sort_field)
+
+    if value is None:
+        return {sort_field: None, "_id": {"$lt": last_id}}
+
+    return {
+        "$or": [
+            {sort_field: {"$lt": value}},
+            {sort_field: value, "_id": {"$lt": last_id}},
+            {sort_field: None}
+        ]
+    }
+
+
+def combine_filters(*filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """AND together filters (avoids clobbering top-level $or keys)"""
+    parts = [f for f in filters if f]
+    if not parts:
+        return {}
+    if len(parts) == 1:
+        return parts[0]
+    return {"$and": parts}
+
+
+def keyset_sort(sort_field: str) -> List[Tuple[str, int]]:
+    """Sort specification matching keyset_filter"""
+    return [(sort_field, -1), ("_id", -1)]
+
+
+def split_page(documents: List[Dict[str, Any]], limit: int, sort_field: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Trim a limit + 1 fetch to one page
+
+    Returns:
+        (page_documents, next_cursor) - next_cursor is None on the last page
+    """
+    if len(documents) <= limit:
+        return documents, None
+    page = documents[:limit]
+    return page, encode_cursor(sort_field, page[-1])
+
+
+class CountCache:
+    """Per-worker cache of count_documents results, keyed by database, collection and filter"""
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: int = 1000):
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("LIST_COUNT_CACHE_TTL_SECONDS", "30"))
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[int, float]] = {}
+
+    @staticmethod
+    def _key(collection, filter_dict: Dict[str, Any]) -> str:
+        return f"{collection.database.name}.{collection.name}:{json.dumps(filter_dict, sort_keys=True, default=str)}"
+
+    async def count(self, collection, filter_dict: Dict[str, Any], exact: bool = False) -> Tuple[int, bool]:
+        """
+        Count matching documents
+
+        Args:
+            collection: Motor collection
+            filter_dict: Query filter
+            exact: Always run count_documents (and refresh the cache)
+
+        Returns:
+            (count, from_cache)
+        """
+        key = self._key(collection, filter_dict)
+        if not exact:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[1] <= self.ttl_seconds:
+                return entry[0], True
+
+        count = await collection.count_documents(filter_dict)
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        self._entries[key] = (count, time.monotonic())
+        return count, False
+
+    def invalidate(self, database_name: Optional[str] = None) -> None:
+        """Drop cached counts (for one database, or all)"""
+        if database_name is None:
+            self._entries.clear()
+            return
+        prefix = f"{database_name}."
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            del self._entries[key]
+
+
+# Global instance for import (one per worker process)
+count_cache = CountCache()
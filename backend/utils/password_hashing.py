@@ -0,0 +1,135 @@
+"""
+Password Hashing Utility
+bcrypt hashing and verification off the event loop
+
+A bcrypt check costs roughly 100-300 ms of CPU. Run inline in an async handler
+it stalls every other request on the worker, so all hashing runs in a small
+dedicated thread pool. The pool is bounded twice: PASSWORD_HASH_WORKERS threads,
+and at most PASSWORD_HASH_MAX_PENDING operations running or queued. Beyond
+that, callers get PasswordHasherBusy immediately (the login endpoint answers
+503) instead of queueing without limit during login storms.
+
+The cost factor is BCRYPT_ROUNDS. verify_and_update() returns a fresh hash when
+a stored hash was made with a different cost, so hashes migrate transparently
+as users log in.
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+
+import bcrypt
+
+from utils.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+password_hash_rejections_total = metrics_registry.counter(
+    "password_hash_rejections_total", "Password hash/verify calls rejected because the pool queue was full"
+)
+password_hash_pending = metrics_registry.gauge(
+    "password_hash_pending", "Password hash/verify calls running or queued"
+)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hash/verify operations are already pending"""
+
+
+def bcrypt_rounds(hashed: str) -> Optional[int]:
+    """Cost factor of a bcrypt hash ("$2b$12$..."), or None if it is not a bcrypt hash"""
+    parts = hashed.split("$")
+    if len(parts) < 4 or not parts[1].startswith("2"):
+        return None
+    try:
+        return int(parts[2])
+    except ValueError:
+        return None
+
+
+class PasswordHasher:
+    """bcrypt hashing in a bounded, dedicated thread pool"""
+
+    def __init__(
+        self,
+        rounds: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None
+    ):
+        self.rounds = rounds or int(os.getenv("BCRYPT_ROUNDS", "12"))
+        self.max_workers = max_workers or int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.max_pending = max_pending or int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        # _pending is only touched on the event loop thread
+        if self._pending >= self.max_pending:
+            password_hash_rejections_total.inc()
+            raise PasswordHasherBusy(f"{self._pending} password operations pending")
+        self._pending += 1
+        password_hash_pending.set(self._pending)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+            password_hash_pending.set(self._pending)
+
+    def _hash_sync(self, password: str) -> str:
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=self.rounds)).decode("utf-8")
+
+    @staticmethod
+    def _verify_sync(password: str, hashed: str) -> bool:
+        try:
+            return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+        except Exception as e:
+            logger.error(f"❌ Password verification error: {e}")
+            return False
+
+    def _verify_and_update_sync(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        if not self._verify_sync(password, hashed):
+            return False, None
+        if self.needs_rehash(hashed):
+            return True, self._hash_sync(password)
+        return True, None
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Whether a stored bcrypt hash was made with a different cost than BCRYPT_ROUNDS"""
+        rounds = bcrypt_rounds(hashed)
+        return rounds is not None and rounds != self.rounds
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with the configured cost"""
+        return await self._run(self._hash_sync, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        """Check a password against a stored hash"""
+        return await self._run(self._verify_sync, password, hashed)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """
+        Check a password and rehash it if the stored cost is outdated
+
+        Returns:
+            (valid, new_hash) - new_hash is set only when the password is valid
+            and the stored hash should be replaced
+        """
+        return await self._run(self._verify_and_update_sync, password, hashed)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global instance for import (one per worker process)
+password_hasher = PasswordHasher()
@@ -0,0 +1,246 @@
+"""
+Request Logging Middleware
+ASGI middleware that logs every request/response as one compact JSON line
+
+Replaces the per-handler RequestResponseLogger calls. Each request gets its own
+context (request id, start time) in a contextvar, so concurrent requests never
+share timing state, and other code can tag its logs with get_request_id().
+
+Lines go through the queue-backed request logger in utils/logger.py; the event
+loop only formats one short string per request. Bodies are captured as they
+stream past, capped at REQUEST_LOG_MAX_BODY_BYTES, and only for sampled
+requests. Sampling is configured per route:
+
+    REQUEST_LOG_SAMPLE_RATE=1.0
+    REQUEST_LOG_ROUTE_SAMPLE_RATES=/api/health=0,/api/reports*=0.1
+
+Patterns are fnmatch globs on the request path (first match wins). Responses
+with status >= 400 are always logged, without bodies when not sampled.
+"""
+
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.logger import request_logger
+
+logger = logging.getLogger(__name__)
+
+# Paths whose bodies are never logged (credentials)
+DEFAULT_BODY_EXCLUDE = "/api/auth/*"
+
+# Request headers worth keeping in the log line
+LOGGED_HEADERS = (b"user-agent", b"content-type", b"content-length", b"origin")
+
+
+@dataclass
+class RequestContext:
+    """Per-request logging context"""
+    request_id: str
+    method: str
+    path: str
+    start_time: float = field(default_factory=time.perf_counter)
+
+
+_request_context: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+
+def get_request_context() -> Optional[RequestContext]:
+    """Context of the request being handled by the current task, if any"""
+    return _request_context.get()
+
+
+def get_request_id() -> Optional[str]:
+    """Id of the request being handled by the current task, if any"""
+    context = _request_context.get()
+    return context.request_id if context else None
+
+
+def parse_route_sample_rates(spec: str) -> List[Tuple[str, float]]:
+    """Parse "pattern=rate,pattern=rate" into [(pattern, rate)], skipping malformed entries"""
+    rates: List[Tuple[str, float]] = []
+    for entry in spec.split(","):
+        pattern, _, rate = entry.strip().rpartition("=")
+        if not pattern:
+            continue
+        try:
+            rates.append((pattern.strip(), min(max(float(rate), 0.0), 1.0)))
+        except ValueError:
+            logger.warning(f"⚠️ Ignoring invalid request log sample rate: {entry!r}")
+    return rates
+
+
+class _BodyCapture:
+    """Keeps the first max_bytes of a streamed body and the total size"""
+
+    __slots__ = ("max_bytes", "chunks", "captured", "size")
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.chunks: List[bytes] = []
+        self.captured = 0
+        self.size = 0
+
+    def add(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.captured < self.max_bytes and chunk:
+            piece = chunk[:self.max_bytes - self.captured]
+            self.chunks.append(piece)
+            self.captured += len(piece)
+
+    def text(self) -> Optional[str]:
+        if not self.size:
+            return None
+        body = b"".join(self.chunks).decode("utf-8", errors="replace")
+        if self.size > self.captured:
+            body += f"...[truncated {self.size - self.captured} bytes]"
+        return body
+
+
+class RequestLoggingMiddleware:
+    """Pure ASGI middleware: one sampled, size-capped JSON log line per HTTP request"""
+
+    def __init__(
+        self,
+        app,
+        sample_rate: Optional[float] = None,
+        route_sample_rates: Optional[str] = None,
+        max_body_bytes: Optional[int] = None,
+        body_exclude: Optional[str] = None
+    ):
+        self.app = app
+        if sample_rate is None:
+            sample_rate = float(os.getenv("REQUEST_LOG_SAMPLE_RATE", "1.0"))
+        if route_sample_rates is None:
+            route_sample_rates = os.getenv("REQUEST_LOG_ROUTE_SAMPLE_RATES", "")
+        if max_body_bytes is None:
+            max_body_bytes = int(os.getenv("REQUEST_LOG_MAX_BODY_BYTES", "2048"))
+        if body_exclude is None:
+            body_exclude = os.getenv("REQUEST_LOG_BODY_EXCLUDE", DEFAULT_BODY_EXCLUDE)
+
+        self.sample_rate = sample_rate
+        self.route_sample_rates = parse_route_sample_rates(route_sample_rates)
+        self.max_body_bytes = max_body_bytes
+        self.body_exclude = [pattern.strip() for pattern in body_exclude.split(",") if pattern.strip()]
+
+    def _sample_rate_for(self, path: str) -> float:
+        for pattern, rate in self.route_sample_rates:
+            if fnmatchcase(path, pattern):
+                return rate
+        return self.sample_rate
+
+    def _log_bodies(self, path: str) -> bool:
+        return self.max_body_bytes > 0 and not any(fnmatchcase(path, pattern) for pattern in self.body_exclude)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1")[:64] or uuid.uuid4().hex[:16]
+        context = RequestContext(request_id=request_id, method=scope["method"], path=scope["path"])
+        token = _request_context.set(context)
+
+        rate = self._sample_rate_for(context.path)
+        sampled = rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+        capture_bodies = sampled and self._log_bodies(context.path)
+        request_body = _BodyCapture(self.max_body_bytes) if capture_bodies else None
+        response_body: Optional[_BodyCapture] = None
+        response_meta: Dict[str, Any] = {"status": 500, "length": 0}
+
+        async def receive_wrapper():
+            message = await receive()
+            if request_body is not None and message["type"] == "http.request":
+                request_body.add(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            nonlocal response_body
+            if message["type"] == "http.response.start":
+                response_meta["status"] = message["status"]
+                response_headers = dict(message.get("headers") or [])
+                content_type = response_headers.get(b"content-type", b"")
+                # Only capture readable, uncompressed bodies
+                if capture_bodies and b"content-encoding" not in response_headers and (
+                    b"json" in content_type or content_type.startswith(b"text/")
+                ):
+                    response_body = _BodyCapture(self.max_body_bytes)
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", request_id.encode("latin-1"))]
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                response_meta["length"] += len(chunk)
+                if response_body is not None:
+                    response_body.add(chunk)
+            await send(message)
+
+        error: Optional[BaseException] = None
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            status = response_meta["status"]
+            if sampled or status >= 400 or error is not None:
+                self._emit(context, scope, headers, status, response_meta["length"],
+                           request_body, response_body, sampled, error)
+            _request_context.reset(token)
+
+    def _emit(
+        self,
+        context: RequestContext,
+        scope,
+        headers: Dict[bytes, bytes],
+        status: int,
+        response_length: int,
+        request_body: Optional[_BodyCapture],
+        response_body: Optional[_BodyCapture],
+        sampled: bool,
+        error: Optional[BaseException]
+    ) -> None:
+        duration_ms = (time.perf_counter() - context.start_time) * 1000
+        route = scope.get("route")
+        client = scope.get("client")
+
+        entry: Dict[str, Any] = {
+            "request_id": context.request_id,
+            "method": context.method,
+            "path": context.path,
+            "route": getattr(route, "path", None),
+            "query": scope.get("query_string", b"").decode("latin-1") or None,
+            "status": status,
+            "duration_ms": round(duration_ms, 2),
+            "response_bytes": response_length,
+            "client": client[0] if client else None,
+            "headers": {
+                name.decode("latin-1"): headers[name].decode("latin-1")
+                for name in LOGGED_HEADERS if name in headers
+            },
+            "sampled": sampled
+        }
+        if request_body is not None:
+            entry["request_body"] = request_body.text()
+        if response_body is not None:
+            entry["response_body"] = response_body.text()
+        if error is not None:
+            entry["error"] = f"{type(error).__name__}: {error}"
+
+        if status >= 500 or error is not None:
+            level = logging.ERROR
+        elif status >= 400:
+            level = logging.WARNING
+        else:
+            level = logging.INFO
+
+        try:
+            request_logger.log(level, json.dumps(entry, separators=(",", ":"), ensure_ascii=False, default=str))
+        except Exception as e:
+            logger.debug(f"Request log line dropped: {e}")